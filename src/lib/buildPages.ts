@@ -0,0 +1,13 @@
+import { readFileSync } from 'fs';
+
+// Incremental builds from the worldbuilding tools name a JSON file with the
+// routes to render in VIBE_BUILD_PAGES; without it every page is built.
+let selectedRoutes: Set<string> | null | undefined;
+
+export function isRouteSelected(route: string): boolean {
+  if (selectedRoutes === undefined) {
+    const routesFile = process.env.VIBE_BUILD_PAGES;
+    selectedRoutes = routesFile ? new Set(JSON.parse(readFileSync(routesFile, 'utf-8'))) : null;
+  }
+  return selectedRoutes === null || selectedRoutes.has(route);
+}
@@ -0,0 +1,20 @@
+import { readFileSync } from 'fs';
+import { join } from 'path';
+
+// The worldbuilding tools write resized WebP renditions of world images and
+// list them in metadata/images.json; images without one are served as is.
+type Rendition = 'thumb' | 'medium';
+type ImageRecord = { renditions?: Partial<Record<Rendition, { path: string }>> };
+let imageManifest: Record<string, ImageRecord> | undefined;
+
+export function getImageSrc(imagePath: string, rendition: Rendition): string {
+  if (imageManifest === undefined) {
+    try {
+      const manifestPath = join(process.cwd(), 'src/metadata', 'images.json');
+      imageManifest = JSON.parse(readFileSync(manifestPath, 'utf-8')).images || {};
+    } catch {
+      imageManifest = {};
+    }
+  }
+  return `/images/${imageManifest![imagePath]?.renditions?.[rendition]?.path ?? imagePath}`;
+}
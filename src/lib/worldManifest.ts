@@ -0,0 +1,78 @@
+import { readFileSync, statSync } from 'fs';
+import { join } from 'path';
+
+// The worldbuilding tools write metadata/world.json before every build with
+// the taxonomies and the metadata and cross-links of every entry. Pages read
+// it once per build instead of listing and re-reading the content folders,
+// and again in dev whenever the tools rewrite it.
+export type EntryLink = { start: number; end: number; text: string; taxonomy: string; slug: string };
+export type EntryBacklink = { taxonomy: string; slug: string; title: string };
+export type ManifestTaxonomy = { slug: string; title: string; description: string };
+export type ManifestEntry = {
+  taxonomy: string;
+  slug: string;
+  title: string;
+  description: string;
+  stub: boolean;
+  taxonomyContext: string;
+  image: string | null;
+  links: EntryLink[];
+  backlinks: EntryBacklink[];
+};
+export type WorldManifest = { title: string; taxonomies: ManifestTaxonomy[]; entries: ManifestEntry[] };
+
+type LoadedManifest = {
+  mtimeMs: number;
+  manifest: WorldManifest;
+  entriesByKey: Map<string, ManifestEntry>;
+  entriesByTaxonomy: Map<string, ManifestEntry[]>;
+};
+
+let loaded: LoadedManifest | undefined;
+
+// The tools rewrite world.json while the dev server runs, so the parsed copy
+// is kept only as long as the file's mtime is unchanged
+function loadManifest(): LoadedManifest {
+  const manifestPath = join(process.cwd(), 'src/metadata', 'world.json');
+  let mtimeMs = -1;
+  try {
+    mtimeMs = statSync(manifestPath).mtimeMs;
+  } catch {}
+  if (loaded !== undefined && loaded.mtimeMs === mtimeMs) {
+    return loaded;
+  }
+
+  let manifest: WorldManifest;
+  try {
+    const data = JSON.parse(readFileSync(manifestPath, 'utf-8'));
+    manifest = {
+      title: data.title || 'World',
+      taxonomies: data.taxonomies || [],
+      entries: data.entries || [],
+    };
+  } catch {
+    manifest = { title: 'World', taxonomies: [], entries: [] };
+  }
+
+  const entriesByKey = new Map(manifest.entries.map(entry => [`${entry.taxonomy}/${entry.slug}`, entry]));
+  const entriesByTaxonomy = new Map<string, ManifestEntry[]>();
+  for (const entry of manifest.entries) {
+    const entries = entriesByTaxonomy.get(entry.taxonomy) || [];
+    entries.push(entry);
+    entriesByTaxonomy.set(entry.taxonomy, entries);
+  }
+  loaded = { mtimeMs, manifest, entriesByKey, entriesByTaxonomy };
+  return loaded;
+}
+
+export function getWorldManifest(): WorldManifest {
+  return loadManifest().manifest;
+}
+
+export function getEntry(taxonomy: string, slug: string): ManifestEntry | undefined {
+  return loadManifest().entriesByKey.get(`${taxonomy}/${slug}`);
+}
+
+export function getTaxonomyEntries(taxonomy: string): ManifestEntry[] {
+  return loadManifest().entriesByTaxonomy.get(taxonomy) || [];
+}
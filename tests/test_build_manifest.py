@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental site build planning
+
+This test plans builds for a small world without running Astro: it records
+a fake built site, edits one entry and the overview, and checks that only
+the pages depending on them are selected and that patching the site leaves
+unchanged files alone and removes unreferenced ones.
+"""
+
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.utils import build_manifest
+from vibe_worldbuilding.utils.link_manifest import update_link_manifest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def _write_pages(root: Path, routes, marker: str, stylesheet: str) -> None:
+    for route in routes:
+        page = root / build_manifest.get_route_output(route)
+        page.parent.mkdir(parents=True, exist_ok=True)
+        page.write_text(
+            f'<html><link href="/_astro/{stylesheet}">{route} {marker}</html>',
+            encoding="utf-8",
+        )
+    asset = root / "_astro" / stylesheet
+    asset.parent.mkdir(parents=True, exist_ok=True)
+    asset.write_text(f"/* {stylesheet} */", encoding="utf-8")
+
+
+async def test_incremental_build_plan():
+    """Test page selection and in-place patching for an incremental build."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(base_dir, f"build-test-{int(time.time())}")
+    site_path = world_path / "site"
+
+    try:
+        for name, content in (
+            ("Mira Vale", "A cartographer."),
+            ("Tomas Reed", "A surveyor who works with Mira Vale."),
+        ):
+            await handle_entry_tool(
+                "create_world_entry",
+                {
+                    "world_directory": str(world_path),
+                    "taxonomy": "Characters",
+                    "entry_name": name,
+                    "entry_content": f"# {name}\n\n{content}",
+                },
+            )
+
+        # 1. Without a manifest the whole site is built
+        plan = build_manifest.plan_site_build(
+            world_path, PROJECT_ROOT, site_path, update_link_manifest(world_path)
+        )
+        assert plan["full"]
+        _write_pages(site_path, plan["pages"], "v1", "site.css")
+        (site_path / "_astro" / "old.css").write_text("/* old */", encoding="utf-8")
+        build_manifest.record_site_outputs(site_path, plan)
+        build_manifest.save_build_manifest(world_path, plan)
+
+        # 2. Nothing changed, nothing to render
+        plan = build_manifest.plan_site_build(
+            world_path, PROJECT_ROOT, site_path, update_link_manifest(world_path)
+        )
+        assert not plan["full"]
+        assert plan["pages"] == [] and plan["removed"] == []
+
+        # 3. A body edit selects that entry and the entry it now links to
+        entry_file = world_path / "entries" / "characters" / "tomas-reed.md"
+        entry_file.write_text(
+            entry_file.read_text(encoding="utf-8").replace(
+                "works with Mira Vale", "works alone"
+            ),
+            encoding="utf-8",
+        )
+        plan = build_manifest.plan_site_build(
+            world_path, PROJECT_ROOT, site_path, update_link_manifest(world_path)
+        )
+        assert plan["pages"] == [
+            "taxonomies/characters/entries/mira-vale",
+            "taxonomies/characters/entries/tomas-reed",
+        ]
+
+        # 4. Patching copies only outputs that differ from the recorded ones,
+        # and drops assets that no page references any more
+        dist_path = world_path / "dist"
+        _write_pages(dist_path, ["", "gallery"], "v1", "site.css")
+        _write_pages(dist_path, plan["pages"], "v2", "entry.css")
+        assert build_manifest.publish_site_outputs(dist_path, site_path, plan) == 4
+        page = site_path / build_manifest.get_route_output(plan["pages"][1])
+        assert "v2" in page.read_text(encoding="utf-8")
+        assert (site_path / "_astro" / "entry.css").exists()
+        assert (site_path / "_astro" / "site.css").exists()
+        assert not (site_path / "_astro" / "old.css").exists()
+        build_manifest.save_build_manifest(world_path, plan)
+
+        # 5. An overview edit that keeps the world title only selects the
+        # pages that show the overview
+        overview_file = world_path / "overview" / "world-overview.md"
+        with open(overview_file, "a", encoding="utf-8") as f:
+            f.write("\n\nThe tides are high this season.\n")
+        plan = build_manifest.plan_site_build(
+            world_path, PROJECT_ROOT, site_path, update_link_manifest(world_path)
+        )
+        assert plan["pages"] == ["", "world"]
+
+        print("✅ Incremental build plan test passed!")
+        return True
+
+    finally:
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_incremental_build_plan())
+    sys.exit(0 if success else 1)
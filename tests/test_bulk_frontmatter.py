@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk description updates
+
+This test applies a large batch of descriptions through add_entry_frontmatter
+and checks the per-entry statuses, that repeated and unknown names are
+reported instead of written, and that the world index is updated once.
+"""
+
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.entries import content_processing
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.utils.content_parsing import read_frontmatter
+
+
+async def test_bulk_frontmatter():
+    """Test the parallel bulk apply of entry descriptions."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(
+        base_dir, f"bulk-frontmatter-test-{int(time.time())}"
+    )
+
+    try:
+        characters = world_path / "entries" / "characters"
+        characters.mkdir(parents=True, exist_ok=True)
+        for number in range(30):
+            (characters / f"sailor-{number}.md").write_text(
+                f"# Sailor {number}\n\nA sailor of the harbor.\n", encoding="utf-8"
+            )
+
+        descriptions = [
+            {"name": f"Sailor {number}", "description": f"Sailor number {number}."}
+            for number in range(30)
+        ]
+        descriptions += [
+            {"name": "Sailor 3", "description": "The third sailor, revised."},
+            {"name": "Nobody", "description": "Not in this world."},
+            {"name": "Sailor 4", "description": ""},
+        ]
+
+        # A small queue makes the pool refill many times
+        with mock.patch.object(
+            content_processing, "FRONTMATTER_WRITE_QUEUE", 4
+        ), mock.patch.object(
+            content_processing,
+            "record_entry_writes",
+            wraps=content_processing.record_entry_writes,
+        ) as record_writes:
+            result = await handle_entry_tool(
+                "add_entry_frontmatter",
+                {
+                    "world_directory": str(world_path),
+                    "entry_descriptions": descriptions,
+                },
+            )
+        text = result[0].text
+
+        # 1. Every resolvable entry is written once, in one index update
+        assert "- Updated: 30 entries" in text
+        assert "- Superseded: 1 entries" in text
+        assert "- Not found: 1 entries" in text
+        assert "- Errors: 1 entries" in text
+        assert record_writes.call_count == 1
+        assert len(record_writes.call_args[0][1]) == 30
+
+        # 2. The last description for an entry wins
+        frontmatter, _ = read_frontmatter(characters / "sailor-3.md")
+        assert frontmatter["description"] == "The third sailor, revised."
+        assert "- Sailor 3: superseded by a later description" in text
+        assert "- Nobody: not found" in text
+
+        # 3. Repeating the batch writes nothing
+        mtime = (characters / "sailor-7.md").stat().st_mtime_ns
+        result = await handle_entry_tool(
+            "add_entry_frontmatter",
+            {"world_directory": str(world_path), "entry_descriptions": descriptions},
+        )
+        assert "- Updated: 0 entries" in result[0].text
+        assert "- Already up to date: 30 entries" in result[0].text
+        assert (characters / "sailor-7.md").stat().st_mtime_ns == mtime
+
+        print("✅ Bulk frontmatter test passed!")
+        return True
+
+    finally:
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_bulk_frontmatter())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for the similarity-driven consistency selection
+
+This test fills a world with unrelated entries plus a duplicate pair, a
+related pair without cross-references and an orphan, then checks that
+analyze_world_consistency selects and flags them instead of sampling at
+random. Without NumPy it checks the random fallback.
+"""
+
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.config import NUMPY_AVAILABLE
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.utils.link_manifest import get_link_manifest_path
+from vibe_worldbuilding.utils.similarity import find_consistency_candidates
+
+FILLER_TOPICS = [
+    "orchard apple cider press autumn harvest",
+    "mountain goat shepherd alpine pasture cheese",
+    "desert caravan camel spice merchant oasis",
+    "forge blacksmith anvil iron horseshoe",
+    "library scribe parchment ink manuscript",
+    "river ferry boatman toll crossing",
+]
+
+
+def _write_entry(world_path: Path, slug: str, body: str) -> None:
+    entry_file = world_path / "entries" / "characters" / f"{slug}.md"
+    title = slug.replace("-", " ").title()
+    entry_file.write_text(f"# {title}\n\n{body}\n", encoding="utf-8")
+
+
+async def test_consistency_selection():
+    """Test that flagged entries are selected for consistency analysis."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(
+        base_dir, f"consistency-selection-test-{int(time.time())}"
+    )
+
+    try:
+        # Filler entries that link in a ring, so none of them is orphaned
+        for number, topic in enumerate(FILLER_TOPICS):
+            neighbour = (number + 1) % len(FILLER_TOPICS)
+            _write_entry(
+                world_path,
+                f"filler-{number}",
+                f"A {topic} worker who trades with Filler {neighbour}.",
+            )
+        duplicate = (
+            "A lighthouse keeper on the storm coast who tends the great lamp, "
+            "logs passing ships and rescues sailors from the reefs. Every winter "
+            "she climbs the tower stairs at dusk, trims the wicks, polishes the "
+            "brass reflectors and records the tides in a salt-stained ledger."
+        )
+        _write_entry(world_path, "mira-vale", duplicate)
+        _write_entry(world_path, "mira-of-the-light", duplicate + " Filler 0 visits.")
+        _write_entry(
+            world_path,
+            "tomas-reed",
+            "A glassblower who grinds lenses for lighthouse lamps and polishes "
+            "telescope mirrors in a furnace workshop. Filler 1 sells him sand.",
+        )
+        _write_entry(
+            world_path,
+            "lenora-quill",
+            "A glassblower who grinds telescope lenses and polishes lamp "
+            "mirrors beside her furnace. Filler 2 buys her spectacles.",
+        )
+
+        if NUMPY_AVAILABLE:
+            # 1. Duplicates, unlinked related pairs and orphans are found
+            candidates = find_consistency_candidates(world_path)
+            pairs = [
+                {Path(first).stem, Path(second).stem}
+                for first, second, _ in candidates["duplicates"]
+            ]
+            assert pairs == [{"mira-vale", "mira-of-the-light"}]
+            unlinked = [
+                {Path(first).stem, Path(second).stem}
+                for first, second, _ in candidates["unlinked"]
+            ]
+            assert {"tomas-reed", "lenora-quill"} in unlinked
+            orphans = [Path(file).stem for file in candidates["orphans"]]
+            assert orphans == ["mira-vale"]
+
+            # A second analysis reuses the stored link manifest, and a
+            # smaller cap keeps the most similar pairs
+            links_path = get_link_manifest_path(world_path)
+            mtime = links_path.stat().st_mtime_ns
+            capped = find_consistency_candidates(world_path, max_pairs=1)
+            assert links_path.stat().st_mtime_ns == mtime
+            assert capped["unlinked"] == candidates["unlinked"][:1]
+        else:
+            assert find_consistency_candidates(world_path) is None
+
+        # 2. The analysis prompt leads with the flagged entries
+        result = await handle_entry_tool(
+            "analyze_world_consistency",
+            {"world_directory": str(world_path), "entry_count": 4},
+        )
+        prompt = result[0].text
+        assert prompt.count("**File**:") == 4
+        if NUMPY_AVAILABLE:
+            assert "## Flagged by Similarity Analysis" in prompt
+            assert "Possible duplicates: **Mira Vale**" in prompt or (
+                "Possible duplicates: **Mira Of The Light**" in prompt
+            )
+            assert "mira-vale.md" in prompt and "mira-of-the-light.md" in prompt
+        else:
+            assert "## Flagged by Similarity Analysis" not in prompt
+
+        print("✅ Consistency selection test passed!")
+        return True
+
+    finally:
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_consistency_selection())
+    sys.exit(0 if success else 1)
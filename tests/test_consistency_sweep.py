@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script for the consistency sweep mode
+
+This test sweeps a world chunk by chunk and checks that linked entries share
+a chunk, that every chunk is handed out once, and that after an edit only
+the chunk holding the changed entry comes back for review.
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.config import CONSISTENCY_SWEEP_VERSION
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.utils.consistency_sweep import get_sweep_state_path
+
+
+def _write_entry(world_path: Path, slug: str, body: str) -> Path:
+    entry_file = world_path / "entries" / "characters" / f"{slug}.md"
+    title = slug.replace("-", " ").title()
+    entry_file.write_text(f"# {title}\n\n{body}\n", encoding="utf-8")
+    return entry_file
+
+
+async def _sweep(world_path: Path) -> str:
+    result = await handle_entry_tool(
+        "analyze_world_consistency",
+        {"world_directory": str(world_path), "mode": "sweep", "token_budget": 30},
+    )
+    return result[0].text
+
+
+async def test_consistency_sweep():
+    """Test chunking and incremental progress of consistency sweeps."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(base_dir, f"sweep-test-{int(time.time())}")
+
+    try:
+        # Two linked pairs and two unlinked entries of about 12 tokens each
+        _write_entry(world_path, "mira-vale", "Mira keeps the lamp for Tomas Reed.")
+        _write_entry(world_path, "tomas-reed", "Tomas sails past the lighthouse.")
+        _write_entry(world_path, "ilsa-thorn", "Ilsa forges blades for Oren Pike.")
+        _write_entry(world_path, "oren-pike", "Oren guards the mountain pass.")
+        lone = _write_entry(world_path, "lone-hermit", "A hermit of the marshes.")
+        _write_entry(world_path, "quiet-monk", "A monk of the silent abbey.")
+
+        # 1. Each chunk is handed out once, with linked entries together
+        chunks = []
+        text = await _sweep(world_path)
+        while "Consistency sweep complete" not in text:
+            chunks.append(
+                {
+                    line.split("/")[-1]
+                    for line in text.split("\n")
+                    if line.startswith("**File**:")
+                }
+            )
+            text = await _sweep(world_path)
+            assert len(chunks) < 10
+
+        assert {"mira-vale.md", "tomas-reed.md"} in chunks
+        assert {"ilsa-thorn.md", "oren-pike.md"} in chunks
+        assert sum(len(chunk) for chunk in chunks) == 6
+        assert "all 3 chunks are reviewed" in text
+
+        state = json.loads(get_sweep_state_path(world_path).read_text())
+        assert state["version"] == CONSISTENCY_SWEEP_VERSION
+        assert len(state["entries"]) == 6
+
+        # 2. Touching a file without changing it keeps it reviewed
+        lone.write_text(lone.read_text())
+        assert "Consistency sweep complete" in await _sweep(world_path)
+
+        # 3. Only the chunk of a changed entry is handed out again
+        lone.write_text("# Lone Hermit\n\nA hermit of the salt marshes.\n")
+        text = await _sweep(world_path)
+        assert "lone-hermit.md" in text
+        assert "mira-vale.md" not in text
+        assert "chunk" in text and "1 still to review" in text
+        assert "Consistency sweep complete" in await _sweep(world_path)
+
+        # 4. Budgets that are not positive integers are rejected
+        for token_budget in (0, -5, "lots"):
+            result = await handle_entry_tool(
+                "analyze_world_consistency",
+                {
+                    "world_directory": str(world_path),
+                    "mode": "sweep",
+                    "token_budget": token_budget,
+                },
+            )
+            assert result[0].text.startswith("Error:")
+
+        print("✅ Consistency sweep test passed!")
+        return True
+
+    finally:
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_consistency_sweep())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script for paged description generation
+
+This test walks the backlog of entries without descriptions page by page
+with the cursor, with and without the SQLite store and the world cache, and
+checks that pages respect the page size and token budget and together cover
+every entry once.
+"""
+
+import asyncio
+import re
+import shutil
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.utils import world_cache, world_db
+
+
+async def _walk_pages(world_path: Path, **arguments):
+    """Request pages until the backlog is done; return the files of each page."""
+    pages = []
+    cursor = ""
+    while True:
+        result = await handle_entry_tool(
+            "generate_entry_descriptions",
+            {"world_directory": str(world_path), "cursor": cursor, **arguments},
+        )
+        text = result[0].text
+        if text.startswith("All entries already have descriptions"):
+            return pages
+        pages.append(re.findall(r"\*\*File\*\*: (\S+)", text))
+        match = re.search(r'with cursor "([^"]+)"', text)
+        if not match:
+            return pages
+        cursor = match.group(1)
+
+
+async def test_description_pages():
+    """Test cursor paging through entries that need descriptions."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(
+        base_dir, f"description-pages-test-{int(time.time())}"
+    )
+
+    try:
+        characters = world_path / "entries" / "characters"
+        characters.mkdir(parents=True, exist_ok=True)
+        for number in range(30):
+            (characters / f"sailor-{number:02d}.md").write_text(
+                f"# Sailor {number}\n\n" + "Salt and rope. " * 50, encoding="utf-8"
+            )
+        (characters / "captain.md").write_text(
+            "---\ndescription: Already described.\n---\n# Captain\n", encoding="utf-8"
+        )
+        expected = sorted(
+            f"entries/characters/sailor-{number:02d}.md" for number in range(30)
+        )
+
+        # 1. Pages follow the page size and cover the backlog once, in order
+        pages = await _walk_pages(world_path, page_size=12)
+        assert [len(page) for page in pages] == [12, 12, 6]
+        assert [file for page in pages for file in page] == expected
+
+        # 2. The token budget cuts pages short, but never below one entry
+        pages = await _walk_pages(world_path, page_size=12, token_budget=400)
+        assert all(1 <= len(page) <= 3 for page in pages)
+        assert [file for page in pages for file in page] == expected
+
+        # 3. The store gives the same pages
+        with mock.patch.object(world_db, "WORLD_DB_ENABLED", True):
+            stored_pages = await _walk_pages(world_path, page_size=12)
+        assert [file for page in stored_pages for file in page] == expected
+
+        # 4. With the world cache, pages come from the in-memory index without
+        # re-reading the world for every page
+        world_cache.enable_world_cache(poll_interval=0.05, use_watchdog=False)
+        try:
+            with mock.patch.object(
+                world_cache, "load_world_index", wraps=world_cache.load_world_index
+            ) as load_index:
+                cached_pages = await _walk_pages(world_path, page_size=12)
+        finally:
+            world_cache.disable_world_cache()
+        assert [file for page in cached_pages for file in page] == expected
+        assert load_index.call_count == 1
+
+        # 5. Invalid page sizes and budgets are rejected
+        for invalid in ({"page_size": 0}, {"page_size": "ten"}, {"token_budget": -1}):
+            result = await handle_entry_tool(
+                "generate_entry_descriptions",
+                {"world_directory": str(world_path), **invalid},
+            )
+            assert result[0].text.startswith("Error:")
+
+        print("✅ Description pages test passed!")
+        return True
+
+    finally:
+        world_db.close_world_dbs()
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_description_pages())
+    sys.exit(0 if success else 1)
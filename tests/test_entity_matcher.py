@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the known-entity matcher
+
+This test checks the Aho-Corasick matcher directly, including that
+lowercase words are not taken for entry names, then builds one from a small
+world and checks that it finds existing entries (including aliases) and is
+rebuilt only when the set of entry names changes.
+"""
+
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.utils import entity_matcher
+
+
+def _target(title: str) -> dict:
+    return {"title": title, "slug": "", "taxonomy": "", "file": title}
+
+
+def test_matcher_positions():
+    """Test offsets, capitals, word boundaries and leftmost-longest selection."""
+    matcher = entity_matcher.EntityMatcher(
+        {
+            "iron guild": [_target("Iron Guild")],
+            "iron guild hall": [_target("Iron Guild Hall")],
+            "guild": [_target("Guild")],
+            "fire": [_target("Fire")],
+        }
+    )
+    text = (
+        "The Iron Guild Hall stands; the Iron guild and the Guildmaster wait "
+        "by the fire, for the iron guild has no Fire."
+    )
+    mentions = matcher.find_mentions(text)
+
+    assert [(m["text"], m["start"]) for m in mentions] == [
+        ("Iron Guild Hall", 4),
+        ("Iron guild", 32),
+        ("Fire", 107),
+    ]
+    for mention in mentions:
+        assert text[mention["start"] : mention["end"]] == mention["text"]
+
+    restored = entity_matcher.EntityMatcher.from_dict(matcher.to_dict())
+    assert restored.find_mentions(text) == mentions
+
+
+async def test_world_entity_matcher():
+    """Test matching against a world's entries and the persisted automaton."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(base_dir, f"matcher-test-{int(time.time())}")
+
+    try:
+        await handle_entry_tool(
+            "create_stub_entries",
+            {
+                "world_directory": str(world_path),
+                "stub_entries": [
+                    {
+                        "name": "Mira Vale",
+                        "taxonomy": "Characters",
+                        "description": "A cartographer.",
+                    }
+                ],
+            },
+        )
+        stub_file = world_path / "entries" / "characters" / "mira-vale.md"
+        stub_file.write_text(
+            stub_file.read_text(encoding="utf-8").replace(
+                "article_type: stub", "article_type: stub\naliases: The Cartographer"
+            ),
+            encoding="utf-8",
+        )
+
+        text = "Everyone knows The Cartographer; few have met Mira Vale."
+        mentions = entity_matcher.find_entity_mentions(world_path, text)
+        assert [m["text"] for m in mentions] == ["The Cartographer", "Mira Vale"]
+        assert entity_matcher.find_entity_mentions(world_path, "the mira vale") == []
+        assert all(m["entries"][0]["slug"] == "mira-vale" for m in mentions)
+
+        # An unchanged entry set reuses the persisted automaton
+        entity_matcher._matchers.clear()
+        with mock.patch.object(
+            entity_matcher.EntityMatcher, "_compile"
+        ) as compile_automaton:
+            entity_matcher.get_entity_matcher(world_path)
+            assert compile_automaton.call_count == 0
+
+        # A new entry invalidates it
+        await handle_entry_tool(
+            "create_stub_entries",
+            {
+                "world_directory": str(world_path),
+                "stub_entries": [
+                    {
+                        "name": "Tomas Reed",
+                        "taxonomy": "Characters",
+                        "description": "A surveyor.",
+                    }
+                ],
+            },
+        )
+        mentions = entity_matcher.find_entity_mentions(world_path, "Ask Tomas Reed.")
+        assert [m["text"] for m in mentions] == ["Tomas Reed"]
+
+        print("✅ Entity matcher test passed!")
+        return True
+
+    finally:
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    test_matcher_positions()
+    success = asyncio.run(test_world_entity_matcher())
+    sys.exit(0 if success else 1)
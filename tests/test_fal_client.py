@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared FAL client
+
+This test points the client at a local HTTP server that imitates the FAL
+endpoint and an image host, then checks that generation runs without
+blocking the event loop, that images are streamed to disk and replaced
+atomically, that oversized images are refused, that the API key is only
+sent to the FAL endpoint, and that throttling, failed downloads and
+repeated upstream errors are handled by retries and a circuit breaker,
+while a generation that may already have run is not sent again.
+"""
+
+import asyncio
+import json
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vibe_worldbuilding.utils.fal_client import CircuitBreaker, FalAPIError, FalClient
+
+IMAGE_BYTES = b"\x89PNG" + b"\x00" * 200_000
+
+
+class _FakeFalHandler(BaseHTTPRequestHandler):
+    """Slow generation endpoint plus an image host on the same server."""
+
+    authorization_headers = {}
+    failing_image_sizes = set()
+    throttled_generations = 0
+    failing_downloads = 0
+    generations = 0
+
+    def do_POST(self):
+        self.authorization_headers[self.path] = self.headers.get("Authorization")
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        _FakeFalHandler.generations += 1
+        if _FakeFalHandler.throttled_generations:
+            _FakeFalHandler.throttled_generations -= 1
+            self._respond(429, b"slow down", "text/plain", {"Retry-After": "0"})
+            return
+        if (
+            payload["prompt"] == "fail"
+            or payload.get("image_size") in self.failing_image_sizes
+        ):
+            self._respond(500, b"upstream error", "text/plain")
+            return
+
+        time.sleep(0.3)
+        host, port = self.server.server_address
+        body = json.dumps(
+            {"images": [{"url": f"http://{host}:{port}/image.png"}], "seed": 42}
+        )
+        self._respond(200, body.encode("utf-8"), "application/json")
+
+    def do_GET(self):
+        self.authorization_headers[self.path] = self.headers.get("Authorization")
+        if _FakeFalHandler.failing_downloads:
+            _FakeFalHandler.failing_downloads -= 1
+            self._respond(503, b"unavailable", "text/plain")
+            return
+        self._respond(200, IMAGE_BYTES, "image/png")
+
+    def _respond(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def test_fal_client():
+    """Test non-blocking generation, streamed downloads and error reporting."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeFalHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    api_url = f"http://{host}:{port}/generate"
+    client = FalClient(api_key="test-key", api_url=api_url, retry_base_delay=0)
+    temp_dir = Path(tempfile.mkdtemp())
+
+    try:
+        # 1. The event loop keeps running while an image generates
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.02)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        image_path = temp_dir / "image.png"
+        result = await client.generate_image({"prompt": "a harbor"}, image_path)
+        ticker_task.cancel()
+
+        assert ticks >= 5, f"event loop was blocked (only {ticks} ticks)"
+        assert result["seed"] == 42
+        assert image_path.read_bytes() == IMAGE_BYTES
+
+        # 2. The key goes to the FAL endpoint only
+        headers = _FakeFalHandler.authorization_headers
+        assert headers["/generate"] == "Key test-key"
+        assert headers["/image.png"] is None
+
+        # 3. API failures carry the status code; a generation that may have
+        # run is not sent again
+        _FakeFalHandler.generations = 0
+        try:
+            await client.generate({"prompt": "fail"}, max_retries=1)
+            raise AssertionError("expected a FalAPIError")
+        except FalAPIError as e:
+            assert e.status_code == 500
+        assert _FakeFalHandler.generations == 1
+
+        # A request that never reached the API is worth retrying
+        with socket.socket() as closed:
+            closed.bind(("127.0.0.1", 0))
+            closed_port = closed.getsockname()[1]
+        unreachable_client = FalClient(
+            api_key="test-key",
+            api_url=f"http://127.0.0.1:{closed_port}/generate",
+            max_retries=0,
+        )
+        try:
+            await unreachable_client.generate({"prompt": "a harbor"})
+            raise AssertionError("expected a FalAPIError")
+        except FalAPIError as e:
+            assert e.retryable and e.status_code is None
+        finally:
+            unreachable_client.close()
+
+        # 4. Throttled generations are retried after Retry-After
+        _FakeFalHandler.generations = 0
+        _FakeFalHandler.throttled_generations = 2
+        result = await client.generate({"prompt": "a harbor"})
+        assert result["seed"] == 42
+        assert _FakeFalHandler.generations == 3
+
+        # 5. A failed download is retried without generating again
+        _FakeFalHandler.generations = 0
+        _FakeFalHandler.failing_downloads = 1
+        await client.generate_image({"prompt": "a harbor"}, image_path)
+        assert _FakeFalHandler.generations == 1
+        assert image_path.read_bytes() == IMAGE_BYTES
+
+        # 6. An oversized image is refused and the existing file is kept
+        small_client = FalClient(
+            api_key="test-key", api_url=api_url, max_image_bytes=1024
+        )
+        try:
+            await small_client.generate_image({"prompt": "a harbor"}, image_path)
+            raise AssertionError("expected the download to be refused")
+        except FalAPIError as e:
+            assert "limit" in str(e)
+        finally:
+            small_client.close()
+        assert image_path.read_bytes() == IMAGE_BYTES
+        assert [path.name for path in temp_dir.iterdir()] == ["image.png"]
+
+        # 7. Repeated upstream errors open the breaker, which fails fast
+        breaker_client = FalClient(
+            api_key="test-key",
+            api_url=api_url,
+            max_retries=0,
+            breaker=CircuitBreaker(failure_threshold=2, cooldown=60),
+        )
+        try:
+            for _ in range(2):
+                try:
+                    await breaker_client.generate({"prompt": "fail"})
+                except FalAPIError:
+                    pass
+            _FakeFalHandler.generations = 0
+            try:
+                await breaker_client.generate({"prompt": "a harbor"})
+                raise AssertionError("expected the breaker to be open")
+            except FalAPIError as e:
+                assert "unavailable" in str(e)
+            assert _FakeFalHandler.generations == 0
+        finally:
+            breaker_client.close()
+
+        print("✅ FAL client test passed!")
+        return True
+
+    finally:
+        client.close()
+        server.shutdown()
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_fal_client())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test script for header-only frontmatter reads and in-place patching
+
+This test checks that the frontmatter reader parses the same fields as
+extract_frontmatter, returns only the requested start of the body, and
+stops reading at the closing delimiter however long the entry is. It also
+checks that patching rewrites only changed keys, skips unchanged files and
+never replaces existing files when creating new ones, and that atomic
+writes keep the file mode and never share a temporary file between threads.
+"""
+
+import shutil
+import stat
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vibe_worldbuilding.utils import content_parsing
+from vibe_worldbuilding.utils.content_parsing import (
+    add_frontmatter_to_content,
+    extract_frontmatter,
+    patch_frontmatter,
+    read_frontmatter,
+)
+from vibe_worldbuilding.utils.file_ops import (
+    create_file_atomically,
+    update_file_frontmatter,
+    write_file_atomically,
+)
+
+
+def test_read_frontmatter():
+    """Test bounded frontmatter reads against the full-content parser."""
+    temp_dir = Path(tempfile.mkdtemp())
+
+    try:
+        entry = temp_dir / "mira-vale.md"
+        content = (
+            '---\ndescription: "A cartographer: of the coast."\n'
+            "article_type: stub\n---\n# Mira Vale\n\n" + "Maps and more maps. " * 5000
+        )
+        entry.write_text(content, encoding="utf-8")
+        plain = temp_dir / "plain.md"
+        plain.write_text("# Plain\n\nNo frontmatter here.", encoding="utf-8")
+        unterminated = temp_dir / "unterminated.md"
+        unterminated.write_text("---\nname: Open\n" + "x" * 40000, encoding="utf-8")
+
+        # 1. Same fields as the full parser, and only the requested body
+        frontmatter, head = read_frontmatter(entry, 20)
+        assert frontmatter == extract_frontmatter(content)[0]
+        assert frontmatter["description"] == "A cartographer: of the coast."
+        assert head == extract_frontmatter(content)[1][:20] == "# Mira Vale\n\nMaps an"
+        assert read_frontmatter(entry) == (frontmatter, "")
+
+        # 2. Files without frontmatter return the start of the content
+        assert read_frontmatter(plain, 7) == ({}, "# Plain")
+        assert read_frontmatter(plain, 100) == ({}, plain.read_text())
+
+        # 3. Unterminated blocks give up at the read limit, and like
+        # extract_frontmatter treat the whole file as content
+        with mock.patch.object(content_parsing, "FRONTMATTER_MAX_CHARS", 64):
+            assert read_frontmatter(unterminated, 10) == (
+                {"name": "Open"},
+                "---\nname: ",
+            )
+        short = temp_dir / "short.md"
+        short.write_text(
+            "---\nname: Open\n# Open\n\nNo closing line.", encoding="utf-8"
+        )
+        frontmatter, body = extract_frontmatter(short.read_text(encoding="utf-8"))
+        assert read_frontmatter(short, 1000) == (frontmatter, body)
+
+        print("✅ Frontmatter reader test passed!")
+
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def test_patch_frontmatter():
+    """Test in-place frontmatter patching and atomic file updates."""
+    temp_dir = Path(tempfile.mkdtemp())
+
+    try:
+        content = (
+            "---\n# kept comment\ndescription: 'Old: text'\narticle_type: stub\n"
+            "---\n\n# Mira Vale\n\nBody text.\n"
+        )
+
+        # 1. Unchanged values leave the content exactly as it was
+        assert patch_frontmatter(content, {"description": "Old: text"}) == content
+        assert patch_frontmatter(content, {"description": ""}) == content
+
+        # 2. Only changed keys are rewritten; new keys go at the end
+        patched = patch_frontmatter(
+            content, {"article_type": "full", "image_prompt": "A map: at dusk"}
+        )
+        assert patched == (
+            "---\n# kept comment\ndescription: 'Old: text'\narticle_type: full\n"
+            'image_prompt: "A map: at dusk"\n---\n\n# Mira Vale\n\nBody text.\n'
+        )
+        assert extract_frontmatter(patched)[0]["image_prompt"] == "A map: at dusk"
+
+        # 3. Content without frontmatter gets a block as before
+        plain = "# Plain\n\nText."
+        assert patch_frontmatter(plain, {"description": "D"}) == (
+            add_frontmatter_to_content(plain, {"description": "D"})
+        )
+
+        # 4. Files are only rewritten when a value changes
+        entry = temp_dir / "mira-vale.md"
+        entry.write_text(content, encoding="utf-8")
+        mtime = entry.stat().st_mtime_ns
+        assert not update_file_frontmatter(entry, {"article_type": "stub"})
+        assert entry.stat().st_mtime_ns == mtime
+        assert update_file_frontmatter(entry, {"article_type": "full"})
+        assert "article_type: full" in entry.read_text(encoding="utf-8")
+        assert sorted(path.name for path in temp_dir.iterdir()) == ["mira-vale.md"]
+
+        # 5. Atomic creation never replaces an existing file
+        assert not create_file_atomically(entry, "replaced")
+        assert "Body text." in entry.read_text(encoding="utf-8")
+        assert create_file_atomically(temp_dir / "new.md", "new")
+        assert (temp_dir / "new.md").read_text(encoding="utf-8") == "new"
+        assert len(list(temp_dir.iterdir())) == 2
+
+        # 6. Replacing a file keeps its mode, and concurrent writers of one
+        # path each use their own temporary file
+        entry.chmod(0o640)
+        assert update_file_frontmatter(entry, {"article_type": "stub"})
+        assert stat.S_IMODE(entry.stat().st_mode) == 0o640
+        shared = temp_dir / "shared.md"
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(
+                executor.map(
+                    lambda number: write_file_atomically(shared, "x" * number),
+                    range(1, 65),
+                )
+            )
+        assert len(shared.read_text(encoding="utf-8")) in range(1, 65)
+        assert len(list(temp_dir.iterdir())) == 3
+
+        print("✅ Frontmatter patching test passed!")
+
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_read_frontmatter()
+    test_patch_frontmatter()
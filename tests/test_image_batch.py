@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for batch image generation
+
+This test runs generate_images_batch against a local stand-in for the FAL
+API and checks entry selection, retries of failing entries, the summary,
+and resuming from the progress file.
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_fal_client import _FakeFalHandler
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.tools import images
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.utils import fal_client
+
+
+async def test_image_batch():
+    """Test selection, retries, summary and resume of a batch run."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeFalHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    client = fal_client.FalClient(
+        api_key="test-key",
+        api_url=f"http://{host}:{port}/generate",
+        retry_base_delay=0,
+    )
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(base_dir, f"batch-test-{int(time.time())}")
+
+    try:
+        prompts = {"Mira Vale": "A cartographer at dawn", "Tomas Reed": "fail"}
+        for name in ("Mira Vale", "Tomas Reed", "Ilsa Thorn"):
+            await handle_entry_tool(
+                "create_world_entry",
+                {
+                    "world_directory": str(world_path),
+                    "taxonomy": "Characters",
+                    "entry_name": name,
+                    "entry_content": f"# {name}\n\nA figure of the coast.",
+                },
+            )
+            if name in prompts:
+                slug = name.lower().replace(" ", "-")
+                await images.generate_image_prompt_for_entry(
+                    {
+                        "filepath": str(
+                            world_path / "entries" / "characters" / f"{slug}.md"
+                        ),
+                        "image_prompt": prompts[name],
+                    }
+                )
+
+        arguments = {
+            "world_directory": str(world_path),
+            "taxonomy": "Characters",
+            "max_concurrency": 2,
+            "requests_per_minute": 0,
+            "max_retries": 1,
+        }
+        with mock.patch.object(images, "FAL_API_KEY", "test-key"), mock.patch.object(
+            fal_client, "_client", client
+        ):
+            # 1. One image generated, one failing entry retried, one without a prompt
+            summary = (await images.generate_images_batch(arguments))[0].text
+            assert "- Generated: 1" in summary
+            assert "- Failed: 1" in summary
+            assert "- Missing image_prompt: 1" in summary
+            assert "entries/characters/tomas-reed.md" in summary
+
+            image_path = world_path / "images" / "characters" / "mira-vale.png"
+            assert image_path.exists()
+            assert not (
+                world_path / "images" / "characters" / "tomas-reed.png"
+            ).exists()
+
+            progress_path = world_path / "metadata" / "image_batch.json"
+            progress = json.loads(progress_path.read_text())["entries"]
+            assert progress["entries/characters/mira-vale.md"]["status"] == "done"
+            assert progress["entries/characters/tomas-reed.md"]["status"] == "failed"
+
+            # 2. A re-run skips finished images
+            summary = (await images.generate_images_batch(arguments))[0].text
+            assert "- Already illustrated: 1" in summary
+            assert "- Generated: 0" in summary
+
+            # 3. An image interrupted mid-run is generated again
+            progress["entries/characters/mira-vale.md"]["status"] = "running"
+            progress_path.write_text(json.dumps({"entries": progress}))
+            summary = (await images.generate_images_batch(arguments))[0].text
+            assert "- Generated: 1" in summary
+
+            # 4. Invalid limits and concurrency are rejected
+            for invalid in (
+                {"max_concurrency": 0},
+                {"limit": "ten"},
+                {"max_retries": -1},
+                {"requests_per_minute": None},
+            ):
+                result = await images.generate_images_batch({**arguments, **invalid})
+                assert result[0].text.startswith("Error:")
+
+        print("✅ Image batch test passed!")
+        return True
+
+    finally:
+        client.close()
+        server.shutdown()
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_image_batch())
+    sys.exit(0 if success else 1)
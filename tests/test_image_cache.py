@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the content-addressed image cache
+
+This test generates images through the FAL client against a local fake
+endpoint with a cache in a temporary directory, and checks that repeating a
+request is served from the cache without calling the API, that the cached
+image is hard-linked into place, and that old images are evicted without
+rescanning the cache on every write.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_fal_client import IMAGE_BYTES, _FakeFalHandler
+
+from vibe_worldbuilding.utils.fal_client import FalClient
+from vibe_worldbuilding.utils.image_cache import ImageCache
+
+
+class _CountingFalHandler(_FakeFalHandler):
+    """Fake FAL endpoint that counts generation requests."""
+
+    generations = 0
+
+    def do_POST(self):
+        type(self).generations += 1
+        super().do_POST()
+
+
+async def test_image_cache():
+    """Test cache hits, hard-link publishing, regeneration and eviction."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CountingFalHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    temp_dir = Path(tempfile.mkdtemp())
+    cache = ImageCache(temp_dir / "cache", max_bytes=len(IMAGE_BYTES) * 2 + 1024)
+    client = FalClient(
+        api_key="test-key", api_url=f"http://{host}:{port}/generate", cache=cache
+    )
+    payload = {"prompt": "a harbor", "aspect_ratio": "16:9", "num_images": 1}
+    scan = mock.patch.object(cache, "_scan", wraps=cache._scan).start()
+
+    try:
+        # 1. The first request generates and fills the cache
+        first_path = temp_dir / "world-a" / "harbor.png"
+        first_path.parent.mkdir()
+        result = await client.generate_image(payload, first_path)
+        assert _CountingFalHandler.generations == 1
+        assert not result.get("cached")
+        assert first_path.read_bytes() == IMAGE_BYTES
+
+        # 2. The same request in another world is a hard-linked cache hit
+        second_path = temp_dir / "world-b" / "harbor.png"
+        second_path.parent.mkdir()
+        result = await client.generate_image(payload, second_path)
+        assert _CountingFalHandler.generations == 1
+        assert result["cached"] and result["seed"] == 42
+        assert os.stat(second_path).st_ino == os.stat(first_path).st_ino
+
+        # 3. A different aspect ratio or a forced regeneration calls the API
+        await client.generate_image(
+            {**payload, "aspect_ratio": "1:1"}, temp_dir / "square.png"
+        )
+        await client.generate_image(payload, second_path, reuse_cached=False)
+        assert _CountingFalHandler.generations == 3
+        assert first_path.read_bytes() == IMAGE_BYTES
+
+        # 4. A third image pushes the least recently used one out
+        await client.generate_image(
+            {**payload, "prompt": "a lighthouse"}, temp_dir / "lighthouse.png"
+        )
+        cached_images = list((temp_dir / "cache").glob("*/*.png"))
+        assert len(cached_images) == 2
+        square_key = cache.key_for(client.api_url, {**payload, "aspect_ratio": "1:1"})
+        assert cache.get(square_key, temp_dir / "evicted.png") is None
+
+        # 5. The cache is scanned to count its size once, then only to evict
+        assert scan.call_count == 2
+
+        print("✅ Image cache test passed!")
+        return True
+
+    finally:
+        mock.patch.stopall()
+        client.close()
+        server.shutdown()
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_image_cache())
+    sys.exit(0 if success else 1)
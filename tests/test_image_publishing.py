@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for publishing world images to a built site
+
+This test syncs an images folder into a site folder and checks that only
+new or changed files are written, that unchanged files are not touched,
+that images removed from the world disappear from the site, and that
+concurrent publishes to one path do not collide.
+"""
+
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vibe_worldbuilding.tools.site import _sync_directory
+from vibe_worldbuilding.utils import file_ops
+from vibe_worldbuilding.utils.file_ops import link_or_copy_file
+
+
+def test_image_publishing():
+    """Test incremental image sync with stale file removal."""
+    temp_dir = Path(tempfile.mkdtemp())
+    images_path = temp_dir / "images"
+    site_images_path = temp_dir / "site" / "images"
+
+    try:
+        (images_path / "characters").mkdir(parents=True)
+        (images_path / "characters" / "mira-vale.png").write_bytes(b"mira" * 256)
+        (images_path / "world-overview.png").write_bytes(b"overview")
+        (site_images_path / "places").mkdir(parents=True)
+        (site_images_path / "places" / "old-harbor.png").write_bytes(b"stale")
+
+        # 1. First sync publishes both images and removes the stale one
+        assert _sync_directory(images_path, site_images_path) == 3
+        published = sorted(
+            path.relative_to(site_images_path).as_posix()
+            for path in site_images_path.rglob("*")
+        )
+        assert published == [
+            "characters",
+            "characters/mira-vale.png",
+            "world-overview.png",
+        ]
+
+        # 2. A second sync writes nothing
+        assert _sync_directory(images_path, site_images_path) == 0
+
+        # 3. A regenerated image is published again
+        (images_path / "world-overview.png").unlink()
+        (images_path / "world-overview.png").write_bytes(b"new overview")
+        assert _sync_directory(images_path, site_images_path) == 1
+        assert (site_images_path / "world-overview.png").read_bytes() == b"new overview"
+
+        # 4. Every publishing method produces an identical file
+        method = link_or_copy_file(
+            images_path / "characters" / "mira-vale.png", temp_dir / "copy.png"
+        )
+        assert method in ("hardlink", "reflink", "copy_file_range", "copy")
+        assert (temp_dir / "copy.png").read_bytes() == b"mira" * 256
+
+        # 5. Concurrent publishes to one path never share a temporary file,
+        # and a failed publish leaves none behind
+        source = images_path / "characters" / "mira-vale.png"
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(
+                executor.map(
+                    lambda _: link_or_copy_file(source, temp_dir / "shared.png"),
+                    range(32),
+                )
+            )
+        assert (temp_dir / "shared.png").read_bytes() == b"mira" * 256
+        with mock.patch.object(file_ops.os, "replace", side_effect=OSError):
+            try:
+                link_or_copy_file(source, temp_dir / "failed.png")
+                assert False, "publish should have failed"
+            except OSError:
+                pass
+        assert not list(temp_dir.glob(".*.tmp"))
+
+        print("✅ Image publishing test passed!")
+
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    test_image_publishing()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for resized image renditions
+
+This test creates renditions for the images of a small world and checks the
+image manifest, that unchanged images are not resized again, and that the
+renditions of a removed image are cleaned up, and that renders fall back
+to threads without a fork server. Without Pillow it checks that
+no renditions are recorded, so the pages keep using the original images.
+"""
+
+import asyncio
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vibe_worldbuilding.config import IMAGE_RENDITIONS, PIL_AVAILABLE
+from vibe_worldbuilding.utils import image_renditions
+from vibe_worldbuilding.utils.image_renditions import (
+    read_image_manifest,
+    shutdown_rendition_pool,
+    update_image_renditions,
+)
+
+
+async def test_image_renditions():
+    """Test rendition creation, reuse and cleanup."""
+    world_path = Path(tempfile.mkdtemp())
+    images_path = world_path / "images"
+    (images_path / "characters").mkdir(parents=True)
+    image_file = images_path / "characters" / "mira-vale.png"
+
+    try:
+        if not PIL_AVAILABLE:
+            image_file.write_bytes(b"\x89PNG" + b"\x00" * 1024)
+            assert await update_image_renditions(world_path) == {}
+            assert not (images_path / "_renditions").exists()
+            print("✅ Image renditions test passed (Pillow not installed)!")
+            return True
+
+        from PIL import Image
+
+        Image.new("RGB", (2048, 1536), (40, 90, 160)).save(image_file)
+        Image.new("RGB", (300, 200), (200, 60, 30)).save(
+            images_path / "world-overview-header.png"
+        )
+
+        # 1. Every image gets every rendition, never upscaled
+        manifest = await update_image_renditions(world_path)
+        record = manifest["characters/mira-vale.png"]
+        assert (record["width"], record["height"]) == (2048, 1536)
+        assert set(record["renditions"]) == set(IMAGE_RENDITIONS)
+        thumb = record["renditions"]["thumb"]
+        assert max(thumb["width"], thumb["height"]) == IMAGE_RENDITIONS["thumb"]
+        assert (images_path / thumb["path"]).exists()
+        assert thumb["bytes"] < image_file.stat().st_size
+        header = manifest["world-overview-header.png"]["renditions"]["medium"]
+        assert (header["width"], header["height"]) == (300, 200)
+        assert read_image_manifest(world_path) == manifest
+
+        # 2. Unchanged images are not resized again
+        thumb_mtime = (images_path / thumb["path"]).stat().st_mtime_ns
+        await update_image_renditions(world_path)
+        assert (images_path / thumb["path"]).stat().st_mtime_ns == thumb_mtime
+
+        # 3. Renditions of removed images are cleaned up
+        image_file.unlink()
+        manifest = await update_image_renditions(world_path)
+        assert list(manifest) == ["world-overview-header.png"]
+        assert not (images_path / thumb["path"]).exists()
+
+        # 4. Without a fork server the renders run on threads, and parallel
+        # renders of one image do not share temporary files
+        shutdown_rendition_pool()
+        with mock.patch.object(
+            image_renditions.multiprocessing,
+            "get_all_start_methods",
+            return_value=["spawn"],
+        ):
+            assert image_renditions._get_pool() is None
+        source = images_path / "world-overview-header.png"
+        targets = image_renditions._rendition_targets(
+            images_path, "world-overview-header.png"
+        )
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(
+                    lambda _: image_renditions._render_image(str(source), targets, 80),
+                    range(16),
+                )
+            )
+        assert all(result["width"] == 300 for result in results)
+        assert not list(images_path.rglob("*.tmp"))
+
+        print("✅ Image renditions test passed!")
+        return True
+
+    finally:
+        shutdown_rendition_pool()
+        shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_image_renditions())
+    sys.exit(0 if success else 1)
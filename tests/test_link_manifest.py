@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test script for the cross-link manifest
+
+This test writes a few entries through the tools, then checks that
+metadata/links.json records each mention of another entry with offsets into
+the entry body as the site page reads it (CRLF line endings included), skips
+existing links and self-mentions, and lists backlinks, including those of
+entries written before the entry they mention.
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.utils.link_manifest import (
+    extract_page_body,
+    get_link_manifest_path,
+    update_link_manifest,
+)
+
+
+async def test_link_manifest():
+    """Test link offsets, exclusions, backlinks and full refreshes."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(base_dir, f"links-test-{int(time.time())}")
+
+    try:
+        await handle_entry_tool(
+            "create_stub_entries",
+            {
+                "world_directory": str(world_path),
+                "stub_entries": [
+                    {
+                        "name": "Tomas Reed",
+                        "taxonomy": "Characters",
+                        "description": "A surveyor.",
+                    }
+                ],
+            },
+        )
+        await handle_entry_tool(
+            "create_world_entry",
+            {
+                "world_directory": str(world_path),
+                "taxonomy": "Characters",
+                "entry_name": "Mira Vale",
+                "entry_content": (
+                    "# Mira Vale\n\nMira Vale mapped the coast with Tomas Reed. "
+                    "See [Tomas Reed](/elsewhere) and `Tomas Reed`."
+                ),
+            },
+        )
+
+        # 1. Mentions are recorded with body offsets, once per plain mention
+        manifest = json.loads(get_link_manifest_path(world_path).read_text())
+        mira = manifest["entries"]["characters/mira-vale"]
+        assert [link["slug"] for link in mira["links"]] == ["tomas-reed"]
+
+        entry_file = world_path / "entries" / "characters" / "mira-vale.md"
+        body = extract_page_body(entry_file.read_text(encoding="utf-8"))
+        link = mira["links"][0]
+        assert body[link["start"] : link["end"]] == link["text"] == "Tomas Reed"
+
+        # Offsets of an entry saved with CRLF line endings count the "\r"s
+        crlf_content = entry_file.read_bytes().replace(b"\n", b"\r\n")
+        entry_file.write_bytes(crlf_content)
+        link = update_link_manifest(world_path)["characters/mira-vale"]["links"][0]
+        body = extract_page_body(crlf_content.decode("utf-8"))
+        assert "\r\n" in body and not body.startswith("---")
+        assert body[link["start"] : link["end"]] == "Tomas Reed"
+
+        # 2. Backlinks are attached to the target entry
+        tomas = manifest["entries"]["characters/tomas-reed"]
+        assert tomas["backlinks"] == [
+            {"taxonomy": "characters", "slug": "mira-vale", "title": "Mira Vale"}
+        ]
+
+        # 3. A full refresh picks up entries edited outside the tools
+        entry_file.write_text("# Mira Vale\n\nNo one else here.\n", encoding="utf-8")
+        manifest = update_link_manifest(world_path)
+        assert manifest["characters/mira-vale"]["links"] == []
+        assert manifest["characters/tomas-reed"]["backlinks"] == []
+
+        # 4. Entries written earlier link to an entry created after them
+        entry_file.write_text(
+            "# Mira Vale\n\nShe sailed with Oren Dusk.\n", encoding="utf-8"
+        )
+        update_link_manifest(world_path)
+        await handle_entry_tool(
+            "create_world_entry",
+            {
+                "world_directory": str(world_path),
+                "taxonomy": "Characters",
+                "entry_name": "Oren Dusk",
+                "entry_content": "# Oren Dusk\n\nA sailor.",
+            },
+        )
+        manifest = json.loads(get_link_manifest_path(world_path).read_text())
+        mira = manifest["entries"]["characters/mira-vale"]
+        assert [link["slug"] for link in mira["links"]] == ["oren-dusk"]
+        assert manifest["entries"]["characters/oren-dusk"]["backlinks"] == [
+            {"taxonomy": "characters", "slug": "mira-vale", "title": "Mira Vale"}
+        ]
+
+        print("✅ Link manifest test passed!")
+        return True
+
+    finally:
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_link_manifest())
+    sys.exit(0 if success else 1)
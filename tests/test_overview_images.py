@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for concurrent world overview images
+
+This test creates a world against a local stand-in for the FAL API and
+checks that the three overview images and the favicon are generated
+concurrently and that a failing image is reported without hiding the others.
+"""
+
+import asyncio
+import shutil
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_fal_client import _FakeFalHandler
+
+from vibe_worldbuilding.tools import world
+from vibe_worldbuilding.utils import fal_client
+
+
+async def test_concurrent_overview_images():
+    """Test concurrent overview and favicon generation with per-image errors."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeFalHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    client = fal_client.FalClient(
+        api_key="test-key",
+        api_url=f"http://{host}:{port}/generate",
+        retry_base_delay=0,
+    )
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = None
+
+    try:
+        _FakeFalHandler.failing_image_sizes = {"landscape_16_9"}
+        with mock.patch.object(world, "FAL_API_KEY", "test-key"), mock.patch.object(
+            world, "FAL_AVAILABLE", True
+        ), mock.patch.object(fal_client, "_client", client):
+            started = time.monotonic()
+            result = await world.handle_world_tool(
+                "instantiate_world",
+                {
+                    "world_name": f"images-test-{int(time.time())}",
+                    "world_content": "# Images Test World\n\nA world of harbors.",
+                    "base_directory": str(base_dir),
+                },
+            )
+            elapsed = time.monotonic() - started
+
+        text = result[0].text
+        for line in text.split("\n"):
+            if line.startswith("Full path:"):
+                world_path = Path(line.replace("Full path:", "").strip())
+
+        # Four 0.3 s generations in well under their serial time
+        assert elapsed < 0.9, f"images were generated serially ({elapsed:.2f}s)"
+
+        images_path = world_path / "images"
+        assert (images_path / "world-overview-atmosphere.png").exists()
+        assert (images_path / "world-overview-concept.png").exists()
+        assert (images_path / "favicon.png").exists()
+        assert "Generated atmosphere image" in text
+        assert "Failed to generate header image" in text
+
+        print("✅ Concurrent overview images test passed!")
+        return True
+
+    finally:
+        _FakeFalHandler.failing_image_sizes = set()
+        client.close()
+        server.shutdown()
+        if world_path and world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_concurrent_overview_images())
+    sys.exit(0 if success else 1)
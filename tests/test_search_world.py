@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test script for the search_world tool
+
+This test searches a small world and checks ranking, the taxonomy filter,
+snippets, the index shards on disk and re-indexing of edited entries.
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.config import SEARCH_INDEX_VERSION
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.tools.taxonomy import handle_taxonomy_tool
+from vibe_worldbuilding.utils.search_index import (
+    get_search_index_path,
+    search_world_index,
+)
+
+
+async def test_search_world():
+    """Test ranked full-text search over a world."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(base_dir, f"search-test-{int(time.time())}")
+
+    try:
+        await handle_taxonomy_tool(
+            "create_taxonomy",
+            {
+                "world_directory": str(world_path),
+                "taxonomy_name": "Locations",
+                "taxonomy_description": "Towns, ports and wild places",
+                "custom_guidelines": "## Entry Guidelines\n- Name the landmarks",
+            },
+        )
+        entries = {
+            ("Characters", "Mira Vale"): "A cartographer who maps the drowned "
+            "harbors. She keeps a brass astrolabe salvaged from a shipwreck.",
+            ("Characters", "Tomas Reed"): "A harbor pilot of the northern reefs.",
+            ("Locations", "Saltmere"): "A fishing town whose harbor freezes "
+            "each winter. The astrolabe market is held on the quay.",
+        }
+        for (taxonomy, name), body in entries.items():
+            await handle_entry_tool(
+                "create_world_entry",
+                {
+                    "world_directory": str(world_path),
+                    "taxonomy": taxonomy,
+                    "entry_name": name,
+                    "entry_content": f"# {name}\n\n{body}",
+                },
+            )
+
+        # 1. Entry writes are indexed into one shard per taxonomy
+        search_path = get_search_index_path(world_path)
+        shard = json.loads((search_path / "characters.json").read_text())
+        assert shard["version"] == SEARCH_INDEX_VERSION
+        assert "entries/characters/mira-vale.md" in shard["documents"]
+
+        # 2. Body matches are ranked, and the snippet highlights the match
+        results, total = search_world_index(world_path, "astrolabe shipwreck")
+        assert total == 2
+        assert results[0]["file"] == "entries/characters/mira-vale.md"
+        assert "**astrolabe**" in results[0]["snippet"]
+
+        # 3. The taxonomy filter applies, and overviews are searchable too
+        results, total = search_world_index(world_path, "astrolabe", "locations")
+        assert [result["file"] for result in results] == [
+            "entries/locations/saltmere.md"
+        ]
+        results, _ = search_world_index(world_path, "locations")
+        assert any(result["kind"] == "taxonomy" for result in results)
+
+        # 4. Edited entries are re-indexed
+        saltmere = world_path / "entries" / "locations" / "saltmere.md"
+        saltmere.write_text("# Saltmere\n\nA town of glassblowers.\n")
+        results, total = search_world_index(world_path, "astrolabe")
+        assert total == 1
+        results, _ = search_world_index(world_path, "glassblowers")
+        assert results[0]["file"] == "entries/locations/saltmere.md"
+
+        # 5. The tool formats the ranked list
+        result = await handle_entry_tool(
+            "search_world",
+            {"world_directory": str(world_path), "query": "harbor", "limit": 1},
+        )
+        text = result[0].text
+        assert "Showing 1 of 2 matching files." in text
+        assert "File: entries/" in text
+
+        result = await handle_entry_tool(
+            "search_world",
+            {"world_directory": str(world_path), "query": "dragons"},
+        )
+        assert "No matches" in result[0].text
+
+        # 6. Invalid limits are rejected
+        for limit in (0, -3, "ten"):
+            result = await handle_entry_tool(
+                "search_world",
+                {"world_directory": str(world_path), "query": "harbor", "limit": limit},
+            )
+            assert result[0].text.startswith("Error:")
+
+        print("✅ Search world test passed!")
+        return True
+
+    finally:
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_search_world())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for batched stub creation
+
+This test creates a large batch of stubs with duplicates, existing entries,
+unknown taxonomies and a new taxonomy, and checks what is written and that
+the world index is updated once for the whole batch.
+"""
+
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.entries import stub_generation
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.utils import world_index
+
+
+async def test_stub_batch():
+    """Test deduplication and the single index update of a stub batch."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(
+        base_dir, f"stub-batch-test-{int(time.time())}"
+    )
+
+    try:
+        await handle_entry_tool(
+            "create_world_entry",
+            {
+                "world_directory": str(world_path),
+                "taxonomy": "Characters",
+                "entry_name": "Mira Vale",
+                "entry_content": "# Mira Vale\n\nA cartographer of the coast.",
+            },
+        )
+        existing = world_path / "entries" / "characters" / "mira-vale.md"
+        existing_content = existing.read_text()
+
+        stubs = [
+            {
+                "name": f"Sailor {number}",
+                "taxonomy": "Characters",
+                "description": f"A sailor of the harbor, number {number}.",
+            }
+            for number in range(25)
+        ]
+        stubs += [
+            # Same file name as an earlier stub in the batch
+            {"name": "sailor 3", "taxonomy": "characters", "description": "Again."},
+            # Existing entry
+            {"name": "Mira Vale", "taxonomy": "Characters", "description": "Dupe."},
+            # Unknown taxonomy without create_taxonomy
+            {"name": "Saltmere", "taxonomy": "Locations", "description": "A town."},
+            # Incomplete stub
+            {"name": "Nameless", "taxonomy": "Characters"},
+            # New taxonomy
+            {
+                "name": "Brass Astrolabe",
+                "taxonomy": "Artifacts",
+                "description": "A salvaged navigation instrument.",
+                "create_taxonomy": True,
+            },
+        ]
+
+        with mock.patch.object(
+            stub_generation,
+            "record_entry_writes",
+            wraps=stub_generation.record_entry_writes,
+        ) as record_writes:
+            result = await handle_entry_tool(
+                "create_stub_entries",
+                {"world_directory": str(world_path), "stub_entries": stubs},
+            )
+        text = result[0].text
+
+        # 1. Only new, complete stubs are written, all in one index update
+        assert "**Stub Entries Created:** 26" in text
+        assert "**New Taxonomies Created:** Artifacts" in text
+        assert record_writes.call_count == 1
+        assert len(record_writes.call_args[0][1]) == 26
+
+        assert existing.read_text() == existing_content
+        sailor = world_path / "entries" / "characters" / "sailor-3.md"
+        assert "number 3." in sailor.read_text()
+        assert "article_type: stub" in sailor.read_text()
+        assert not (world_path / "entries" / "locations").exists()
+        assert (world_path / "taxonomies" / "artifacts-overview.md").exists()
+        assert (world_path / "entries" / "artifacts" / "brass-astrolabe.md").exists()
+
+        slugs = {
+            record["slug"] for record in world_index.get_indexed_entries(world_path)
+        }
+        assert len(slugs) == 27 and "brass-astrolabe" in slugs
+
+        # 2. Repeating the batch creates nothing
+        result = await handle_entry_tool(
+            "create_stub_entries",
+            {"world_directory": str(world_path), "stub_entries": stubs},
+        )
+        assert "No new stub entries" in result[0].text
+
+        print("✅ Stub batch test passed!")
+        return True
+
+    finally:
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_stub_batch())
+    sys.exit(0 if success else 1)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-process world cache
+
+This test enables the server's world cache with stat polling, then checks
+that repeated tool calls reuse parsed world state, that tool writes update
+the cache directly, and that edits made outside the tools are picked up.
+"""
+
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.utils import world_cache, world_index
+
+
+async def test_world_cache():
+    """Test cache reuse, direct write-through and external change detection."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(base_dir, f"cache-test-{int(time.time())}")
+    world_cache.enable_world_cache(poll_interval=0.05, use_watchdog=False)
+
+    try:
+        # 1. Warm the cache with a context-only call
+        await handle_entry_tool(
+            "create_world_entry",
+            {
+                "world_directory": str(world_path),
+                "taxonomy": "Characters",
+                "entry_name": "Mira Vale",
+            },
+        )
+
+        # 2. Creating entries re-parses only the file that was written
+        with mock.patch.object(
+            world_index, "_build_entry_record", wraps=world_index._build_entry_record
+        ) as build_record, mock.patch.object(
+            world_cache, "load_world_index", wraps=world_cache.load_world_index
+        ) as load_index:
+            for name in ("Mira Vale", "Tomas Reed"):
+                await handle_entry_tool(
+                    "create_world_entry",
+                    {
+                        "world_directory": str(world_path),
+                        "taxonomy": "Characters",
+                        "entry_name": name,
+                        "entry_content": f"# {name}\n\nA surveyor of the coast.",
+                    },
+                )
+            assert load_index.call_count == 0, "cache fell back to a full refresh"
+            assert build_record.call_count == 2
+
+        slugs = [
+            record["slug"] for record in world_cache.get_cached_entries(world_path)
+        ]
+        assert slugs == ["mira-vale", "tomas-reed"]
+
+        # 3. Edits made outside the tools are picked up by the poller
+        entry_file = world_path / "entries" / "characters" / "tomas-reed.md"
+        entry_file.write_text(
+            "---\ndescription: Edited by hand\n---\n\n# Tomas Reed\n", encoding="utf-8"
+        )
+        (world_path / "entries" / "characters" / "mira-vale.md").unlink()
+        time.sleep(0.3)
+
+        records = world_cache.get_cached_entries(world_path)
+        assert [record["slug"] for record in records] == ["tomas-reed"]
+        assert records[0]["frontmatter"]["description"] == "Edited by hand"
+
+        print("✅ World cache test passed!")
+        return True
+
+    finally:
+        world_cache.disable_world_cache()
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_world_cache())
+    sys.exit(0 if success else 1)
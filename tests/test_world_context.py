@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the relevance-ranked entry context
+
+This test fills a world with many unrelated entries and a few related ones,
+then checks that create_world_entry lists the related entries first and
+keeps its world context within the token budget.
+"""
+
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.config import CHARS_PER_TOKEN, WORLD_CONTEXT_TOKEN_BUDGET
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.utils.relevance import BM25Index, rank_world_entries, tokenize
+
+
+def _write_entry(world_path: Path, slug: str, description: str) -> None:
+    entry_file = world_path / "entries" / "characters" / f"{slug}.md"
+    entry_file.parent.mkdir(parents=True, exist_ok=True)
+    title = slug.replace("-", " ").title()
+    entry_file.write_text(
+        f"---\ndescription: {description}\n---\n\n# {title}\n\n{description}\n",
+        encoding="utf-8",
+    )
+
+
+async def test_world_context():
+    """Test ranking and the token budget of the entry creation context."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(base_dir, f"context-test-{int(time.time())}")
+
+    try:
+        for number in range(300):
+            _write_entry(
+                world_path,
+                f"farmer-{number}",
+                "A farmer of the inland wheat valleys who tends the old orchards "
+                "and trades grain at the autumn markets.",
+            )
+        _write_entry(
+            world_path,
+            "mira-vale",
+            "A cartographer who charts the drowned harbors of the lighthouse coast.",
+        )
+        _write_entry(
+            world_path,
+            "tomas-reed",
+            "A harbor pilot guiding ships past the lighthouse reefs.",
+        )
+
+        # 1. Entries mentioning the query terms rank first
+        ranked = rank_world_entries(
+            world_path, "Lighthouse Keeper harbors", "characters"
+        )
+        assert {ranked[0][0]["slug"], ranked[1][0]["slug"]} == {
+            "mira-vale",
+            "tomas-reed",
+        }
+        assert ranked[2][1] == 0.0
+
+        # 2. The context lists them first and stays within the budget
+        result = await handle_entry_tool(
+            "create_world_entry",
+            {
+                "world_directory": str(world_path),
+                "taxonomy": "Characters",
+                "entry_name": "Lighthouse Keeper",
+            },
+        )
+        text = result[0].text
+        entries_section = text.split("**Most Relevant Existing Entries:**")[1]
+        assert entries_section.index("Mira Vale") < entries_section.index("Farmer")
+        assert entries_section.index("Tomas Reed") < entries_section.index("Farmer")
+        assert "more)" in entries_section
+        context = text.split("**Writing Guidelines:**")[0]
+        assert len(context) < WORLD_CONTEXT_TOKEN_BUDGET * CHARS_PER_TOKEN + 500
+
+        # 3. Replacing and removing documents keeps the statistics consistent
+        index = BM25Index()
+        index.add("a", tokenize("harbor pilot"))
+        index.add("b", tokenize("harbor keeper"))
+        index.add("a", tokenize("forge smith"))
+        assert set(index.score(tokenize("harbor"))) == {"b"}
+        index.remove("b")
+        assert index.score(tokenize("harbor")) == {}
+        assert index.total_length == 2
+
+        print("✅ World context test passed!")
+        return True
+
+    finally:
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_world_context())
+    sys.exit(0 if success else 1)
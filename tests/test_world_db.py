@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Test script for the optional SQLite metadata store
+
+This test enables the store for a small world and checks its indexed
+queries, its frontmatter, link, taxonomy and image tables, its
+reconciliation with external edits and deletions, its incremental updates
+under the server's world cache, and that the same queries give the same
+answers without the store.
+"""
+
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.utils import world_cache, world_db
+
+
+async def test_world_db():
+    """Test queries and reconciliation of the metadata store."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(base_dir, f"world-db-test-{int(time.time())}")
+
+    try:
+        with mock.patch.object(world_db, "WORLD_DB_ENABLED", True):
+            await handle_entry_tool(
+                "create_world_entry",
+                {
+                    "world_directory": str(world_path),
+                    "taxonomy": "Characters",
+                    "entry_name": "Mira Vale",
+                    "entry_content": "# Mira Vale\n\nA cartographer of the coast.",
+                },
+            )
+            await handle_entry_tool(
+                "create_world_entry",
+                {
+                    "world_directory": str(world_path),
+                    "taxonomy": "Characters",
+                    "entry_name": "Oren Dusk",
+                    "entry_content": "# Oren Dusk\n\nMira Vale taught him to draw maps.",
+                },
+            )
+            bare = world_path / "entries" / "characters" / "tam-reed.md"
+            bare.write_text("# Tam Reed\n\nA fisherman without a description.")
+
+            db_path = world_db.get_world_db_path(world_path)
+            assert db_path.exists()
+            connection = world_db._open(world_path).connection
+            (mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+            assert mode == "wal"
+
+            # 1. Indexed queries see tool writes and external files
+            entries = world_db.find_entries(world_path, taxonomy="characters")
+            assert [entry["slug"] for entry in entries] == [
+                "mira-vale",
+                "oren-dusk",
+                "tam-reed",
+            ]
+            missing = world_db.find_entries(world_path, missing_description=True)
+            assert [entry["slug"] for entry in missing] == ["tam-reed"]
+            named = world_db.find_entries(world_path, names=["Oren Dusk", "Nobody"])
+            assert [entry["file"] for entry in named] == [
+                "entries/characters/oren-dusk.md"
+            ]
+
+            # 2. Frontmatter, links, taxonomies and images are stored too
+            image = world_path / "images" / "characters" / "oren-dusk.png"
+            image.parent.mkdir(parents=True, exist_ok=True)
+            image.write_bytes(b"png")
+            world_db.find_entries(world_path)
+            assert connection.execute(
+                "SELECT file FROM frontmatter WHERE key = 'description'"
+            ).fetchall() == [
+                ("entries/characters/mira-vale.md",),
+                ("entries/characters/oren-dusk.md",),
+            ]
+            assert connection.execute(
+                "SELECT source, target, text FROM links"
+            ).fetchall() == [
+                (
+                    "entries/characters/oren-dusk.md",
+                    "entries/characters/mira-vale.md",
+                    "Mira Vale",
+                )
+            ]
+            assert connection.execute("SELECT slug FROM taxonomies").fetchall() == [
+                ("characters",)
+            ]
+            assert connection.execute("SELECT file, slug FROM images").fetchall() == [
+                ("images/characters/oren-dusk.png", "oren-dusk")
+            ]
+
+            # 3. External edits and deletions are picked up by the next query
+            bare.write_text(
+                "---\ndescription: A fisherman.\n---\n# Tam Reed\n\nA fisherman."
+            )
+            (world_path / "entries" / "characters" / "mira-vale.md").unlink()
+            assert world_db.find_entries(world_path, missing_description=True) == []
+            stored = world_db.find_entries(world_path)
+            assert [entry["slug"] for entry in stored] == ["oren-dusk", "tam-reed"]
+            assert stored[1]["description"] == "A fisherman."
+
+        # 4. Without the store the same answers come from the entry index
+        assert world_db.find_entries(world_path) == stored
+        assert world_db.find_entries(world_path, names=["Tam Reed"]) == stored[1:]
+
+        # 5. A deleted store is rebuilt on the next query
+        world_db.close_world_dbs()
+        db_path.unlink()
+        with mock.patch.object(world_db, "WORLD_DB_ENABLED", True):
+            assert world_db.find_entries(world_path) == stored
+
+            # 6. Under the world cache, queries read only the store and
+            # writes and watched edits update just their rows
+            world_cache.enable_world_cache(poll_interval=0.05, use_watchdog=False)
+            assert world_db.find_entries(world_path) == stored
+            with mock.patch.object(
+                world_db, "get_cached_entries", wraps=world_db.get_cached_entries
+            ) as full_sync:
+                await handle_entry_tool(
+                    "create_world_entry",
+                    {
+                        "world_directory": str(world_path),
+                        "taxonomy": "Characters",
+                        "entry_name": "Ada Flint",
+                        "entry_content": "# Ada Flint\n\nA lighthouse keeper.",
+                    },
+                )
+                assert [
+                    entry["slug"] for entry in world_db.find_entries(world_path)
+                ] == [
+                    "ada-flint",
+                    "oren-dusk",
+                    "tam-reed",
+                ]
+                bare.unlink()
+                time.sleep(0.3)
+                assert [
+                    entry["slug"] for entry in world_db.find_entries(world_path)
+                ] == [
+                    "ada-flint",
+                    "oren-dusk",
+                ]
+                assert full_sync.call_count == 0, "query reconciled the whole world"
+        world_db.close_world_dbs()
+
+        print("✅ World database test passed!")
+        return True
+
+    finally:
+        world_cache.disable_world_cache()
+        world_db.close_world_dbs()
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_world_db())
+    sys.exit(0 if success else 1)
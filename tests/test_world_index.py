@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent per-world entry index
+
+This test creates a small world through the tools, then checks that the
+index in metadata/index.json tracks tool writes, external edits and
+deletions without re-reading unchanged entries.
+"""
+
+import asyncio
+import shutil
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.tools.taxonomy import handle_taxonomy_tool
+from vibe_worldbuilding.tools.world import handle_world_tool
+from vibe_worldbuilding.utils import world_index
+
+
+async def _create_test_world(base_dir: Path, world_name: str) -> Path:
+    """Create a world with a Characters taxonomy and return its path."""
+    result = await handle_world_tool(
+        "instantiate_world",
+        {
+            "world_name": world_name,
+            "world_content": "# Index Test World\n\nA world for exercising the entry index.",
+            "base_directory": str(base_dir),
+        },
+    )
+    world_directory = None
+    for line in result[0].text.split("\n"):
+        if line.startswith("Full path:"):
+            world_directory = line.replace("Full path:", "").strip()
+            break
+    if not world_directory:
+        raise Exception("Could not determine world directory")
+
+    await handle_taxonomy_tool(
+        "create_taxonomy",
+        {
+            "world_directory": world_directory,
+            "taxonomy_name": "Characters",
+            "taxonomy_description": "Important figures",
+            "custom_guidelines": "## Entry Guidelines\n- Be vivid",
+        },
+    )
+    return Path(world_directory)
+
+
+async def test_world_index():
+    """Test that the index tracks tool writes and external changes."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(base_dir, f"index-test-{int(time.time())}")
+
+    try:
+        # 1. Entries written through the tools land in the index
+        await handle_entry_tool(
+            "create_world_entry",
+            {
+                "world_directory": str(world_path),
+                "taxonomy": "Characters",
+                "entry_name": "Mira Vale",
+                "entry_content": "# Mira Vale\n\nA cartographer of shifting coastlines.",
+            },
+        )
+        await handle_entry_tool(
+            "create_stub_entries",
+            {
+                "world_directory": str(world_path),
+                "stub_entries": [
+                    {
+                        "name": "Tomas Reed",
+                        "taxonomy": "Characters",
+                        "description": "Mira's rival surveyor.",
+                    }
+                ],
+            },
+        )
+
+        index_path = world_index.get_index_path(world_path)
+        assert index_path.exists(), "index.json was not written"
+
+        records = world_index.get_indexed_entries(world_path)
+        by_slug = {record["slug"]: record for record in records}
+        assert set(by_slug) == {"mira-vale", "tomas-reed"}
+        assert by_slug["mira-vale"]["title"] == "Mira Vale"
+        assert by_slug["mira-vale"]["frontmatter"]["article_type"] == "full"
+        assert by_slug["tomas-reed"]["frontmatter"]["article_type"] == "stub"
+
+        # 2. A refresh with nothing changed re-reads no entry files
+        with mock.patch.object(
+            world_index, "_build_entry_record", wraps=world_index._build_entry_record
+        ) as build_record:
+            world_index.load_world_index(world_path)
+            assert build_record.call_count == 0
+
+        # 3. An external edit is picked up, and only that file is re-read
+        stub_file = world_path / "entries" / "characters" / "tomas-reed.md"
+        stub_file.write_text(
+            "---\ndescription: Rewritten outside the tools\n---\n\n# Tomas Reed\n",
+            encoding="utf-8",
+        )
+        with mock.patch.object(
+            world_index, "_build_entry_record", wraps=world_index._build_entry_record
+        ) as build_record:
+            index = world_index.load_world_index(world_path)
+            assert build_record.call_count == 1
+        record = index["entries/characters/tomas-reed.md"]
+        assert record["frontmatter"]["description"] == "Rewritten outside the tools"
+
+        # 4. Deleted entries drop out of the index
+        stub_file.unlink()
+        slugs = [
+            record["slug"] for record in world_index.get_indexed_entries(world_path)
+        ]
+        assert slugs == ["mira-vale"]
+
+        print("✅ World index test passed!")
+        return True
+
+    finally:
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_world_index())
+    sys.exit(0 if success else 1)
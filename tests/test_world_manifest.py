@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for the world manifest read by the site pages
+
+This test writes a few entries, an entry image and a taxonomy through the
+tools, then checks that metadata/world.json lists the world title, the
+taxonomies and every entry with its stub flag, description, image and
+links, that an unchanged manifest is not rewritten, and that entries
+written through the tools afterwards appear in it without a rebuild.
+"""
+
+import asyncio
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from test_world_index import _create_test_world
+
+from vibe_worldbuilding.tools.entries import handle_entry_tool
+from vibe_worldbuilding.utils.link_manifest import update_link_manifest
+from vibe_worldbuilding.utils.world_manifest import (
+    get_world_manifest_path,
+    write_world_manifest,
+)
+
+
+async def test_world_manifest():
+    """Test the contents and rewrites of the world manifest."""
+
+    base_dir = Path(__file__).parent / "test-worlds"
+    base_dir.mkdir(exist_ok=True)
+    world_path = await _create_test_world(
+        base_dir, f"world-manifest-test-{int(time.time())}"
+    )
+
+    try:
+        await handle_entry_tool(
+            "create_stub_entries",
+            {
+                "world_directory": str(world_path),
+                "stub_entries": [
+                    {
+                        "name": "Tomas Reed",
+                        "taxonomy": "Characters",
+                        "description": "A surveyor.",
+                    }
+                ],
+            },
+        )
+        await handle_entry_tool(
+            "create_world_entry",
+            {
+                "world_directory": str(world_path),
+                "taxonomy": "Characters",
+                "entry_name": "Mira Vale",
+                "entry_content": "# Mira Vale\n\nMira Vale mapped the coast with Tomas Reed.",
+            },
+        )
+        image_dir = world_path / "images" / "characters"
+        image_dir.mkdir(parents=True, exist_ok=True)
+        (image_dir / "mira-vale.png").write_bytes(b"png")
+
+        write_world_manifest(world_path, update_link_manifest(world_path))
+        manifest_path = get_world_manifest_path(world_path)
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+        # 1. World title and taxonomies with their overview descriptions
+        assert manifest["title"] == "Index Test World"
+        assert [taxonomy["slug"] for taxonomy in manifest["taxonomies"]] == [
+            "characters"
+        ]
+        assert manifest["taxonomies"][0]["description"]
+
+        # 2. Every entry with its metadata, image and links
+        entries = {entry["slug"]: entry for entry in manifest["entries"]}
+        assert set(entries) == {"mira-vale", "tomas-reed"}
+        mira, tomas = entries["mira-vale"], entries["tomas-reed"]
+        assert mira["title"] == "Mira Vale" and not mira["stub"]
+        assert mira["image"] == "characters/mira-vale.png"
+        assert [link["slug"] for link in mira["links"]] == ["tomas-reed"]
+        assert tomas["stub"] and tomas["description"] == "A surveyor."
+        assert tomas["image"] is None
+        assert [backlink["slug"] for backlink in tomas["backlinks"]] == ["mira-vale"]
+
+        # 3. An unchanged manifest is not rewritten
+        mtime = manifest_path.stat().st_mtime_ns
+        write_world_manifest(world_path, update_link_manifest(world_path))
+        assert manifest_path.stat().st_mtime_ns == mtime
+
+        # 4. Entries written later are added to an existing manifest
+        await handle_entry_tool(
+            "create_world_entry",
+            {
+                "world_directory": str(world_path),
+                "taxonomy": "Characters",
+                "entry_name": "Oren Dusk",
+                "entry_content": "# Oren Dusk\n\nA student of Mira Vale.",
+            },
+        )
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        entries = {entry["slug"]: entry for entry in manifest["entries"]}
+        assert [link["slug"] for link in entries["oren-dusk"]["links"]] == ["mira-vale"]
+
+        print("✅ World manifest test passed!")
+        return True
+
+    finally:
+        if world_path.exists():
+            shutil.rmtree(world_path)
+
+
+if __name__ == "__main__":
+    success = asyncio.run(test_world_manifest())
+    sys.exit(0 if success else 1)
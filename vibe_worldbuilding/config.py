@@ -31,6 +31,62 @@ try:
 except ImportError:
     FAL_AVAILABLE = False
 
+try:
+    from PIL import Image
+
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import numpy
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# FAL HTTP client (one pooled keep-alive session shared by all image calls)
+FAL_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("FAL_CONNECT_TIMEOUT", "10"))
+FAL_GENERATION_TIMEOUT_SECONDS = float(os.environ.get("FAL_GENERATION_TIMEOUT", "300"))
+FAL_DOWNLOAD_TIMEOUT_SECONDS = float(os.environ.get("FAL_DOWNLOAD_TIMEOUT", "120"))
+FAL_HTTP_POOL_SIZE = 8
+IMAGE_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+FAL_MAX_IMAGE_BYTES = 50 * 1024 * 1024  # Downloads larger than this are refused
+IMAGE_GENERATION_CONCURRENCY = int(os.environ.get("FAL_MAX_CONCURRENCY", "4"))
+FAL_REQUESTS_PER_MINUTE = float(os.environ.get("FAL_REQUESTS_PER_MINUTE", "30"))
+FAL_MAX_RETRIES = int(os.environ.get("FAL_MAX_RETRIES", "3"))
+FAL_RETRY_BASE_DELAY_SECONDS = 1.0  # Doubles per retry, with full jitter
+FAL_RETRY_MAX_DELAY_SECONDS = 60.0
+FAL_RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}  # Image downloads
+# A generation may already have run (and been billed) when the POST fails, so
+# it is only retried when the API refused it outright
+FAL_GENERATION_RETRY_STATUS_CODES = {429, 503}
+FAL_CIRCUIT_BREAKER_THRESHOLD = 5  # Consecutive upstream failures before failing fast
+FAL_CIRCUIT_BREAKER_COOLDOWN_SECONDS = 60.0
+
+# Content-addressed cache of generated images, shared by all worlds
+IMAGE_CACHE_DIR = Path(
+    os.environ.get(
+        "VIBE_IMAGE_CACHE_DIR", Path.home() / ".cache" / "vibe-worldbuilding" / "images"
+    )
+)
+IMAGE_CACHE_MAX_BYTES = (
+    int(os.environ.get("VIBE_IMAGE_CACHE_MAX_MB", "2048")) * 1024 * 1024
+)  # 0 disables the cache
+
+# Batch image generation (progress stored under metadata/)
+IMAGE_BATCH_PROGRESS_FILENAME = "image_batch.json"
+
+# Resized image renditions (files under images/, manifest under metadata/)
+IMAGE_MANIFEST_FILENAME = "images.json"
+IMAGE_MANIFEST_VERSION = 1
+IMAGE_RENDITIONS_DIRECTORY = "_renditions"
+IMAGE_RENDITIONS = {"thumb": 400, "medium": 1200}  # Longest side in pixels
+IMAGE_RENDITION_EXTENSION = ".webp"
+IMAGE_RENDITION_QUALITY = 80
+IMAGE_RENDITION_WORKERS = min(4, os.cpu_count() or 1)
+IMAGE_SOURCE_EXTENSIONS = [".png", ".jpg", ".jpeg", ".webp"]
+
 # Default values
 DEFAULT_IMAGE_STYLE = "fantasy illustration"
 DEFAULT_IMAGE_ASPECT_RATIO = "1:1"
@@ -41,9 +97,87 @@ DEFAULT_UNIQUE_SUFFIX = "timestamp"
 MARKDOWN_EXTENSION = ".md"
 IMAGE_EXTENSION = ".png"
 
+# Header-only reads of entry files (sizes in characters)
+FRONTMATTER_MAX_CHARS = 16384  # Give up on an unterminated frontmatter block
+ENTRY_TITLE_SEARCH_CHARS = 2048  # Body read after the frontmatter to find the title
+
 # Directory structure
 WORLD_DIRECTORIES = ["overview", "taxonomies", "entries", "images", "notes", "metadata"]
 CONTENT_SYMLINK_DIRS = ["overview", "taxonomies", "entries"]
+METADATA_DIRECTORY = "metadata"
+METADATA_SYMLINK_PATH = "src/metadata"  # Where Astro pages read world metadata
+
+# World entry index (stored under metadata/)
+WORLD_INDEX_FILENAME = "index.json"
+WORLD_INDEX_VERSION = 1
+
+# Optional SQLite store of world metadata (stored under metadata/)
+WORLD_DB_ENABLED = os.environ.get("VIBE_WORLD_DB", "").lower() in ("1", "true", "yes")
+WORLD_DB_FILENAME = "world.db"
+WORLD_DB_VERSION = 3
+
+# Known-entity matcher (stored under metadata/)
+ENTITY_MATCHER_FILENAME = "entity_matcher.json"
+ENTITY_MATCHER_VERSION = 1
+MIN_ENTITY_NAME_LENGTH = 3
+
+# Cross-link manifest (stored under metadata/)
+LINK_MANIFEST_FILENAME = "links.json"
+LINK_MANIFEST_VERSION = 2
+
+# World manifest read by every page of the static site (stored under metadata/)
+WORLD_MANIFEST_FILENAME = "world.json"
+WORLD_MANIFEST_VERSION = 1
+
+# Incremental site builds (manifest stored under metadata/)
+BUILD_MANIFEST_FILENAME = "build.json"
+BUILD_MANIFEST_VERSION = 2
+BUILD_PAGES_ENV_VAR = "VIBE_BUILD_PAGES"  # Route list handed to the Astro pages
+SITE_TEMPLATE_PATHS = ["src", "public", "astro.config.mjs", "package.json"]
+
+# In-process world cache (used by the long-lived MCP server)
+WORLD_CACHE_MAX_WORLDS = 8
+WORLD_CACHE_POLL_INTERVAL_SECONDS = 2.0
+
+# Relevance ranking of entries (BM25)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Entry similarity for consistency analysis (hashed TF-IDF vectors)
+SIMILARITY_FEATURES = 4096
+SIMILARITY_BLOCK_ROWS = 512  # Rows of the similarity matrix computed at once
+DUPLICATE_SIMILARITY_THRESHOLD = 0.8
+RELATED_SIMILARITY_THRESHOLD = 0.3
+SIMILARITY_MAX_PAIRS = 100
+
+# Stub creation (stubs of one call are written by a thread pool)
+STUB_WRITE_WORKERS = 8
+NAME_MATCH_THRESHOLD = 0.75  # Trigram similarity reported as a possible duplicate
+
+# Description generation (entries without a description, one page per call)
+DESCRIPTION_PAGE_SIZE = 25
+DESCRIPTION_PAGE_TOKEN_BUDGET = 8000  # Approximate preview tokens per page
+DESCRIPTION_PREVIEW_CHARS = 500
+
+# Bulk frontmatter updates (applied by a thread pool with a bounded queue)
+FRONTMATTER_WRITE_WORKERS = 8
+FRONTMATTER_WRITE_QUEUE = 64  # Most updates submitted to the pool at once
+
+# Chunked consistency sweeps (review state stored under metadata/)
+CONSISTENCY_SWEEP_FILENAME = "consistency_sweep.json"
+CONSISTENCY_SWEEP_VERSION = 1
+CONSISTENCY_SWEEP_TOKEN_BUDGET = 12000  # Approximate entry tokens per chunk
+
+# Full-text search index (one shard per taxonomy under metadata/search/)
+SEARCH_INDEX_DIRECTORY = "search"
+SEARCH_INDEX_VERSION = 1
+SEARCH_TITLE_WEIGHT = 3  # Title terms count this many times
+SEARCH_DEFAULT_LIMIT = 10
+SEARCH_SNIPPET_CHARS = 200
+
+# Entry context for create_world_entry (tokens estimated from characters)
+WORLD_CONTEXT_TOKEN_BUDGET = int(os.environ.get("VIBE_CONTEXT_TOKEN_BUDGET", "2000"))
+CHARS_PER_TOKEN = 4
 
 # Taxonomy naming patterns
 TAXONOMY_OVERVIEW_SUFFIX = "-overview"
@@ -8,12 +8,14 @@ Public API:
     - create_stub_entries: Stub creation from LLM analysis
     - generate_entry_descriptions: LLM-driven batch description generation
     - add_entry_frontmatter: Apply LLM-generated descriptions to entry files
+    - search_world: Ranked full-text search over world content
 """
 
 from .content_processing import add_entry_frontmatter, generate_entry_descriptions
 
 # Import public API functions
 from .creation import create_world_entry
+from .search import search_world
 from .stub_generation import create_stub_entries
 
 # Re-export for backward compatibility with existing tools/entries.py interface
@@ -22,4 +24,5 @@ __all__ = [
     "create_stub_entries",
     "generate_entry_descriptions",
     "add_entry_frontmatter",
+    "search_world",
 ]
@@ -7,11 +7,14 @@ principle by outsourcing the actual consistency analysis to the client LLM.
 
 import random
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 import mcp.types as types
 
-from ..config import MARKDOWN_EXTENSION
+from ..config import CONSISTENCY_SWEEP_TOKEN_BUDGET
+from ..utils.consistency_sweep import plan_sweep
+from ..utils.similarity import find_consistency_candidates
+from ..utils.world_cache import get_cached_entries
 
 
 async def analyze_world_consistency(
@@ -27,6 +30,9 @@ async def analyze_world_consistency(
         arguments: Tool arguments containing:
             - world_directory: Path to the world directory
             - entry_count: Number of entries to analyze (default: 15)
+            - mode: "sample" to analyze a selection of entries (default), or
+              "sweep" to review the whole world chunk by chunk
+            - token_budget: Approximate entry tokens per sweep chunk
 
     Returns:
         List containing analysis prompt for the client LLM with entry content
@@ -37,12 +43,34 @@ async def analyze_world_consistency(
 
     world_directory = arguments.get("world_directory", "")
     entry_count = arguments.get("entry_count", 15)
+    mode = arguments.get("mode", "sample")
+    try:
+        token_budget = int(
+            arguments.get("token_budget", CONSISTENCY_SWEEP_TOKEN_BUDGET)
+        )
+    except (TypeError, ValueError):
+        token_budget = 0
 
     if not world_directory:
         return [
             types.TextContent(type="text", text="Error: world_directory is required")
         ]
 
+    if token_budget < 1:
+        return [
+            types.TextContent(
+                type="text", text="Error: token_budget must be a positive integer"
+            )
+        ]
+
+    if mode not in ("sample", "sweep"):
+        return [
+            types.TextContent(
+                type="text",
+                text=f"Error: mode must be 'sample' or 'sweep', not '{mode}'",
+            )
+        ]
+
     try:
         world_path = Path(world_directory)
         if not world_path.exists():
@@ -57,26 +85,45 @@ async def analyze_world_consistency(
         if not entries_path.exists():
             return [types.TextContent(type="text", text="No entries directory found")]
 
-        # Collect all available entries
-        all_entries = []
-        for taxonomy_dir in entries_path.iterdir():
-            if taxonomy_dir.is_dir():
-                for entry_file in taxonomy_dir.glob(f"*{MARKDOWN_EXTENSION}"):
-                    all_entries.append(
-                        {
-                            "taxonomy": taxonomy_dir.name,
-                            "file": entry_file,
-                            "name": entry_file.stem.replace("-", " ").title(),
-                        }
-                    )
+        # Collect all available entries from the world index
+        all_entries = [
+            {
+                "taxonomy": record["taxonomy"],
+                "file": world_path / record["file"],
+                "name": record["name"],
+            }
+            for record in get_cached_entries(world_path)
+        ]
 
         if not all_entries:
             return [types.TextContent(type="text", text="No entries found to analyze")]
 
-        # Select random entries for analysis
-        selected_entries = random.sample(
-            all_entries, min(entry_count, len(all_entries))
-        )
+        findings = []
+        if mode == "sweep":
+            # Hand out the next unreviewed or changed chunk of the world
+            sweep = plan_sweep(world_path, token_budget)
+            if not sweep["chunk"]:
+                return [
+                    types.TextContent(
+                        type="text",
+                        text=f"Consistency sweep complete: all {sweep['total']} "
+                        "chunks are reviewed and unchanged since their review.",
+                    )
+                ]
+            selected_entries = [
+                {
+                    "taxonomy": record["taxonomy"],
+                    "file": world_path / record["file"],
+                    "name": record["name"],
+                }
+                for record in sweep["chunk"]
+            ]
+        else:
+            # Select flagged entries first, filling up with random ones
+            candidates = find_consistency_candidates(world_path)
+            selected_entries, findings = _select_entries(
+                world_path, all_entries, candidates, entry_count
+            )
 
         # Load entry content
         entries_content = []
@@ -103,7 +150,15 @@ async def analyze_world_consistency(
             ]
 
         # Create analysis prompt
-        prompt = _create_consistency_analysis_prompt(entries_content)
+        prompt = _create_consistency_analysis_prompt(entries_content, findings)
+        if mode == "sweep":
+            prompt += (
+                f"\n\n## Sweep Progress\n\nThis is chunk {sweep['number']} of "
+                f"{sweep['total']} ({sweep['pending']} still to review, including "
+                "this one). When you have applied your changes, call "
+                "analyze_world_consistency with mode 'sweep' again to mark this "
+                "chunk as reviewed and get the next one."
+            )
 
         return [types.TextContent(type="text", text=prompt)]
 
@@ -115,14 +170,86 @@ async def analyze_world_consistency(
         ]
 
 
-def _create_consistency_analysis_prompt(entries: List[Dict]) -> str:
+def _select_entries(
+    world_path: Path,
+    all_entries: List[Dict],
+    candidates: Optional[Dict[str, List[Any]]],
+    entry_count: int,
+) -> Tuple[List[Dict], List[str]]:
+    """Choose the entries to analyze and describe why they were flagged.
+
+    Likely duplicates come first, then related entries that do not link to
+    each other, then orphaned entries. Any room left is filled at random, and
+    without similarity analysis the whole selection is random.
+    """
+    entries_by_file = {
+        str(entry["file"].relative_to(world_path)): entry for entry in all_entries
+    }
+
+    flagged = []
+    if candidates:
+        for first, second, similarity in candidates["duplicates"]:
+            flagged.append(
+                (
+                    [first, second],
+                    f"- Possible duplicates: **{entries_by_file[first]['name']}** and "
+                    f"**{entries_by_file[second]['name']}** ({similarity:.0%} similar)",
+                )
+            )
+        for first, second, similarity in candidates["unlinked"]:
+            flagged.append(
+                (
+                    [first, second],
+                    f"- Related but not cross-referenced: "
+                    f"**{entries_by_file[first]['name']}** and "
+                    f"**{entries_by_file[second]['name']}** ({similarity:.0%} similar)",
+                )
+            )
+        for file in candidates["orphans"]:
+            flagged.append(
+                (
+                    [file],
+                    f"- Orphaned: **{entries_by_file[file]['name']}** neither links "
+                    "to nor is linked from any other entry",
+                )
+            )
+
+    selected: Dict[str, Dict] = {}
+    findings = []
+    for files, finding in flagged:
+        new_files = [file for file in files if file not in selected]
+        if len(selected) + len(new_files) > entry_count:
+            continue
+        for file in new_files:
+            selected[file] = entries_by_file[file]
+        findings.append(finding)
+
+    remaining = [
+        entry for file, entry in entries_by_file.items() if file not in selected
+    ]
+    fill = random.sample(
+        remaining, max(0, min(entry_count - len(selected), len(remaining)))
+    )
+    return list(selected.values()) + fill, findings
+
+
+def _create_consistency_analysis_prompt(
+    entries: List[Dict], findings: Optional[List[str]] = None
+) -> str:
     """Create a comprehensive prompt for LLM consistency analysis."""
     prompt = f"""# World Consistency Analysis
 
 ## Task
 Analyze the following {len(entries)} world entries for consistency issues and opportunities to improve connections between entries.
 
-## Entries to Analyze
+"""
+
+    if findings:
+        prompt += "## Flagged by Similarity Analysis\n\n"
+        prompt += "\n".join(findings)
+        prompt += "\n\nCheck these first: merge or differentiate duplicates, add cross-references between related entries, and connect orphaned entries to the rest of the world.\n\n"
+
+    prompt += """## Entries to Analyze
 
 """
 
@@ -5,17 +5,28 @@ frontmatter management, and content analysis. It focuses on LLM-driven content
 enhancement following the system's design principles.
 """
 
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict, List
 
 import mcp.types as types
 
-from ..config import MARKDOWN_EXTENSION
-from ..utils.content_parsing import (
-    add_frontmatter_to_content,
-    extract_description_from_content,
-    extract_frontmatter,
+from ..config import (
+    DESCRIPTION_PAGE_SIZE,
+    DESCRIPTION_PAGE_TOKEN_BUDGET,
+    DESCRIPTION_PREVIEW_CHARS,
+    FRONTMATTER_WRITE_QUEUE,
+    FRONTMATTER_WRITE_WORKERS,
 )
+from ..utils.content_parsing import read_frontmatter
+from ..utils.file_ops import update_file_frontmatter
+from ..utils.world_cache import record_entry_writes
+from ..utils.world_db import find_entries
+from ..utils.world_manifest import update_world_manifest
+from .utilities import estimate_tokens
 
 
 async def generate_entry_descriptions(
@@ -25,9 +36,15 @@ async def generate_entry_descriptions(
 
     This tool presents entries without descriptions to the client LLM
     for intelligent description generation, following the LLM-first design principle.
+    Entries are handed out one page at a time in file order; each page ends
+    with a cursor that the next call resumes from.
 
     Args:
-        arguments: Tool arguments containing world_directory
+        arguments: Tool arguments containing:
+            - world_directory: Path to the world directory
+            - page_size: Maximum number of entries per page
+            - token_budget: Approximate preview tokens per page
+            - cursor: Cursor returned by the previous page, if continuing
 
     Returns:
         List containing analysis prompt for the client LLM
@@ -36,12 +53,26 @@ async def generate_entry_descriptions(
         return [types.TextContent(type="text", text="Error: No arguments provided")]
 
     world_directory = arguments.get("world_directory", "")
+    try:
+        page_size = int(arguments.get("page_size", DESCRIPTION_PAGE_SIZE))
+        token_budget = int(arguments.get("token_budget", DESCRIPTION_PAGE_TOKEN_BUDGET))
+    except (TypeError, ValueError):
+        page_size = token_budget = 0
+    cursor = arguments.get("cursor", "")
 
     if not world_directory:
         return [
             types.TextContent(type="text", text="Error: world_directory is required")
         ]
 
+    if page_size < 1 or token_budget < 1:
+        return [
+            types.TextContent(
+                type="text",
+                text="Error: page_size and token_budget must be positive integers",
+            )
+        ]
+
     try:
         world_path = Path(world_directory)
         if not world_path.exists():
@@ -58,37 +89,42 @@ async def generate_entry_descriptions(
 
         entries_needing_descriptions = []
 
-        # Find entries without descriptions
-        for taxonomy_dir in entries_path.iterdir():
-            if taxonomy_dir.is_dir():
-                for entry_file in taxonomy_dir.glob(f"*{MARKDOWN_EXTENSION}"):
-                    try:
-                        with open(entry_file, "r", encoding="utf-8") as f:
-                            content = f.read()
-
-                        # Check if already has frontmatter with description
-                        existing_frontmatter, main_content = extract_frontmatter(
-                            content
-                        )
-                        if "description" not in existing_frontmatter:
-                            entry_name = entry_file.stem.replace("-", " ").title()
-                            taxonomy_name = taxonomy_dir.name.replace("-", " ").title()
-
-                            entries_needing_descriptions.append(
-                                {
-                                    "name": entry_name,
-                                    "taxonomy": taxonomy_name,
-                                    "content": main_content[:500]
-                                    + ("..." if len(main_content) > 500 else ""),
-                                    "file_path": str(
-                                        entry_file.relative_to(world_path)
-                                    ),
-                                }
-                            )
-                    except Exception:
-                        continue
-
-        if not entries_needing_descriptions:
+        # Find the next page of entries without descriptions from the
+        # metadata store, one extra to learn whether more remain
+        records = find_entries(
+            world_path, missing_description=True, after=cursor, limit=page_size + 1
+        )
+        has_more = len(records) > page_size
+        next_cursor = cursor
+        used_tokens = 0
+
+        # Read only the start of each entry, until the page is full
+        for record in records[:page_size]:
+            try:
+                _, main_content = read_frontmatter(
+                    world_path / record["file"], DESCRIPTION_PREVIEW_CHARS + 1
+                )
+            except Exception:
+                next_cursor = record["file"]
+                continue
+
+            entry = {
+                "name": record["name"],
+                "taxonomy": record["taxonomy"].replace("-", " ").title(),
+                "content": main_content[:DESCRIPTION_PREVIEW_CHARS]
+                + ("..." if len(main_content) > DESCRIPTION_PREVIEW_CHARS else ""),
+                "file_path": record["file"],
+            }
+            tokens = estimate_tokens(entry["name"] + entry["content"])
+            if entries_needing_descriptions and used_tokens + tokens > token_budget:
+                has_more = True
+                break
+
+            entries_needing_descriptions.append(entry)
+            used_tokens += tokens
+            next_cursor = record["file"]
+
+        if not entries_needing_descriptions and not has_more:
             return [
                 types.TextContent(
                     type="text",
@@ -98,6 +134,14 @@ async def generate_entry_descriptions(
 
         # Create analysis prompt for LLM
         prompt = _create_description_generation_prompt(entries_needing_descriptions)
+        if has_more:
+            prompt += (
+                f"\n\n## More Entries\n"
+                f"This page covers {len(entries_needing_descriptions)} entries. "
+                "After applying these descriptions with add_entry_frontmatter, call "
+                f'generate_entry_descriptions again with cursor "{next_cursor}" '
+                "to continue."
+            )
         return [types.TextContent(type="text", text=prompt)]
 
     except Exception as e:
@@ -155,60 +199,55 @@ async def add_entry_frontmatter(
         if not entries_path.exists():
             return [types.TextContent(type="text", text="No entries directory found")]
 
-        updated_count = 0
-        not_found_count = 0
-        error_count = 0
+        started = time.monotonic()
 
-        # Create a mapping of entry names to find files
-        entry_file_map = {}
-        for taxonomy_dir in entries_path.iterdir():
-            if taxonomy_dir.is_dir():
-                for entry_file in taxonomy_dir.glob(f"*{MARKDOWN_EXTENSION}"):
-                    entry_name = entry_file.stem.replace("-", " ").title()
-                    entry_file_map[entry_name] = entry_file
+        # Resolve every requested name against one snapshot of the world
+        entry_file_map = {
+            record["name"]: world_path / record["file"]
+            for record in find_entries(
+                world_path,
+                names={desc_entry.get("name", "") for desc_entry in entry_descriptions},
+            )
+        }
 
-        # Apply descriptions
-        for desc_entry in entry_descriptions:
+        # The last description given for an entry wins, so no file is
+        # updated twice (or by two threads at once)
+        statuses = []
+        updates: Dict[Path, int] = {}
+        for position, desc_entry in enumerate(entry_descriptions):
             entry_name = desc_entry.get("name", "")
-            description = desc_entry.get("description", "")
-
-            if not entry_name or not description:
-                error_count += 1
-                continue
-
-            if entry_name not in entry_file_map:
-                not_found_count += 1
-                continue
-
-            try:
+            if not entry_name or not desc_entry.get("description", ""):
+                statuses.append("error: name and description are required")
+            elif entry_name not in entry_file_map:
+                statuses.append("not found")
+            else:
                 entry_file = entry_file_map[entry_name]
-
-                # Read existing content
-                with open(entry_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Add frontmatter with description
-                updated_content = add_frontmatter_to_content(
-                    content, {"description": description}
-                )
-
-                # Write updated content
-                with open(entry_file, "w", encoding="utf-8") as f:
-                    f.write(updated_content)
-
-                updated_count += 1
-
-            except Exception as e:
-                error_count += 1
-
-        # Create summary
-        summary = f"Applied descriptions to entries:\n"
-        summary += f"- Updated: {updated_count} entries\n"
-        if not_found_count > 0:
-            summary += f"- Not found: {not_found_count} entries\n"
-        if error_count > 0:
-            summary += f"- Errors: {error_count} entries\n"
-
+                if entry_file in updates:
+                    statuses[updates[entry_file]] = "superseded by a later description"
+                updates[entry_file] = position
+                statuses.append("pending")
+
+        # Patch the descriptions in parallel, skipping entries that already
+        # have them
+        results = _apply_frontmatter_updates(
+            {
+                entry_file: {"description": entry_descriptions[position]["description"]}
+                for entry_file, position in updates.items()
+            }
+        )
+        updated_files = []
+        for entry_file, position in updates.items():
+            statuses[position] = results[entry_file]
+            if results[entry_file] == "updated":
+                updated_files.append(entry_file)
+
+        if updated_files:
+            record_entry_writes(world_path, updated_files)
+            update_world_manifest(world_path)
+
+        summary = _create_frontmatter_summary(
+            entry_descriptions, statuses, time.monotonic() - started
+        )
         return [types.TextContent(type="text", text=summary)]
 
     except Exception as e:
@@ -219,6 +258,82 @@ async def add_entry_frontmatter(
         ]
 
 
+def _apply_frontmatter_updates(
+    updates: Dict[Path, Dict[str, str]],
+) -> Dict[Path, str]:
+    """Patch the frontmatter of many files with a bounded thread pool.
+
+    At most ``FRONTMATTER_WRITE_QUEUE`` updates are queued at a time, so a
+    large backfill does not hold every pending update in the pool at once.
+
+    Args:
+        updates: Frontmatter keys to set, by file
+
+    Returns:
+        Status of each file: "updated", "already up to date" or "error: ..."
+    """
+    results: Dict[Path, str] = {}
+    if not updates:
+        return results
+    pending = iter(updates.items())
+    in_flight: Dict[Future, Path] = {}
+
+    with ThreadPoolExecutor(
+        max_workers=min(FRONTMATTER_WRITE_WORKERS, len(updates))
+    ) as executor:
+        while True:
+            for entry_file, values in islice(
+                pending, FRONTMATTER_WRITE_QUEUE - len(in_flight)
+            ):
+                future = executor.submit(update_file_frontmatter, entry_file, values)
+                in_flight[future] = entry_file
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                entry_file = in_flight.pop(future)
+                try:
+                    changed = future.result()
+                except Exception as e:
+                    results[entry_file] = f"error: {e}"
+                else:
+                    results[entry_file] = "updated" if changed else "already up to date"
+
+    return results
+
+
+def _create_frontmatter_summary(
+    entry_descriptions: List[Dict[str, str]], statuses: List[str], elapsed: float
+) -> str:
+    """Summarize a bulk description update, listing entries not updated."""
+    counts = Counter(
+        "error" if status.startswith("error") else status for status in statuses
+    )
+    lines = [
+        f"Applied descriptions to entries in {elapsed:.2f}s:",
+        f"- Updated: {counts['updated']} entries",
+    ]
+    for status, label in [
+        ("already up to date", "Already up to date"),
+        ("superseded by a later description", "Superseded"),
+        ("not found", "Not found"),
+        ("error", "Errors"),
+    ]:
+        if counts[status]:
+            lines.append(f"- {label}: {counts[status]} entries")
+
+    details = [
+        f"- {desc_entry.get('name', '') or '(no name)'}: {status}"
+        for desc_entry, status in zip(entry_descriptions, statuses)
+        if status != "updated"
+    ]
+    if details:
+        lines.append("\nEntries not updated:")
+        lines.extend(details)
+    return "\n".join(lines) + "\n"
+
+
 def _create_description_generation_prompt(entries: List[Dict[str, str]]) -> str:
     """Create a prompt for the client LLM to generate entry descriptions."""
     prompt = """# Entry Description Generation
@@ -23,13 +23,18 @@ from ..utils.content_parsing import (
     extract_description_from_content,
     extract_frontmatter,
 )
+from ..utils.file_ops import write_file_atomically
+from ..utils.link_manifest import update_link_manifest
+from ..utils.search_index import update_search_index
+from ..utils.world_cache import read_world_file, record_entry_writes
+from ..utils.world_manifest import update_world_manifest
 from .stub_generation import generate_stub_analysis
 from .utilities import (
     clean_name,
     create_world_context_prompt,
     extract_taxonomy_context,
-    get_existing_entries_with_descriptions,
     get_existing_taxonomies,
+    get_ranked_entries_with_descriptions,
 )
 
 if FAL_AVAILABLE:
@@ -110,7 +115,16 @@ async def create_world_entry(
 
         # Get world context for generating well-connected entries
         existing_taxonomies = get_existing_taxonomies(world_path)
-        existing_entries = get_existing_entries_with_descriptions(world_path)
+        entry_file_path = f"entries/{clean_taxonomy}/{clean_entry}{MARKDOWN_EXTENSION}"
+        existing_entries = [
+            entry
+            for entry in get_ranked_entries_with_descriptions(
+                world_path,
+                f"{entry_name} {taxonomy} {entry_content[:1000]}",
+                clean_taxonomy,
+            )
+            if Path(entry["file"]).as_posix() != entry_file_path
+        ]
 
         # Get world overview if available
         world_overview = _get_world_overview(world_path)
@@ -182,16 +196,17 @@ async def create_world_entry(
 
 def _get_world_overview(world_path: Path) -> str:
     """Get world overview content for context."""
-    world_overview = ""
-    overview_path = world_path / "overview" / "world-overview.md"
-    if overview_path.exists():
-        try:
-            with open(overview_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                world_overview = content[:500] + ("..." if len(content) > 500 else "")
-        except Exception:
-            pass
-    return world_overview
+    return (
+        read_world_file(
+            world_path, "overview/world-overview.md", _summarize_world_overview
+        )
+        or ""
+    )
+
+
+def _summarize_world_overview(content: str) -> str:
+    """Trim the world overview to the excerpt used in entry context."""
+    return content[:500] + ("..." if len(content) > 500 else "")
 
 
 def _create_entry_file(
@@ -223,8 +238,12 @@ def _create_entry_file(
     # Add taxonomy footer
     final_content += f"\n\n---\n*Entry in {taxonomy.title()} taxonomy*\n"
 
-    with open(entry_file, "w", encoding="utf-8") as f:
-        f.write(final_content)
+    write_file_atomically(entry_file, final_content)
+
+    record_entry_writes(world_path, [entry_file])
+    link_manifest = update_link_manifest(world_path, [entry_file])
+    update_search_index(world_path, [entry_file])
+    update_world_manifest(world_path, link_manifest)
 
     return entry_file
 
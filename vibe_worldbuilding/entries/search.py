@@ -0,0 +1,93 @@
+"""Full-text search module for the Vibe Worldbuilding MCP.
+
+This module answers free-text queries over a world's entries and taxonomy
+overviews from the BM25 search index kept under ``metadata/search/``.
+"""
+
+from pathlib import Path
+from typing import Any
+
+import mcp.types as types
+
+from ..config import SEARCH_DEFAULT_LIMIT
+from ..utils.search_index import search_world_index
+from .utilities import clean_name
+
+
+async def search_world(
+    arguments: dict[str, Any] | None,
+) -> list[types.TextContent]:
+    """Search a world's content for a query.
+
+    Args:
+        arguments: Tool arguments containing:
+            - world_directory: Path to the world directory
+            - query: Words to search for
+            - taxonomy: Only search entries of this taxonomy (optional)
+            - limit: Maximum number of results (default: 10)
+
+    Returns:
+        List containing the ranked results with their snippets
+    """
+    if not arguments:
+        return [types.TextContent(type="text", text="Error: No arguments provided")]
+
+    world_directory = arguments.get("world_directory", "")
+    query = arguments.get("query", "")
+    taxonomy = arguments.get("taxonomy", "")
+    try:
+        limit = int(arguments.get("limit", SEARCH_DEFAULT_LIMIT))
+    except (TypeError, ValueError):
+        limit = 0
+
+    if not world_directory or not query:
+        return [
+            types.TextContent(
+                type="text", text="Error: world_directory and query are required"
+            )
+        ]
+
+    if limit < 1:
+        return [
+            types.TextContent(
+                type="text", text="Error: limit must be a positive integer"
+            )
+        ]
+
+    try:
+        world_path = Path(world_directory)
+        if not world_path.exists():
+            return [
+                types.TextContent(
+                    type="text",
+                    text=f"Error: World directory {world_directory} does not exist",
+                )
+            ]
+
+        results, total = search_world_index(
+            world_path, query, clean_name(taxonomy) if taxonomy else "", limit
+        )
+
+        scope = f" in {taxonomy}" if taxonomy else ""
+        if not results:
+            return [
+                types.TextContent(type="text", text=f"No matches for '{query}'{scope}")
+            ]
+
+        lines = [f"# Search results for '{query}'{scope}", ""]
+        lines.append(f"Showing {len(results)} of {total} matching files.")
+        for number, result in enumerate(results, 1):
+            kind = "taxonomy overview" if result["kind"] == "taxonomy" else "entry"
+            lines.append("")
+            lines.append(
+                f"{number}. **{result['title']}** ({result['taxonomy']} {kind}) "
+                f"- score {result['score']:.2f}"
+            )
+            lines.append(f"   File: {result['file']}")
+            if result["snippet"]:
+                lines.append(f"   > {result['snippet']}")
+
+        return [types.TextContent(type="text", text="\n".join(lines))]
+
+    except Exception as e:
+        return [types.TextContent(type="text", text=f"Error searching world: {str(e)}")]
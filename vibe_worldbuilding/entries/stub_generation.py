@@ -5,19 +5,27 @@ It identifies entities mentioned in content that deserve their own entries
 and creates minimal stub entries for future development.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import mcp.types as types
 
-from ..config import MARKDOWN_EXTENSION
-from ..utils.content_parsing import add_frontmatter_to_content
+from ..config import MARKDOWN_EXTENSION, STUB_WRITE_WORKERS, TAXONOMY_OVERVIEW_SUFFIX
+from ..utils.content_parsing import format_frontmatter
+from ..utils.entity_matcher import find_entity_mentions
+from ..utils.file_ops import create_file_atomically
+from ..utils.link_manifest import update_link_manifest
+from ..utils.name_index import NameIndex, get_name_index
+from ..utils.search_index import update_search_index
+from ..utils.world_cache import record_entry_writes
+from ..utils.world_manifest import update_world_manifest
 from .utilities import (
     clean_name,
     create_basic_taxonomy,
     get_existing_entries_with_descriptions,
     get_existing_taxonomies,
-    taxonomy_exists,
 )
 
 # identify_stub_candidates function REMOVED
@@ -63,18 +71,21 @@ async def create_stub_entries(
                 )
             ]
 
-        created_stubs = []
-        created_taxonomies = []
+        created_stubs, created_taxonomies, duplicates = _create_stubs(
+            world_path, stub_entries
+        )
 
-        for stub in stub_entries:
-            stub_result = _process_single_stub(world_path, stub)
-            if stub_result["created_stub"]:
-                created_stubs.append(stub_result["stub_info"])
-            if stub_result["created_taxonomy"]:
-                created_taxonomies.append(stub_result["taxonomy_name"])
+        if created_stubs:
+            stub_files = [world_path / stub["file"] for stub in created_stubs]
+            record_entry_writes(world_path, stub_files)
+            link_manifest = update_link_manifest(world_path, stub_files)
+            update_search_index(world_path, stub_files)
+            update_world_manifest(world_path, link_manifest)
 
         # Generate summary response
-        return _create_stub_summary_response(created_stubs, created_taxonomies)
+        return _create_stub_summary_response(
+            created_stubs, created_taxonomies, duplicates
+        )
 
     except Exception as e:
         return [
@@ -92,6 +103,16 @@ def generate_stub_analysis(
         existing_taxonomies = get_existing_taxonomies(world_path)
         existing_entries = get_existing_entries_with_descriptions(world_path)
 
+        # Existing entries this content already mentions never need stubs
+        entry_file = f"entries/{clean_name(taxonomy)}/{clean_name(entry_name)}{MARKDOWN_EXTENSION}"
+        mentioned_entries = []
+        for mention in find_entity_mentions(
+            world_path, entry_content, exclude_file=entry_file
+        ):
+            for entry in mention["entries"]:
+                if entry["title"] not in mentioned_entries:
+                    mentioned_entries.append(entry["title"])
+
         # Create a concise analysis prompt
         analysis_info = f"""
 
@@ -102,6 +123,7 @@ The system has analyzed "{entry_name}" and can identify entities that might dese
 **Available for Reference:**
 - Taxonomies: {', '.join(existing_taxonomies) if existing_taxonomies else 'None'}
 - Existing Entries: {len(existing_entries)} entries across {len(set(entry['taxonomy'] for entry in existing_entries))} taxonomies
+- Already Mentioned (no stub needed): {', '.join(mentioned_entries) if mentioned_entries else 'None'}
 
 **To generate stubs:** Use the `identify_stub_candidates` tool with this entry's content to get LLM analysis of potential stub candidates, then use `create_stub_entries` to create them."""
 
@@ -184,48 +206,143 @@ If no stub candidates are found, simply respond with "No stub candidates identif
 Please analyze the content above and identify stub candidates:"""
 
 
-def _process_single_stub(world_path: Path, stub: Dict[str, Any]) -> Dict[str, Any]:
-    """Process a single stub entry creation."""
-    name = stub.get("name", "")
-    taxonomy = stub.get("taxonomy", "")
-    description = stub.get("description", "")
-    create_taxonomy = stub.get("create_taxonomy", False)
-
-    result = {
-        "created_stub": False,
-        "created_taxonomy": False,
-        "stub_info": None,
-        "taxonomy_name": None,
-    }
+def _create_stubs(
+    world_path: Path, stub_entries: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, str]], List[str], List[Dict[str, Any]]]:
+    """Create a batch of stub entries from one snapshot of the world.
 
-    if not all([name, taxonomy, description]):
-        return result
+    The world's taxonomies and the entry files of every taxonomy the batch
+    touches are listed once, duplicates within the batch and stubs for
+    existing entries are dropped in memory, and the remaining stubs are
+    written together.
 
-    clean_taxonomy = clean_name(taxonomy)
-    clean_entry_name = clean_name(name)
+    Names are also checked against the world's name index. A stub whose
+    normalized name matches an existing entry or an earlier stub of the
+    batch, e.g. "The Iron Guild" for "Iron Guild", is skipped; one that only
+    resembles an existing name is created and reported as a merge candidate.
 
-    # Create taxonomy if needed
-    if create_taxonomy and not taxonomy_exists(world_path, clean_taxonomy):
-        create_basic_taxonomy(world_path, taxonomy, clean_taxonomy)
-        result["created_taxonomy"] = True
-        result["taxonomy_name"] = taxonomy
+    Args:
+        world_path: Path to the world directory
+        stub_entries: Stub specifications with name, taxonomy, description
+            and optionally create_taxonomy
 
-    # Skip if taxonomy doesn't exist and we're not creating it
-    if not taxonomy_exists(world_path, clean_taxonomy):
-        return result
+    Returns:
+        Tuple of the created stubs, the names of the created taxonomies, and
+        the stubs that matched existing names (with ``match``, ``score`` and
+        whether they were ``skipped``)
+    """
+    taxonomies = _list_taxonomies(world_path)
+    entry_files: Dict[str, Set[str]] = {}
+    created_taxonomies = []
+    pending: Dict[Path, Tuple[str, Dict[str, str]]] = {}
+    name_index = get_name_index(world_path)
+    batch_index = NameIndex()
+    duplicates = []
+
+    for stub in stub_entries:
+        name = stub.get("name", "")
+        taxonomy = stub.get("taxonomy", "")
+        description = stub.get("description", "")
+        if not all([name, taxonomy, description]):
+            continue
+
+        clean_taxonomy = clean_name(taxonomy)
+        if clean_taxonomy not in taxonomies and not stub.get("create_taxonomy", False):
+            continue
+
+        matches = name_index.find_matches(name) + batch_index.find_matches(name)
+        matches.sort(key=lambda match: -match["score"])
+        if matches:
+            # A name with the same normalized key is the same entity; near
+            # misses are left to the author to merge
+            skipped = matches[0]["score"] == 1.0
+            duplicates.append(
+                {
+                    "name": name,
+                    "taxonomy": taxonomy,
+                    "match": matches[0],
+                    "skipped": skipped,
+                }
+            )
+            if skipped:
+                continue
+
+        if clean_taxonomy not in taxonomies:
+            create_basic_taxonomy(world_path, taxonomy, clean_taxonomy)
+            taxonomies.add(clean_taxonomy)
+            created_taxonomies.append(taxonomy)
+
+        if clean_taxonomy not in entry_files:
+            entry_files[clean_taxonomy] = _list_entry_files(world_path, clean_taxonomy)
+
+        file_name = f"{clean_name(name)}{MARKDOWN_EXTENSION}"
+        entry_file = world_path / "entries" / clean_taxonomy / file_name
+        if file_name in entry_files[clean_taxonomy] or entry_file in pending:
+            continue
+
+        stub_info = {
+            "name": name,
+            "taxonomy": taxonomy,
+            "file": f"entries/{clean_taxonomy}/{file_name}",
+        }
+        pending[entry_file] = (
+            _create_stub_content(name, taxonomy, description),
+            stub_info,
+        )
+        batch_index.add(
+            name, {"title": name, "taxonomy": clean_taxonomy, "file": stub_info["file"]}
+        )
 
-    # Create stub entry
-    entry_path = world_path / "entries" / clean_taxonomy
-    entry_path.mkdir(parents=True, exist_ok=True)
+    for clean_taxonomy in {entry_file.parent.name for entry_file in pending}:
+        (world_path / "entries" / clean_taxonomy).mkdir(parents=True, exist_ok=True)
+
+    written = []
+    if pending:
+        with ThreadPoolExecutor(
+            max_workers=min(STUB_WRITE_WORKERS, len(pending))
+        ) as executor:
+            written = list(executor.map(_write_stub, pending, pending.values()))
+
+    created_stubs = [
+        stub_info for (_, stub_info), ok in zip(pending.values(), written) if ok
+    ]
+    return created_stubs, created_taxonomies, duplicates
+
+
+def _list_taxonomies(world_path: Path) -> Set[str]:
+    """List every taxonomy with an entries directory or an overview file."""
+    taxonomies = set()
+    overview_suffix = f"{TAXONOMY_OVERVIEW_SUFFIX}{MARKDOWN_EXTENSION}"
+    for directory in ("entries", "taxonomies"):
+        try:
+            with os.scandir(world_path / directory) as scanner:
+                for item in scanner:
+                    if directory == "entries" and item.is_dir():
+                        taxonomies.add(item.name)
+                    elif item.name.endswith(overview_suffix):
+                        taxonomies.add(item.name[: -len(overview_suffix)])
+        except OSError:
+            continue
+    return taxonomies
+
+
+def _list_entry_files(world_path: Path, clean_taxonomy: str) -> Set[str]:
+    """List the file names in a taxonomy's entries directory."""
+    try:
+        with os.scandir(world_path / "entries" / clean_taxonomy) as scanner:
+            return {item.name for item in scanner}
+    except OSError:
+        return set()
 
-    entry_file = entry_path / f"{clean_entry_name}{MARKDOWN_EXTENSION}"
 
-    # Skip if entry already exists
-    if entry_file.exists():
-        return result
+def _create_stub_content(name: str, taxonomy: str, description: str) -> str:
+    """Create the content of a stub entry, including its frontmatter."""
+    frontmatter = format_frontmatter(
+        {"description": description, "article_type": "stub"}
+    )
+    return f"""{frontmatter}
 
-    # Create stub content with frontmatter
-    stub_content = f"""# {name}
+# {name}
 
 {description}
 
@@ -236,35 +353,45 @@ def _process_single_stub(world_path: Path, stub: Dict[str, Any]) -> Dict[str, An
 *Entry in {taxonomy.title()} taxonomy*
 """
 
-    # Add frontmatter with description and article type
-    final_stub_content = add_frontmatter_to_content(
-        stub_content, {"description": description, "article_type": "stub"}
-    )
 
-    with open(entry_file, "w", encoding="utf-8") as f:
-        f.write(final_stub_content)
-
-    result["created_stub"] = True
-    result["stub_info"] = {
-        "name": name,
-        "taxonomy": taxonomy,
-        "file": f"entries/{clean_taxonomy}/{clean_entry_name}{MARKDOWN_EXTENSION}",
-    }
-
-    return result
+def _write_stub(entry_file: Path, stub: Tuple[str, Dict[str, str]]) -> bool:
+    """Write a stub unless the file was created in the meantime."""
+    return create_file_atomically(entry_file, stub[0])
 
 
 def _create_stub_summary_response(
-    created_stubs: List[Dict[str, str]], created_taxonomies: List[str]
+    created_stubs: List[Dict[str, str]],
+    created_taxonomies: List[str],
+    duplicates: Optional[List[Dict[str, Any]]] = None,
 ) -> list[types.TextContent]:
     """Create summary response for stub creation."""
-    if not created_stubs and not created_taxonomies:
-        return [
-            types.TextContent(
-                type="text",
-                text="No new stub entries or taxonomies were created. All suggested entities may already exist.",
+    duplicate_parts = []
+    skipped = [item for item in duplicates or [] if item["skipped"]]
+    candidates = [item for item in duplicates or [] if not item["skipped"]]
+    if skipped:
+        duplicate_parts.append(
+            "**Skipped (same entity as an existing entry):**\n"
+            + "\n".join(
+                f"- **{item['name']}** is **{item['match']['title']}**: "
+                f"{item['match']['file']}"
+                for item in skipped
             )
-        ]
+        )
+    if candidates:
+        duplicate_parts.append(
+            "**Possible Duplicates (consider merging):**\n"
+            + "\n".join(
+                f"- **{item['name']}** resembles **{item['match']['title']}** "
+                f"({item['match']['score']:.0%} similar): {item['match']['file']}"
+                for item in candidates
+            )
+        )
+
+    if not created_stubs and not created_taxonomies:
+        text = "No new stub entries or taxonomies were created. All suggested entities may already exist."
+        if duplicate_parts:
+            text += "\n\n" + "\n\n".join(duplicate_parts)
+        return [types.TextContent(type="text", text=text)]
 
     response_parts = []
 
@@ -279,6 +406,8 @@ def _create_stub_summary_response(
                 f"- **{stub['name']}** ({stub['taxonomy']}): {stub['file']}"
             )
 
+    response_parts.extend(duplicate_parts)
+
     response_text = "# Stub Creation Summary\n\n" + "\n\n".join(response_parts)
     response_text += "\n\n*These stub entries provide a foundation for future content development. Each can be expanded with more detailed information as the world grows.*"
 
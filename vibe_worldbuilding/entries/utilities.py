@@ -7,7 +7,16 @@ for name cleaning, context extraction, and world analysis.
 from pathlib import Path
 from typing import Dict, List
 
-from ..config import MARKDOWN_EXTENSION, TAXONOMY_OVERVIEW_SUFFIX
+from ..config import (
+    CHARS_PER_TOKEN,
+    MARKDOWN_EXTENSION,
+    TAXONOMY_OVERVIEW_SUFFIX,
+    WORLD_CONTEXT_TOKEN_BUDGET,
+)
+from ..utils.content_parsing import extract_taxonomy_description
+from ..utils.relevance import rank_world_entries
+from ..utils.world_cache import read_world_file
+from ..utils.world_db import find_entries
 
 
 def clean_name(name: str) -> str:
@@ -17,36 +26,15 @@ def clean_name(name: str) -> str:
 
 def extract_taxonomy_context(world_path: Path, clean_taxonomy: str) -> str:
     """Extract the description from a taxonomy overview file."""
-    taxonomy_overview_path = (
-        world_path
-        / "taxonomies"
-        / f"{clean_taxonomy}{TAXONOMY_OVERVIEW_SUFFIX}{MARKDOWN_EXTENSION}"
+    taxonomy_overview_file = (
+        f"taxonomies/{clean_taxonomy}{TAXONOMY_OVERVIEW_SUFFIX}{MARKDOWN_EXTENSION}"
+    )
+    return (
+        read_world_file(
+            world_path, taxonomy_overview_file, extract_taxonomy_description
+        )
+        or ""
     )
-
-    if not taxonomy_overview_path.exists():
-        return ""
-
-    try:
-        with open(taxonomy_overview_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        # Extract the description section
-        lines = content.split("\n")
-        in_description = False
-        description_lines = []
-
-        for line in lines:
-            if line.strip() == "## Description":
-                in_description = True
-                continue
-            elif line.startswith("## ") and in_description:
-                break
-            elif in_description and line.strip():
-                description_lines.append(line.strip())
-
-        return " ".join(description_lines) if description_lines else ""
-    except Exception:
-        return ""
 
 
 def get_existing_taxonomies(world_path: Path) -> List[str]:
@@ -66,58 +54,47 @@ def get_existing_taxonomies(world_path: Path) -> List[str]:
 
 def get_existing_entries(world_path: Path) -> List[Dict[str, str]]:
     """Get a list of existing entries in the world."""
-    entries = []
-    entries_path = world_path / "entries"
-
-    if entries_path.exists():
-        for taxonomy_dir in entries_path.iterdir():
-            if taxonomy_dir.is_dir():
-                for entry_file in taxonomy_dir.glob(f"*{MARKDOWN_EXTENSION}"):
-                    entry_name = entry_file.stem.replace("-", " ").title()
-                    entries.append(
-                        {
-                            "name": entry_name,
-                            "taxonomy": taxonomy_dir.name,
-                            "file": str(entry_file.relative_to(world_path)),
-                        }
-                    )
-
-    return entries
+    return [
+        {
+            "name": record["name"],
+            "taxonomy": record["taxonomy"],
+            "file": record["file"],
+        }
+        for record in find_entries(world_path)
+    ]
 
 
 def get_existing_entries_with_descriptions(world_path: Path) -> List[Dict[str, str]]:
     """Get a list of existing entries with their descriptions."""
-    entries = []
-    entries_path = world_path / "entries"
-
-    if entries_path.exists():
-        for taxonomy_dir in entries_path.iterdir():
-            if taxonomy_dir.is_dir():
-                for entry_file in taxonomy_dir.glob(f"*{MARKDOWN_EXTENSION}"):
-                    try:
-                        with open(entry_file, "r", encoding="utf-8") as f:
-                            content = f.read()
-
-                        # Extract frontmatter to get description
-                        from ..utils.content_parsing import extract_frontmatter
-
-                        frontmatter, _ = extract_frontmatter(content)
-                        description = frontmatter.get("description", "")
-
-                        entry_name = entry_file.stem.replace("-", " ").title()
-                        entries.append(
-                            {
-                                "name": entry_name,
-                                "taxonomy": taxonomy_dir.name,
-                                "description": description,
-                                "file": str(entry_file.relative_to(world_path)),
-                            }
-                        )
-                    except Exception:
-                        # Skip entries that can't be read
-                        continue
-
-    return entries
+    return [
+        {
+            "name": record["name"],
+            "taxonomy": record["taxonomy"],
+            "description": record["description"] or "",
+            "file": record["file"],
+        }
+        for record in find_entries(world_path)
+    ]
+
+
+def get_ranked_entries_with_descriptions(
+    world_path: Path, query: str, taxonomy: str = ""
+) -> List[Dict[str, str]]:
+    """Get existing entries with their descriptions, most relevant to a query first."""
+    return [
+        {
+            "name": record["name"],
+            "taxonomy": record["taxonomy"],
+            "description": record["frontmatter"].get("description", ""),
+            "file": record["file"],
+        }
+        for record, _ in rank_world_entries(world_path, query, taxonomy)
+    ]
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of LLM tokens in a text."""
+    return len(text) // CHARS_PER_TOKEN + 1
 
 
 def create_world_context_prompt(
@@ -126,8 +103,15 @@ def create_world_context_prompt(
     taxonomy_context: str,
     world_overview: str,
     taxonomy: str,
+    token_budget: int = WORLD_CONTEXT_TOKEN_BUDGET,
 ) -> str:
-    """Create a comprehensive world context prompt for the LLM."""
+    """Create a comprehensive world context prompt for the LLM.
+
+    Existing entries are expected in order of relevance. They fill whatever
+    part of the token budget the overview and taxonomy context leave, with
+    their descriptions while those fit and by name after that, so the prompt
+    stays the same size however large the world grows.
+    """
     context_lines = []
 
     # World overview
@@ -143,24 +127,27 @@ def create_world_context_prompt(
         taxonomy_list = ", ".join(existing_taxonomies)
         context_lines.append(f"**Available Taxonomies:** {taxonomy_list}")
 
-    # Existing entries (show first 15 for context)
+    # Existing entries, most relevant first, within the remaining budget
     if existing_entries:
-        entries_by_taxonomy = {}
+        remaining = token_budget - sum(estimate_tokens(line) for line in context_lines)
+        entry_lines = []
         for entry in existing_entries:
-            tax = entry["taxonomy"]
-            if tax not in entries_by_taxonomy:
-                entries_by_taxonomy[tax] = []
-            entries_by_taxonomy[tax].append(entry)
-
-        context_lines.append("**Existing Entries to Reference:**")
-        for tax, entries in sorted(entries_by_taxonomy.items()):
-            entry_names = [
-                entry["name"] for entry in entries[:5]
-            ]  # Limit to 5 per taxonomy
-            more_count = len(entries) - 5
-            if more_count > 0:
-                entry_names.append(f"(+{more_count} more)")
-            context_lines.append(f"- **{tax}**: {', '.join(entry_names)}")
+            line = f"- **{entry['name']}** ({entry['taxonomy']})"
+            described = (
+                f"{line}: {entry['description']}" if entry["description"] else line
+            )
+            if estimate_tokens(described) <= remaining:
+                line = described
+            elif estimate_tokens(line) > remaining:
+                break
+            entry_lines.append(line)
+            remaining -= estimate_tokens(line)
+
+        context_lines.append("**Most Relevant Existing Entries:**")
+        more_count = len(existing_entries) - len(entry_lines)
+        if more_count > 0:
+            entry_lines.append(f"- (+{more_count} more)")
+        context_lines.append("\n".join(entry_lines))
 
     # Writing instructions
     context_lines.append(
@@ -177,17 +164,6 @@ def create_world_context_prompt(
     return "\n\n".join(context_lines)
 
 
-def taxonomy_exists(world_path: Path, clean_taxonomy: str) -> bool:
-    """Check if a taxonomy exists in the world."""
-    entries_dir = world_path / "entries" / clean_taxonomy
-    taxonomies_file = (
-        world_path
-        / "taxonomies"
-        / f"{clean_taxonomy}{TAXONOMY_OVERVIEW_SUFFIX}{MARKDOWN_EXTENSION}"
-    )
-    return entries_dir.exists() or taxonomies_file.exists()
-
-
 def create_basic_taxonomy(world_path: Path, taxonomy: str, clean_taxonomy: str) -> None:
     """Create a basic taxonomy structure if it doesn't exist."""
     # Create entries directory
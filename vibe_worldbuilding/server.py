@@ -28,6 +28,10 @@ from .tools.taxonomy import TAXONOMY_HANDLERS, handle_taxonomy_tool
 # Import tool handlers
 from .tools.world import WORLD_HANDLERS, handle_world_tool
 from .types.schemas import get_all_tools
+from .utils.fal_client import close_fal_client
+from .utils.image_renditions import shutdown_rendition_pool
+from .utils.world_cache import disable_world_cache, enable_world_cache
+from .utils.world_db import close_world_dbs
 
 
 # Load environment variables from .env file
@@ -164,19 +168,28 @@ async def handle_call_tool(
 
 async def main():
     """Main entry point for the MCP server."""
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name=SERVER_NAME,
-                server_version=VERSION,
-                capabilities=app.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    # The server lives for a whole authoring session, so keep parsed worlds
+    # in memory between tool calls
+    enable_world_cache()
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name=SERVER_NAME,
+                    server_version=VERSION,
+                    capabilities=app.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        disable_world_cache()
+        close_fal_client()
+        shutdown_rendition_pool()
+        close_world_dbs()
 
 
 if __name__ == "__main__":
@@ -14,6 +14,7 @@ from ..entries.content_processing import (
     generate_entry_descriptions,
 )
 from ..entries.creation import create_world_entry
+from ..entries.search import search_world
 from ..entries.stub_generation import create_stub_entries
 
 # Tool router for entry operations
@@ -23,6 +24,7 @@ ENTRY_HANDLERS = {
     "generate_entry_descriptions": generate_entry_descriptions,
     "add_entry_frontmatter": add_entry_frontmatter,
     "analyze_world_consistency": analyze_world_consistency,
+    "search_world": search_world,
 }
 
 
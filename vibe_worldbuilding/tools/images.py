@@ -4,8 +4,13 @@ This module handles image generation from markdown content using the FAL API.
 Images are automatically organized in the world's centralized images directory.
 """
 
+import asyncio
+import fnmatch
+import json
+import os
+import time
 from pathlib import Path
-from typing import Any, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import mcp.types as types
 
@@ -13,18 +18,21 @@ from ..config import (
     DEFAULT_IMAGE_ASPECT_RATIO,
     DEFAULT_IMAGE_STYLE,
     FAL_API_KEY,
-    FAL_API_URL,
     FAL_AVAILABLE,
+    FAL_MAX_RETRIES,
+    FAL_REQUESTS_PER_MINUTE,
+    IMAGE_BATCH_PROGRESS_FILENAME,
     IMAGE_EXTENSION,
+    IMAGE_GENERATION_CONCURRENCY,
     MAX_DESCRIPTION_LINES,
+    METADATA_DIRECTORY,
 )
-from ..utils.content_parsing import (
-    extract_frontmatter,
-    add_frontmatter_to_content,
-)
-
-if FAL_AVAILABLE:
-    import requests
+from ..utils.content_parsing import extract_frontmatter
+from ..utils.fal_client import RateLimiter, get_fal_client
+from ..utils.file_ops import update_file_frontmatter
+from ..utils.image_renditions import update_image_renditions
+from ..utils.world_cache import get_cached_entries
+from ..utils.world_manifest import update_world_manifest
 
 
 async def generate_image_prompt_for_entry(
@@ -50,19 +58,13 @@ async def generate_image_prompt_for_entry(
         return [types.TextContent(type="text", text="Error: filepath is required")]
 
     try:
-        # Read the markdown file
         file_path = Path(filepath)
-        content = _read_markdown_file(file_path)
         
         # Check if we're saving a prompt
         image_prompt = arguments.get("image_prompt", "")
         if image_prompt:
-            # Save mode - add image_prompt to frontmatter
-            updated_content = add_frontmatter_to_content(content, {"image_prompt": image_prompt})
-            
-            # Write back to file
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(updated_content)
+            # Save mode - patch image_prompt into the frontmatter in place
+            update_file_frontmatter(file_path, {"image_prompt": image_prompt})
             
             return [
                 types.TextContent(
@@ -72,6 +74,9 @@ async def generate_image_prompt_for_entry(
             ]
         
         # Generate mode - provide guidance for LLM
+        # Read the markdown file
+        content = _read_markdown_file(file_path)
+
         # Extract title and key content elements
         title, description = _extract_content_elements(content)
         
@@ -151,7 +156,7 @@ async def generate_image_from_markdown_file(
     or extracts content to create a prompt, then generates and saves the image.
 
     Args:
-        arguments: Tool arguments containing filepath, style, and aspect_ratio
+        arguments: Tool arguments containing filepath, style, aspect_ratio, and regenerate
 
     Returns:
         List containing success message with image details or error message
@@ -172,6 +177,7 @@ async def generate_image_from_markdown_file(
     style = arguments.get("style", DEFAULT_IMAGE_STYLE)
     aspect_ratio = arguments.get("aspect_ratio", DEFAULT_IMAGE_ASPECT_RATIO)
     skip_optimization = arguments.get("skip_optimization", False)
+    regenerate = arguments.get("regenerate", False)
 
     if not filepath:
         return [types.TextContent(type="text", text="Error: filepath is required")]
@@ -199,12 +205,9 @@ async def generate_image_from_markdown_file(
         
         if "image_prompt" in frontmatter and frontmatter["image_prompt"]:
             # Use the LLM-generated prompt from frontmatter
-            base_prompt = frontmatter["image_prompt"]
-            # Use world style if available, otherwise use provided style
-            if world_style:
-                prompt = f"{world_style}, {base_prompt}"
-            else:
-                prompt = f"{style}, {base_prompt}" if style != DEFAULT_IMAGE_STYLE else base_prompt
+            prompt = _create_styled_prompt(
+                frontmatter["image_prompt"], world_style, style
+            )
         else:
             # No image_prompt in frontmatter
             if not skip_optimization:
@@ -233,16 +236,21 @@ Alternatively, to proceed with a basic prompt now, add the parameter 'skip_optim
                 effective_style = world_style if world_style else style
                 prompt = _create_image_prompt(effective_style, title, description)
 
-        # Generate image via FAL API
-        image_data = await _generate_image_via_fal(prompt, aspect_ratio)
-
-        # Save image to organized directory structure
-        image_path = _save_image_to_world_structure(file_path, image_data)
+        # Generate image via FAL API, streaming it into the organized directory structure
+        image_path = _get_world_image_path(file_path)
+        image_data = await _generate_image_via_fal(
+            prompt, aspect_ratio, image_path, reuse_cached=not regenerate
+        )
+        world_path = _find_world_root(file_path)
+        await update_image_renditions(world_path, [image_path])
+        update_world_manifest(world_path)
 
         # Create success response
         seed_info = (
             f"Seed: {image_data.get('seed', 'unknown')}" if "seed" in image_data else ""
         )
+        if image_data.get("cached"):
+            seed_info += "\nReused a cached image for this prompt (pass regenerate: true for a new one)"
 
         return [
             types.TextContent(
@@ -261,6 +269,290 @@ Alternatively, to proceed with a basic prompt now, add the parameter 'skip_optim
         ]
 
 
+async def generate_images_batch(
+    arguments: dict[str, Any] | None,
+) -> list[types.TextContent]:
+    """Generate images for every entry that has an image prompt but no image.
+
+    Entries are selected from the world index, optionally filtered by taxonomy
+    and a glob pattern, and generated by a bounded pool of workers sharing a
+    rate limit. Failed generations are retried with backoff. Progress is kept
+    in ``metadata/image_batch.json``, so an interrupted batch can simply be run
+    again: finished images are skipped and interrupted ones are redone.
+
+    Args:
+        arguments: Tool arguments containing world_directory and optional
+            taxonomy, pattern, style, aspect_ratio, limit, max_concurrency,
+            requests_per_minute and max_retries
+
+    Returns:
+        List containing a summary of the batch
+    """
+    if not FAL_AVAILABLE:
+        return [
+            types.TextContent(
+                type="text",
+                text="Error: requests library not available. Please install with: pip install requests",
+            )
+        ]
+
+    if not arguments:
+        return [types.TextContent(type="text", text="Error: No arguments provided")]
+
+    world_directory = arguments.get("world_directory", "")
+    if not world_directory:
+        return [
+            types.TextContent(type="text", text="Error: world_directory is required")
+        ]
+
+    if not FAL_API_KEY:
+        return [
+            types.TextContent(
+                type="text", text="Error: FAL_KEY environment variable not set"
+            )
+        ]
+
+    world_path = Path(world_directory)
+    if not world_path.exists():
+        return [
+            types.TextContent(
+                type="text",
+                text=f"Error: World directory {world_directory} does not exist",
+            )
+        ]
+
+    taxonomy = arguments.get("taxonomy", "").lower().replace(" ", "-")
+    pattern = arguments.get("pattern", "")
+    style = arguments.get("style", DEFAULT_IMAGE_STYLE)
+    aspect_ratio = arguments.get("aspect_ratio", DEFAULT_IMAGE_ASPECT_RATIO)
+    try:
+        limit = int(arguments.get("limit", 0))
+        max_concurrency = int(
+            arguments.get("max_concurrency", IMAGE_GENERATION_CONCURRENCY)
+        )
+        requests_per_minute = float(
+            arguments.get("requests_per_minute", FAL_REQUESTS_PER_MINUTE)
+        )
+        max_retries = int(arguments.get("max_retries", FAL_MAX_RETRIES))
+    except (TypeError, ValueError):
+        limit = max_concurrency = max_retries = requests_per_minute = -1
+
+    if max_concurrency < 1 or limit < 0 or max_retries < 0 or requests_per_minute < 0:
+        return [
+            types.TextContent(
+                type="text",
+                text="Error: max_concurrency must be a positive integer, and limit, max_retries and requests_per_minute must not be negative numbers",
+            )
+        ]
+
+    try:
+        started = time.monotonic()
+        progress = _read_batch_progress(world_path)
+        world_style = _get_world_visual_style(world_path)
+
+        # Select entries that still need an image
+        pending = []
+        already_illustrated = 0
+        missing_prompt = 0
+        for record in get_cached_entries(world_path):
+            if taxonomy and record["taxonomy"] != taxonomy:
+                continue
+            entry_key = f"{record['taxonomy']}/{record['slug']}"
+            if pattern and not (
+                fnmatch.fnmatch(entry_key, pattern)
+                or fnmatch.fnmatch(record["slug"], pattern)
+            ):
+                continue
+            if not record["frontmatter"].get("image_prompt"):
+                missing_prompt += 1
+                continue
+
+            image_path = (
+                world_path
+                / "images"
+                / record["taxonomy"]
+                / f"{record['slug']}{IMAGE_EXTENSION}"
+            )
+            interrupted = progress.get(record["file"], {}).get("status") == "running"
+            if image_path.exists() and not interrupted:
+                already_illustrated += 1
+                continue
+            pending.append((record, image_path))
+
+        remaining = 0
+        if limit > 0 and len(pending) > limit:
+            remaining = len(pending) - limit
+            pending = pending[:limit]
+
+        # Generate through a bounded worker pool
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in pending:
+            queue.put_nowait(item)
+        rate_limiter = RateLimiter(requests_per_minute)
+        failures: Dict[str, str] = {}
+        generated: List[str] = []
+
+        async def worker() -> None:
+            while True:
+                try:
+                    record, image_path = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                progress[record["file"]] = {"status": "running"}
+                _write_batch_progress(world_path, progress)
+
+                prompt = _create_styled_prompt(
+                    record["frontmatter"]["image_prompt"], world_style, style
+                )
+                error = await _generate_batch_image(
+                    prompt, aspect_ratio, image_path, rate_limiter, max_retries
+                )
+
+                if error:
+                    failures[record["file"]] = error
+                    progress[record["file"]].update(status="failed", error=error)
+                else:
+                    generated.append(record["file"])
+                    progress[record["file"]]["status"] = "done"
+                _write_batch_progress(world_path, progress)
+                if not error:
+                    await update_image_renditions(world_path, [image_path])
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(max_concurrency, len(pending)) or 1))
+        )
+        if generated:
+            update_world_manifest(world_path)
+
+        return [
+            types.TextContent(
+                type="text",
+                text=_create_batch_summary(
+                    world_path,
+                    generated,
+                    failures,
+                    already_illustrated,
+                    missing_prompt,
+                    remaining,
+                    time.monotonic() - started,
+                ),
+            )
+        ]
+
+    except Exception as e:
+        return [
+            types.TextContent(
+                type="text", text=f"Error generating image batch: {str(e)}"
+            )
+        ]
+
+
+async def _generate_batch_image(
+    prompt: str,
+    aspect_ratio: str,
+    image_path: Path,
+    rate_limiter: RateLimiter,
+    max_retries: int,
+) -> str:
+    """Generate one batch image once the rate limit allows.
+
+    Transient failures are retried with backoff by the shared FAL client.
+
+    Args:
+        prompt: Image generation prompt
+        aspect_ratio: Desired aspect ratio
+        image_path: Where to save the generated image
+        rate_limiter: Limiter shared by the batch's workers
+        max_retries: Number of retries after the first attempt
+
+    Returns:
+        Error message, or an empty string on success
+    """
+    image_path.parent.mkdir(parents=True, exist_ok=True)
+    await rate_limiter.wait()
+    try:
+        await _generate_image_via_fal(
+            prompt, aspect_ratio, image_path, max_retries=max_retries
+        )
+        return ""
+    except Exception as e:
+        return str(e)
+
+
+def _create_batch_summary(
+    world_path: Path,
+    generated: List[str],
+    failures: Dict[str, str],
+    already_illustrated: int,
+    missing_prompt: int,
+    remaining: int,
+    elapsed: float,
+) -> str:
+    """Format the result of a batch run."""
+    lines = [
+        f"Batch image generation for {world_path.name} finished in {elapsed:.1f}s",
+        "",
+        f"- Generated: {len(generated)}",
+        f"- Failed: {len(failures)}",
+        f"- Already illustrated: {already_illustrated}",
+        f"- Missing image_prompt: {missing_prompt}",
+    ]
+    if remaining:
+        lines.append(
+            f"- Not started (over limit): {remaining} - run the tool again to continue"
+        )
+    if missing_prompt:
+        lines.append(
+            "\nUse 'generate_image_prompt_for_entry' to add prompts to the remaining entries."
+        )
+    if failures:
+        lines.append("\nFailed entries (run the tool again to retry):")
+        for entry_file, error in sorted(failures.items()):
+            lines.append(f"- {entry_file}: {error[:200]}")
+    return "\n".join(lines)
+
+
+def _read_batch_progress(world_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Read the batch progress file, treating a missing or corrupt file as empty."""
+    progress_path = world_path / METADATA_DIRECTORY / IMAGE_BATCH_PROGRESS_FILENAME
+    try:
+        with open(progress_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    entries = data.get("entries") if isinstance(data, dict) else None
+    return entries if isinstance(entries, dict) else {}
+
+
+def _write_batch_progress(
+    world_path: Path, progress: Dict[str, Dict[str, Any]]
+) -> None:
+    """Write the batch progress file atomically."""
+    progress_path = world_path / METADATA_DIRECTORY / IMAGE_BATCH_PROGRESS_FILENAME
+    progress_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = progress_path.with_name(f".{progress_path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"entries": progress}, f)
+    os.replace(temp_path, progress_path)
+
+
+def _create_styled_prompt(base_prompt: str, world_style: str, style: str) -> str:
+    """Combine an entry's image prompt with the world or requested style.
+
+    Args:
+        base_prompt: The entry's image_prompt from frontmatter
+        world_style: The world's stored visual style, which takes priority
+        style: Requested art style
+
+    Returns:
+        Prompt for image generation
+    """
+    if world_style:
+        return f"{world_style}, {base_prompt}"
+    return f"{style}, {base_prompt}" if style != DEFAULT_IMAGE_STYLE else base_prompt
+
+
 def _read_markdown_file(file_path: Path) -> str:
     """Read the content of a markdown file.
 
@@ -337,60 +629,44 @@ def _create_image_prompt(style: str, title: str, description: str) -> str:
     return prompt.replace("..", ".")
 
 
-async def _generate_image_via_fal(prompt: str, aspect_ratio: str) -> dict:
-    """Generate an image using the FAL API.
+async def _generate_image_via_fal(
+    prompt: str,
+    aspect_ratio: str,
+    output_path: Path,
+    reuse_cached: bool = True,
+    max_retries: Optional[int] = None,
+) -> dict:
+    """Generate an image using the FAL API and stream it to disk.
 
     Args:
         prompt: Image generation prompt
         aspect_ratio: Desired aspect ratio
+        output_path: Where to save the generated image
+        reuse_cached: Whether an identical earlier generation may be reused
+        max_retries: Retries of transient failures (default: the client's)
 
     Returns:
         API response data including image URL and metadata
 
     Raises:
-        Exception: If API request fails or returns no images
+        FalAPIError: If API request fails, returns no images, or the download fails
     """
-    headers = {
-        "Authorization": f"Key {FAL_API_KEY}",
-        "Content-Type": "application/json",
-    }
-
     payload = {"prompt": prompt, "aspect_ratio": aspect_ratio, "num_images": 1}
+    return await get_fal_client().generate_image(
+        payload, output_path, reuse_cached=reuse_cached, max_retries=max_retries
+    )
 
-    response = requests.post(FAL_API_URL, headers=headers, json=payload)
-
-    if response.status_code != 200:
-        raise Exception(
-            f"FAL API request failed with status {response.status_code}: {response.text}"
-        )
-
-    result = response.json()
-
-    if "images" not in result or not result["images"]:
-        raise Exception("No images returned from FAL API")
-
-    # Download the image data
-    image_url = result["images"][0]["url"]
-    image_response = requests.get(image_url)
-
-    if image_response.status_code != 200:
-        raise Exception(f"Failed to download image from {image_url}")
 
-    # Add image data to result
-    result["image_data"] = image_response.content
+def _get_world_image_path(file_path: Path) -> Path:
+    """Get where the image for a markdown file goes in the world's images directory.
 
-    return result
-
-
-def _save_image_to_world_structure(file_path: Path, image_data: dict) -> Path:
-    """Save the generated image to the world's organized directory structure.
+    Creates the centralized images directory and category folder as needed.
 
     Args:
         file_path: Path to the source markdown file
-        image_data: Image data and metadata from API
 
     Returns:
-        Path where the image was saved
+        Path where the image should be saved
     """
     # Find the world root directory
     world_root = _find_world_root(file_path)
@@ -412,10 +688,6 @@ def _save_image_to_world_structure(file_path: Path, image_data: dict) -> Path:
         image_filename = f"{file_path.stem}{IMAGE_EXTENSION}"
         image_path = images_dir / image_filename
 
-    # Save the image
-    with open(image_path, "wb") as f:
-        f.write(image_data["image_data"])
-
     return image_path
 
 
@@ -487,6 +759,7 @@ def _get_world_visual_style(file_path: Path) -> str:
 # Tool router for image operations
 IMAGE_HANDLERS = {
     "generate_image_from_markdown_file": generate_image_from_markdown_file,
+    "generate_images_batch": generate_images_batch,
     "generate_image_prompt_for_entry": generate_image_prompt_for_entry,
 }
 
@@ -5,14 +5,34 @@ It manages the complex symlink operations needed to bridge world project structu
 with Astro's expected content layout.
 """
 
+import json
+import os
 import shutil
 import subprocess
+import tempfile
 from pathlib import Path
 from typing import Any, List
 
 import mcp.types as types
 
-from ..config import BUILD_TIMEOUT_SECONDS, CONTENT_SYMLINK_DIRS, DEFAULT_SITE_DIR
+from ..config import (
+    BUILD_PAGES_ENV_VAR,
+    BUILD_TIMEOUT_SECONDS,
+    CONTENT_SYMLINK_DIRS,
+    DEFAULT_SITE_DIR,
+    METADATA_DIRECTORY,
+    METADATA_SYMLINK_PATH,
+)
+from ..utils.build_manifest import (
+    plan_site_build,
+    publish_site_outputs,
+    record_site_outputs,
+    save_build_manifest,
+)
+from ..utils.file_ops import link_or_copy_file
+from ..utils.image_renditions import update_image_renditions
+from ..utils.link_manifest import update_link_manifest
+from ..utils.world_manifest import write_world_manifest
 
 
 async def build_static_site(
@@ -21,12 +41,15 @@ async def build_static_site(
     """Build a static website for a specific world using Astro.
 
     Supports three actions:
-    - 'build': Generate static files in the world's site directory
+    - 'build': Generate static files in the world's site directory; with
+      'incremental', render only the pages whose sources changed and patch
+      the existing site in place
     - 'dev': Set up development environment with symlinks
     - 'preview': Provide instructions for serving built site
 
     Args:
-        arguments: Tool arguments containing world_directory, action, and site_dir
+        arguments: Tool arguments containing world_directory, action, site_dir,
+            and incremental
 
     Returns:
         List containing success/error message and instructions
@@ -39,6 +62,7 @@ async def build_static_site(
     world_directory = arguments.get("world_directory", "")
     action = arguments.get("action", "build")
     site_dir = arguments.get("site_dir", DEFAULT_SITE_DIR)
+    incremental = arguments.get("incremental", False)
 
     if not world_directory:
         return [
@@ -50,9 +74,11 @@ async def build_static_site(
         world_path, script_dir = _validate_build_environment(world_directory)
 
         if action == "build":
-            return await _handle_build_action(world_path, script_dir, site_dir)
+            return await _handle_build_action(
+                world_path, script_dir, site_dir, incremental
+            )
         elif action == "dev":
-            return _handle_dev_action(world_path, script_dir)
+            return await _handle_dev_action(world_path, script_dir)
         elif action == "preview":
             return _handle_preview_action(world_path, site_dir)
         else:
@@ -128,14 +154,19 @@ def _validate_build_environment(world_directory: str) -> tuple[Path, Path]:
 
 
 async def _handle_build_action(
-    world_path: Path, script_dir: Path, site_dir: str
+    world_path: Path, script_dir: Path, site_dir: str, incremental: bool = False
 ) -> list[types.TextContent]:
     """Handle the build action for static site generation.
 
+    Every successful build records a build manifest. Incremental builds use it
+    to render only changed pages, falling back to a full build when there is
+    no usable manifest or the site templates changed.
+
     Args:
         world_path: Path to the world directory
         script_dir: Path to the project root directory
         site_dir: Name of the site directory
+        incremental: Whether to rebuild only pages whose sources changed
 
     Returns:
         List containing build result message
@@ -151,11 +182,39 @@ async def _handle_build_action(
             if item.is_dir() and "-2025" in item.name:  # World dirs have timestamp
                 shutil.rmtree(item)
 
+    # Bring the cross-link manifest, image renditions and the world manifest
+    # every page reads up to date
+    link_manifest = update_link_manifest(world_path)
+    await update_image_renditions(world_path)
+    write_world_manifest(world_path, link_manifest)
+
+    # Work out which pages changed since the last build
+    plan = plan_site_build(world_path, script_dir, world_path / site_dir, link_manifest)
+    partial = incremental and not plan["full"]
+    if partial and not plan["pages"] and not plan["removed"]:
+        return [
+            types.TextContent(
+                type="text",
+                text=f"✅ Static site for {world_name} is already up to date.\n\nSite location: {(world_path / site_dir).absolute()}",
+            )
+        ]
+
     # Set up symlinks for build
     temp_world_link = _setup_world_symlink(script_dir, world_path, world_name)
     _setup_content_symlinks(script_dir, world_path)
     # Don't copy images to public - they should stay in the world directory
 
+    pages_file = None
+    build_env = None
+    if partial:
+        # Tell the Astro pages which routes to render
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".json", delete=False, encoding="utf-8"
+        ) as f:
+            json.dump(plan["pages"], f)
+            pages_file = f.name
+        build_env = {**os.environ, BUILD_PAGES_ENV_VAR: pages_file}
+
     try:
         # Build the static site
         result = subprocess.run(
@@ -164,13 +223,22 @@ async def _handle_build_action(
             text=True,
             timeout=BUILD_TIMEOUT_SECONDS,
             cwd=script_dir,
+            env=build_env,
         )
 
         if result.returncode == 0:
             # Handle successful build first
-            build_result = _handle_successful_build(
-                script_dir, world_path, world_name, site_dir
-            )
+            if partial:
+                build_result = _handle_incremental_build(
+                    script_dir, world_path, world_name, site_dir, plan
+                )
+            else:
+                build_result = _handle_successful_build(
+                    script_dir, world_path, world_name, site_dir
+                )
+                if (world_path / site_dir).exists():
+                    record_site_outputs(world_path / site_dir, plan)
+                    save_build_manifest(world_path, plan)
             # Only clean up the temp world link, keep content symlinks
             if temp_world_link.exists() or temp_world_link.is_symlink():
                 temp_world_link.unlink()
@@ -187,9 +255,14 @@ async def _handle_build_action(
         if temp_world_link.exists() or temp_world_link.is_symlink():
             temp_world_link.unlink()
         raise e
+    finally:
+        if pages_file:
+            os.unlink(pages_file)
 
 
-def _handle_dev_action(world_path: Path, script_dir: Path) -> list[types.TextContent]:
+async def _handle_dev_action(
+    world_path: Path, script_dir: Path
+) -> list[types.TextContent]:
     """Handle the dev action for development environment setup.
 
     Args:
@@ -201,6 +274,12 @@ def _handle_dev_action(world_path: Path, script_dir: Path) -> list[types.TextCon
     """
     world_name = world_path.name
 
+    # Bring the cross-link manifest, image renditions and the world manifest
+    # every page reads up to date
+    link_manifest = update_link_manifest(world_path)
+    await update_image_renditions(world_path)
+    write_world_manifest(world_path, link_manifest)
+
     # Set up symlinks for development
     _setup_world_symlink(script_dir, world_path, world_name)
     _setup_content_symlinks(script_dir, world_path)
@@ -276,11 +355,12 @@ def _setup_content_symlinks(script_dir: Path, world_path: Path) -> None:
     content_dir = script_dir / "src" / "content"
     content_dir.mkdir(parents=True, exist_ok=True)
 
-    # Create symlinks for the content directories
-    for link_name in CONTENT_SYMLINK_DIRS:
-        link_path = content_dir / link_name
-        source_path = world_path / link_name
+    # Create symlinks for the content directories, plus the world metadata
+    # (link manifest) that the pages read outside of content collections
+    links = [(content_dir / name, world_path / name) for name in CONTENT_SYMLINK_DIRS]
+    links.append((script_dir / METADATA_SYMLINK_PATH, world_path / METADATA_DIRECTORY))
 
+    for link_path, source_path in links:
         # Remove existing symlink if it exists
         if link_path.exists() or link_path.is_symlink():
             if link_path.is_symlink():
@@ -314,23 +394,28 @@ def _handle_successful_build(
     source_dist = script_dir / "dist"
     target_site = world_path / site_dir
 
-    # Remove existing site directory if it exists
-    if target_site.exists():
-        shutil.rmtree(target_site)
-
     # Move the built site
     if source_dist.exists():
-        shutil.move(str(source_dist), str(target_site))
-        
-        # Copy the world's images directory to the site
+        # Replace the previous build, but keep its published images so that
+        # only new or changed images have to be written
+        target_site.mkdir(parents=True, exist_ok=True)
+        for item in target_site.iterdir():
+            if item.name != "images":
+                _remove_path(item)
+        for item in source_dist.iterdir():
+            if item.name == "images":
+                _remove_path(item)
+            else:
+                shutil.move(str(item), str(target_site / item.name))
+        source_dist.rmdir()
+
+        # Publish only this world's images, syncing what changed
         world_images_path = world_path / "images"
+        site_images_path = target_site / "images"
         if world_images_path.exists():
-            site_images_path = target_site / "images"
-            # Important: Remove the entire images directory first to avoid accumulation
-            if site_images_path.exists():
-                shutil.rmtree(site_images_path)
-            # Copy only this world's images
-            shutil.copytree(world_images_path, site_images_path)
+            _sync_directory(world_images_path, site_images_path)
+        elif site_images_path.exists():
+            shutil.rmtree(site_images_path)
 
         # Count generated files
         html_files = list(target_site.rglob("*.html"))
@@ -351,6 +436,120 @@ def _handle_successful_build(
         ]
 
 
+def _handle_incremental_build(
+    script_dir: Path,
+    world_path: Path,
+    world_name: str,
+    site_dir: str,
+    plan: dict[str, Any],
+) -> list[types.TextContent]:
+    """Handle a successful partial build by patching the existing site.
+
+    Args:
+        script_dir: Path to the project root directory
+        world_path: Path to the world directory
+        world_name: Name of the world
+        site_dir: Name of the site directory
+        plan: Build plan for the pages that were rendered
+
+    Returns:
+        List containing success message with build details
+    """
+    source_dist = script_dir / "dist"
+    target_site = world_path / site_dir
+
+    if not source_dist.exists():
+        return [
+            types.TextContent(
+                type="text",
+                text="Build completed but dist directory not found. This may indicate a build configuration issue.",
+            )
+        ]
+
+    updated_files = publish_site_outputs(source_dist, target_site, plan)
+    shutil.rmtree(source_dist)
+
+    # Bring the site's images in line with the world's images
+    world_images_path = world_path / "images"
+    if world_images_path.exists():
+        updated_files += _sync_directory(world_images_path, target_site / "images")
+
+    save_build_manifest(world_path, plan)
+
+    return [
+        types.TextContent(
+            type="text",
+            text=f"✅ Static site updated incrementally for {world_name}!\n\nSite location: {target_site.absolute()}\nRebuilt {len(plan['pages'])} pages ({plan['reason']}) and updated {updated_files} files.",
+        )
+    ]
+
+
+def _remove_path(path: Path) -> None:
+    """Remove a file, symlink or directory tree.
+
+    Args:
+        path: Path to remove
+    """
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    else:
+        path.unlink()
+
+
+def _sync_directory(source_dir: Path, target_dir: Path) -> int:
+    """Make a directory mirror another, publishing only new or changed files.
+
+    Files are compared by size and mtime (or found to be the same file when
+    they were hard-linked), so unchanged files cost one ``stat``. Changed
+    files are hard-linked, reflinked or copied, whichever the filesystem
+    supports, and files and folders that no longer exist in the source are
+    removed.
+
+    Args:
+        source_dir: Directory to mirror
+        target_dir: Directory to update
+
+    Returns:
+        Number of files published or removed
+    """
+    updated = 0
+    source_files = set()
+
+    for source_file in source_dir.rglob("*"):
+        if not source_file.is_file():
+            continue
+        relative_path = source_file.relative_to(source_dir)
+        source_files.add(relative_path)
+
+        target_file = target_dir / relative_path
+        if target_file.exists():
+            source_stat = source_file.stat()
+            target_stat = target_file.stat()
+            if (
+                target_stat.st_ino == source_stat.st_ino
+                and target_stat.st_dev == source_stat.st_dev
+            ) or (
+                target_stat.st_size == source_stat.st_size
+                and target_stat.st_mtime_ns == source_stat.st_mtime_ns
+            ):
+                continue
+        link_or_copy_file(source_file, target_file)
+        updated += 1
+
+    if target_dir.exists():
+        # Deepest paths first so emptied folders can be removed too
+        for target_item in sorted(target_dir.rglob("*"), reverse=True):
+            relative_path = target_item.relative_to(target_dir)
+            if target_item.is_dir() and not target_item.is_symlink():
+                if not any(target_item.iterdir()):
+                    target_item.rmdir()
+            elif relative_path not in source_files:
+                target_item.unlink()
+                updated += 1
+
+    return updated
+
+
 def _cleanup_build_artifacts(
     script_dir: Path, world_name: str, temp_world_link: Path
 ) -> None:
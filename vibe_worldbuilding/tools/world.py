@@ -4,6 +4,7 @@ This module handles the creation of new world projects with proper directory
 structure, content initialization, and optional image generation.
 """
 
+import asyncio
 import uuid
 from datetime import datetime
 from pathlib import Path
@@ -14,16 +15,15 @@ import mcp.types as types
 from ..config import (
     DEFAULT_UNIQUE_SUFFIX,
     FAL_API_KEY,
-    FAL_API_URL,
     FAL_AVAILABLE,
     IMAGE_EXTENSION,
+    IMAGE_GENERATION_CONCURRENCY,
     MARKDOWN_EXTENSION,
     MAX_DESCRIPTION_LINES,
     WORLD_DIRECTORIES,
 )
-
-if FAL_AVAILABLE:
-    import requests
+from ..utils.fal_client import FalAPIError, get_fal_client
+from ..utils.image_renditions import update_image_renditions
 
 
 async def instantiate_world(
@@ -86,12 +86,18 @@ async def instantiate_world(
         image_generation_info = ""
         favicon_info = ""
         if FAL_API_KEY and FAL_AVAILABLE:
-            image_generation_info = await _generate_overview_images(
-                world_path, world_name, world_content
-            )
-            favicon_info = await _generate_world_favicon(
-                world_path, world_name, world_content
+            # Overview images and favicon are generated concurrently, sharing
+            # one limit on in-flight FAL requests
+            semaphore = asyncio.Semaphore(IMAGE_GENERATION_CONCURRENCY)
+            image_generation_info, favicon_info = await asyncio.gather(
+                _generate_overview_images(
+                    world_path, world_name, world_content, semaphore
+                ),
+                _generate_world_favicon(
+                    world_path, world_name, world_content, semaphore
+                ),
             )
+            await update_image_renditions(world_path)
 
         # Create success response
         return _create_success_response(
@@ -217,14 +223,18 @@ As you develop your world, you'll identify key categories that need systematic d
 
 
 async def _generate_overview_images(
-    world_path: Path, world_name: str, world_content: str
+    world_path: Path,
+    world_name: str,
+    world_content: str,
+    semaphore: asyncio.Semaphore | None = None,
 ) -> str:
-    """Generate overview images for the world using FAL API.
+    """Generate overview images for the world concurrently using FAL API.
 
     Args:
         world_path: Path to the world directory
         world_name: Name of the world
         world_content: Content of the world overview
+        semaphore: Limit on concurrent FAL requests (defaults to IMAGE_GENERATION_CONCURRENCY)
 
     Returns:
         Information string about generated images
@@ -235,11 +245,6 @@ async def _generate_overview_images(
     image_generation_info = ""
 
     try:
-        headers = {
-            "Authorization": f"Key {FAL_API_KEY}",
-            "Content-Type": "application/json",
-        }
-
         # Extract content elements for consistent image generation
         title, description = _extract_world_content_elements(world_name, world_content)
         
@@ -292,14 +297,25 @@ async def _generate_overview_images(
                 },
             ]
 
-        for config in image_configs:
-            success = await _generate_single_image(
-                headers,
-                config["prompt"],
-                config["image_size"],
-                world_path / "images" / config["filename"],
-            )
-            if success:
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(IMAGE_GENERATION_CONCURRENCY)
+        results = await asyncio.gather(
+            *(
+                _generate_single_image(
+                    config["prompt"],
+                    config["image_size"],
+                    world_path / "images" / config["filename"],
+                    semaphore,
+                )
+                for config in image_configs
+            ),
+            return_exceptions=True,
+        )
+
+        for config, result in zip(image_configs, results):
+            if isinstance(result, Exception):
+                image_generation_info += f"\n- Failed to generate {config['name']} image: {str(result)[:200]}"
+            else:
                 image_generation_info += (
                     f"\n- Generated {config['name']} image: {config['filename']}"
                 )
@@ -371,44 +387,36 @@ def _create_world_image_prompt(style: str, title: str, description: str) -> str:
 
 
 async def _generate_single_image(
-    headers: dict, prompt: str, image_size: str, output_path: Path
-) -> bool:
+    prompt: str,
+    image_size: str,
+    output_path: Path,
+    semaphore: asyncio.Semaphore | None = None,
+) -> None:
     """Generate a single image using the FAL API.
 
     Args:
-        headers: HTTP headers for the API request
         prompt: Image generation prompt
         image_size: FAL API image size parameter
         output_path: Where to save the generated image
+        semaphore: Limit on concurrent FAL requests, if any
 
-    Returns:
-        True if successful, False otherwise
+    Raises:
+        FalAPIError: If generation or download fails
     """
-    try:
-        payload = {
-            "prompt": prompt,
-            "image_size": image_size,
-            "num_images": 1,
-            "num_inference_steps": 28,
-            "guidance_scale": 3.5,
-            "enable_safety_checker": True,
-        }
-
-        response = requests.post(FAL_API_URL, headers=headers, json=payload)
-
-        if response.status_code == 200:
-            result = response.json()
-            if "images" in result and result["images"]:
-                image_url = result["images"][0]["url"]
-                image_response = requests.get(image_url)
-                if image_response.status_code == 200:
-                    with open(output_path, "wb") as f:
-                        f.write(image_response.content)
-                    return True
-    except Exception:
-        pass  # Silently fail for individual images
-
-    return False
+    payload = {
+        "prompt": prompt,
+        "image_size": image_size,
+        "num_images": 1,
+        "num_inference_steps": 28,
+        "guidance_scale": 3.5,
+        "enable_safety_checker": True,
+    }
+
+    if semaphore is None:
+        await get_fal_client().generate_image(payload, output_path)
+        return
+    async with semaphore:
+        await get_fal_client().generate_image(payload, output_path)
 
 
 async def _generate_world_visual_style(
@@ -540,7 +548,10 @@ After you provide the style, I will save it to `metadata/visual_style.txt` where
 
 
 async def _generate_world_favicon(
-    world_path: Path, world_name: str, world_content: str
+    world_path: Path,
+    world_name: str,
+    world_content: str,
+    semaphore: asyncio.Semaphore | None = None,
 ) -> str:
     """Generate a custom favicon for the world using FAL API.
 
@@ -548,6 +559,7 @@ async def _generate_world_favicon(
         world_path: Path to the world directory
         world_name: Name of the world
         world_content: Content of the world overview
+        semaphore: Limit on concurrent FAL requests, if any
 
     Returns:
         Information string about favicon generation
@@ -556,11 +568,6 @@ async def _generate_world_favicon(
         return ""
 
     try:
-        headers = {
-            "Authorization": f"Key {FAL_API_KEY}",
-            "Content-Type": "application/json",
-        }
-
         # Create favicon-specific prompt using world style if available
         style_file = world_path / "metadata" / "visual_style.txt"
         if style_file.exists():
@@ -570,42 +577,19 @@ async def _generate_world_favicon(
         else:
             favicon_prompt = _create_favicon_prompt(world_name, world_content)
 
-        # Generate favicon with proper size constraints
-        payload = {
-            "prompt": favicon_prompt,
-            "image_size": "square_hd",  # 1024x1024 square format
-            "num_images": 1,
-            "num_inference_steps": 28,
-            "guidance_scale": 3.5,
-            "enable_safety_checker": True,
-        }
-
-        response = requests.post(FAL_API_URL, headers=headers, json=payload)
-
-        if response.status_code == 200:
-            result = response.json()
-            if "images" in result and result["images"]:
-                image_url = result["images"][0]["url"]
-                image_response = requests.get(image_url)
-                if image_response.status_code == 200:
-                    # Save favicon in the images directory
-                    favicon_path = world_path / "images" / "favicon.png"
-                    with open(favicon_path, "wb") as f:
-                        f.write(image_response.content)
-
-                    return "\n- Generated custom favicon: favicon.png"
-                else:
-                    return f"\n\nNote: Favicon image download failed: HTTP {image_response.status_code}"
-            else:
-                return f"\n\nNote: Favicon generation failed: No images in API response"
-        else:
-            return f"\n\nNote: Favicon generation failed: API returned HTTP {response.status_code} - {response.text[:200]}"
+        # Generate favicon in the 1024x1024 square format, saved in the images directory
+        favicon_path = world_path / "images" / "favicon.png"
+        await _generate_single_image(
+            favicon_prompt, "square_hd", favicon_path, semaphore
+        )
+
+        return "\n- Generated custom favicon: favicon.png"
 
+    except FalAPIError as e:
+        return f"\n\nNote: Favicon generation failed: {str(e)[:200]}"
     except Exception as e:
         return f"\n\nNote: Favicon generation attempted but failed: {str(e)}"
 
-    return "\n\nNote: Favicon generation failed: Unknown error"
-
 
 def _create_favicon_prompt(world_name: str, world_content: str) -> str:
     """Create a simple favicon prompt.
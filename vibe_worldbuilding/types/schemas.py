@@ -204,7 +204,21 @@ GENERATE_ENTRY_DESCRIPTIONS_SCHEMA = types.Tool(
             "world_directory": {
                 "type": "string",
                 "description": "Path to the world directory",
-            }
+            },
+            "page_size": {
+                "type": "number",
+                "description": "Maximum number of entries per page (default: 25)",
+                "default": 25,
+            },
+            "token_budget": {
+                "type": "number",
+                "description": "Approximate preview tokens per page (default: 8000)",
+                "default": 8000,
+            },
+            "cursor": {
+                "type": "string",
+                "description": "Cursor from the end of the previous page, to continue where it stopped",
+            },
         },
         "required": ["world_directory"],
     },
@@ -255,12 +269,52 @@ ANALYZE_WORLD_CONSISTENCY_SCHEMA = types.Tool(
                 "description": "Number of entries to analyze (default: 15)",
                 "default": 15,
             },
+            "mode": {
+                "type": "string",
+                "enum": ["sample", "sweep"],
+                "description": "'sample' analyzes a selection of entries, flagged ones first; 'sweep' reviews the whole world in chunks of linked entries, handing out only chunks that are new or changed since their last review (call again to continue)",
+                "default": "sample",
+            },
+            "token_budget": {
+                "type": "number",
+                "description": "Approximate entry tokens per sweep chunk (default: 12000)",
+                "default": 12000,
+            },
         },
         "required": ["world_directory"],
     },
 )
 
 
+SEARCH_WORLD_SCHEMA = types.Tool(
+    name="search_world",
+    description="Full-text search over a world's entries and taxonomy overviews, ranked by relevance with highlighted snippets",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "world_directory": {
+                "type": "string",
+                "description": "Path to the world directory",
+            },
+            "query": {
+                "type": "string",
+                "description": "Words to search for",
+            },
+            "taxonomy": {
+                "type": "string",
+                "description": "Only search entries of this taxonomy (optional)",
+            },
+            "limit": {
+                "type": "number",
+                "description": "Maximum number of results (default: 10)",
+                "default": 10,
+            },
+        },
+        "required": ["world_directory", "query"],
+    },
+)
+
+
 # Image Generation Tools
 GENERATE_IMAGE_FROM_MARKDOWN_FILE_SCHEMA = types.Tool(
     name="generate_image_from_markdown_file",
@@ -283,6 +337,11 @@ GENERATE_IMAGE_FROM_MARKDOWN_FILE_SCHEMA = types.Tool(
                 "enum": ["1:1", "16:9", "9:16", "3:4", "4:3"],
                 "default": "1:1",
             },
+            "regenerate": {
+                "type": "boolean",
+                "description": "Generate a new image even if this prompt and aspect ratio were generated before (default: reuse the cached image)",
+                "default": False,
+            },
         },
         "required": ["filepath"],
     },
@@ -308,6 +367,56 @@ GENERATE_IMAGE_PROMPT_FOR_ENTRY_SCHEMA = types.Tool(
     },
 )
 
+GENERATE_IMAGES_BATCH_SCHEMA = types.Tool(
+    name="generate_images_batch",
+    description="Generate images for every entry in a world (or taxonomy) that has an image_prompt in its frontmatter but no image yet, using a bounded pool of concurrent FAL requests. Safe to re-run: finished images are skipped and interrupted ones are redone.",
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "world_directory": {
+                "type": "string",
+                "description": "Path to the world directory",
+            },
+            "taxonomy": {
+                "type": "string",
+                "description": "Only generate images for entries in this taxonomy",
+            },
+            "pattern": {
+                "type": "string",
+                "description": "Glob matched against 'taxonomy/slug' or the slug, e.g. 'characters/*' or 'mira-*'",
+            },
+            "style": {
+                "type": "string",
+                "description": "Art style used when the world has no stored visual style (default: fantasy illustration)",
+                "default": "fantasy illustration",
+            },
+            "aspect_ratio": {
+                "type": "string",
+                "description": "Aspect ratio for the generated images",
+                "enum": ["1:1", "16:9", "9:16", "3:4", "4:3"],
+                "default": "1:1",
+            },
+            "limit": {
+                "type": "number",
+                "description": "Maximum number of images to generate in this run (default: no limit)",
+            },
+            "max_concurrency": {
+                "type": "number",
+                "description": "Maximum number of concurrent generations (default: 4)",
+            },
+            "requests_per_minute": {
+                "type": "number",
+                "description": "Maximum FAL requests started per minute (default: 30, 0 for no limit)",
+            },
+            "max_retries": {
+                "type": "number",
+                "description": "Retries of a throttled or failed request per image, with backoff (default: 3)",
+            },
+        },
+        "required": ["world_directory"],
+    },
+)
+
 
 # Site Generation Tools
 BUILD_STATIC_SITE_SCHEMA = types.Tool(
@@ -331,6 +440,11 @@ BUILD_STATIC_SITE_SCHEMA = types.Tool(
                 "description": "Directory name within the world folder to output built files (default: site)",
                 "default": "site",
             },
+            "incremental": {
+                "type": "boolean",
+                "description": "Rebuild only the pages whose content or cross-links changed since the last build and update the existing site in place (falls back to a full build when needed)",
+                "default": False,
+            },
         },
         "required": ["world_directory"],
     },
@@ -354,11 +468,13 @@ ENTRY_TOOLS = [
     GENERATE_ENTRY_DESCRIPTIONS_SCHEMA,
     ADD_ENTRY_FRONTMATTER_SCHEMA,
     ANALYZE_WORLD_CONSISTENCY_SCHEMA,
+    SEARCH_WORLD_SCHEMA,
 ]
 
 IMAGE_TOOLS = [
     GENERATE_IMAGE_FROM_MARKDOWN_FILE_SCHEMA,
     GENERATE_IMAGE_PROMPT_FOR_ENTRY_SCHEMA,
+    GENERATE_IMAGES_BATCH_SCHEMA,
 ]
 
 SITE_TOOLS = [
@@ -0,0 +1,441 @@
+"""Build manifest for incremental static site builds.
+
+The manifest lives in ``metadata/build.json`` and records a content hash for
+every world source file, a dependency hash for every page of the site, a
+signature of the Astro templates, and a hash of every file published to the
+site directory. An incremental build compares the current world against it
+to find the pages whose sources or cross-links changed, renders only those,
+and patches the existing site in place.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from ..config import (
+    BUILD_MANIFEST_FILENAME,
+    BUILD_MANIFEST_VERSION,
+    CONTENT_SYMLINK_DIRS,
+    IMAGE_EXTENSION,
+    MARKDOWN_EXTENSION,
+    METADATA_DIRECTORY,
+    SITE_TEMPLATE_PATHS,
+    TAXONOMY_OVERVIEW_SUFFIX,
+)
+from .content_parsing import extract_markdown_title
+from .image_renditions import read_image_manifest
+from .world_cache import get_cached_entries, read_world_file
+
+# Site files that are published separately from the Astro output
+SITE_IMAGES_DIRECTORY = "images"
+
+# Site-relative paths that built pages load through href and src attributes
+SITE_REFERENCE_PATTERN = re.compile(r'(?:href|src)="/([^"?#]+)')
+
+
+def plan_site_build(
+    world_path: Path,
+    script_dir: Path,
+    site_path: Path,
+    link_manifest: Dict[str, Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Work out which pages of a world's site need to be rendered.
+
+    A full build is planned when there is no previous manifest or site, or
+    when the Astro templates changed. Otherwise only pages whose dependency
+    hash changed, or whose output is missing from the site, are selected.
+
+    Args:
+        world_path: Path to the world directory
+        script_dir: Path to the project root directory (Astro project)
+        site_path: Path to the world's built site
+        link_manifest: Current cross-link manifest entries keyed by ``taxonomy/slug``
+
+    Returns:
+        Build plan with ``full``, ``reason``, the ``pages`` to render, the
+        ``removed`` pages to delete, and the manifest ``state`` to record
+    """
+    stored = _read_manifest(world_path)
+    sources = _hash_sources(world_path, stored.get("sources", {}))
+    pages = _page_dependencies(world_path, sources, link_manifest)
+    state = {
+        "template": _template_signature(script_dir),
+        "sources": sources,
+        "pages": pages,
+        "outputs": stored.get("outputs", {}),
+        "references": stored.get("references", {}),
+    }
+
+    if not stored:
+        reason = "no previous build manifest"
+    elif stored.get("template") != state["template"]:
+        reason = "site templates changed"
+    elif not site_path.exists():
+        reason = "no existing site"
+    else:
+        stored_pages = stored.get("pages", {})
+        changed = [
+            route
+            for route, dependency_hash in pages.items()
+            if stored_pages.get(route) != dependency_hash
+            or not (site_path / get_route_output(route)).exists()
+        ]
+        removed = [route for route in stored_pages if route not in pages]
+        return {
+            "full": False,
+            "reason": f"{len(changed)} changed and {len(removed)} removed pages",
+            "pages": sorted(changed),
+            "removed": sorted(removed),
+            "state": state,
+        }
+
+    return {
+        "full": True,
+        "reason": reason,
+        "pages": sorted(pages),
+        "removed": [],
+        "state": state,
+    }
+
+
+def publish_site_outputs(dist_path: Path, site_path: Path, plan: Dict[str, Any]) -> int:
+    """Patch an existing site with the output of a partial build.
+
+    Output files whose hash matches the manifest are left untouched, and the
+    pages of removed routes are deleted. Other files of earlier builds that
+    neither this build nor any remaining page references, such as the
+    stylesheets of pages that now load different ones, are deleted too.
+
+    Args:
+        dist_path: Path to the Astro build output
+        site_path: Path to the world's built site
+        plan: Build plan from ``plan_site_build``; its recorded outputs are updated
+
+    Returns:
+        Number of site files written or removed
+    """
+    outputs = dict(plan["state"]["outputs"])
+    references = dict(plan["state"]["references"])
+    updated = 0
+
+    for route in plan["removed"]:
+        output = get_route_output(route)
+        target = site_path / output
+        if target.exists():
+            target.unlink()
+            updated += 1
+        outputs.pop(output, None)
+        references.pop(output, None)
+
+    built = _hash_output_files(dist_path)
+    references.update(_page_references(dist_path, built, outputs.keys() | built))
+    for output, digest in built.items():
+        target = site_path / output
+        if outputs.get(output) == digest and target.exists():
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(dist_path / output, target)
+        outputs[output] = digest
+        updated += 1
+
+    current = {get_route_output(route) for route in plan["state"]["pages"]}
+    current.update(built)
+    for page_references in references.values():
+        current.update(page_references)
+    for output in [output for output in outputs if output not in current]:
+        target = site_path / output
+        if target.exists():
+            target.unlink()
+            updated += 1
+        outputs.pop(output)
+        references.pop(output, None)
+
+    plan["state"]["outputs"] = outputs
+    plan["state"]["references"] = references
+    return updated
+
+
+def record_site_outputs(site_path: Path, plan: Dict[str, Any]) -> None:
+    """Record the hashes of every file of a fully built site.
+
+    Args:
+        site_path: Path to the world's built site
+        plan: Build plan from ``plan_site_build``; its recorded outputs are replaced
+    """
+    outputs = _hash_output_files(site_path)
+    plan["state"]["outputs"] = outputs
+    plan["state"]["references"] = _page_references(site_path, outputs, outputs.keys())
+
+
+def save_build_manifest(world_path: Path, plan: Dict[str, Any]) -> None:
+    """Write the manifest state of a successful build to ``metadata/``.
+
+    Args:
+        world_path: Path to the world directory
+        plan: Build plan from ``plan_site_build``
+    """
+    manifest_path = world_path / METADATA_DIRECTORY / BUILD_MANIFEST_FILENAME
+    try:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = manifest_path.with_name(f".{manifest_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": BUILD_MANIFEST_VERSION, **plan["state"]}, f)
+        os.replace(temp_path, manifest_path)
+    except OSError:
+        # Without a manifest the next incremental build is a full build
+        pass
+
+
+def get_route_output(route: str) -> str:
+    """Get the site file Astro writes for a page route.
+
+    Args:
+        route: Page route without leading or trailing slashes
+
+    Returns:
+        Relative path of the page's HTML file
+    """
+    return f"{route}/index.html" if route else "index.html"
+
+
+def _page_dependencies(
+    world_path: Path,
+    sources: Dict[str, Dict[str, Any]],
+    link_manifest: Dict[str, Dict[str, Any]],
+) -> Dict[str, str]:
+    """Hash the inputs of every page the Astro templates generate.
+
+    Only the listing pages (home, world, taxonomy and gallery pages) depend
+    on every taxonomy and entry; an entry page depends on the world title
+    and the titles of the other entries of its taxonomy. On top of that each
+    page depends on the sources it renders and the image renditions it
+    shows, and entry pages on their links, backlinks and whether they have
+    an image.
+    """
+    overview_suffix = f"{TAXONOMY_OVERVIEW_SUFFIX}{MARKDOWN_EXTENSION}"
+    taxonomy_files = {
+        relative_path[len("taxonomies/") : -len(overview_suffix)]: relative_path
+        for relative_path in sources
+        if relative_path.startswith("taxonomies/")
+        and relative_path.endswith(overview_suffix)
+    }
+    records = get_cached_entries(world_path)
+    images = read_image_manifest(world_path)
+    overview_renditions = [
+        [key, record.get("renditions")]
+        for key, record in sorted(images.items())
+        if key.startswith("world-overview")
+    ]
+    world_title = read_world_file(
+        world_path, "overview/world-overview.md", extract_markdown_title
+    )
+
+    # Pages listing every taxonomy and entry, shown by slug and stub flag
+    listing = _digest(
+        {
+            "title": world_title,
+            "taxonomies": sorted(taxonomy_files),
+            "entries": [
+                [record["taxonomy"], record["slug"], _is_stub(record)]
+                for record in records
+            ],
+        }
+    )
+    overview_hash = sources.get("overview/world-overview.md", {}).get("hash")
+
+    # Entry pages link to the other entries of their taxonomy by title
+    siblings: Dict[str, List[List[Any]]] = {}
+    for record in records:
+        siblings.setdefault(record["taxonomy"], []).append(
+            [record["slug"], record["title"], _is_stub(record)]
+        )
+    navigation = {
+        taxonomy: _digest([world_title, entries])
+        for taxonomy, entries in siblings.items()
+    }
+
+    pages = {
+        "": _digest(
+            [
+                listing,
+                overview_hash,
+                [sources[path]["hash"] for path in sorted(taxonomy_files.values())],
+                overview_renditions,
+            ]
+        ),
+        "world": _digest([listing, overview_hash]),
+        "gallery": _digest([listing, _image_listing(world_path), images]),
+    }
+    for taxonomy, relative_path in taxonomy_files.items():
+        pages[f"taxonomies/{taxonomy}"] = _digest(
+            [listing, sources[relative_path]["hash"]]
+        )
+    for record in records:
+        key = f"{record['taxonomy']}/{record['slug']}"
+        links = link_manifest.get(key, {})
+        image = images.get(f"{key}{IMAGE_EXTENSION}", {})
+        pages[f"taxonomies/{record['taxonomy']}/entries/{record['slug']}"] = _digest(
+            [
+                navigation[record["taxonomy"]],
+                sources.get(record["file"], {}).get("hash"),
+                links.get("links", []),
+                links.get("backlinks", []),
+                image.get("renditions"),
+                (world_path / "images" / f"{key}{IMAGE_EXTENSION}").exists(),
+            ]
+        )
+    return pages
+
+
+def _is_stub(record: Dict[str, Any]) -> bool:
+    """Check whether an entry record is a stub, as the world manifest does."""
+    return record["frontmatter"].get("article_type") == "stub"
+
+
+def _hash_sources(
+    world_path: Path, previous: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """Hash every markdown source, reusing hashes of files whose stat is unchanged."""
+    sources = {}
+    for directory in CONTENT_SYMLINK_DIRS:
+        source_dir = world_path / directory
+        if not source_dir.exists():
+            continue
+        for source_file in sorted(source_dir.rglob(f"*{MARKDOWN_EXTENSION}")):
+            try:
+                stat = source_file.stat()
+            except OSError:
+                continue
+            relative_path = source_file.relative_to(world_path).as_posix()
+            record = previous.get(relative_path)
+            if not (
+                record
+                and record.get("mtime") == stat.st_mtime_ns
+                and record.get("size") == stat.st_size
+            ):
+                try:
+                    record = {
+                        "mtime": stat.st_mtime_ns,
+                        "size": stat.st_size,
+                        "hash": _hash_file(source_file),
+                    }
+                except OSError:
+                    continue
+            sources[relative_path] = record
+    return sources
+
+
+def _image_listing(world_path: Path) -> List[List[Any]]:
+    """List the world's images with their size and mtime for the gallery page."""
+    images_path = world_path / "images"
+    if not images_path.exists():
+        return []
+
+    listing = []
+    for image_file in sorted(images_path.rglob("*")):
+        if image_file.is_file():
+            stat = image_file.stat()
+            listing.append(
+                [
+                    image_file.relative_to(images_path).as_posix(),
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                ]
+            )
+    return listing
+
+
+def _template_signature(script_dir: Path) -> str:
+    """Fingerprint the Astro project files that shape every page.
+
+    Symlinked world content is skipped; it is tracked through the sources.
+    """
+    entries = []
+    for template_path in SITE_TEMPLATE_PATHS:
+        path = script_dir / template_path
+        if path.is_file():
+            files = [path]
+        elif path.is_dir():
+            files = [
+                Path(root) / name
+                for root, _, names in os.walk(path)
+                for name in names
+                if not (Path(root) / name).is_symlink()
+            ]
+        else:
+            continue
+        for template_file in sorted(files):
+            stat = template_file.stat()
+            entries.append(
+                [
+                    template_file.relative_to(script_dir).as_posix(),
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                ]
+            )
+    return _digest(entries)
+
+
+def _hash_output_files(root: Path) -> Dict[str, str]:
+    """Hash every built file below a directory, except published images."""
+    outputs = {}
+    if not root.exists():
+        return outputs
+    for output_file in sorted(root.rglob("*")):
+        relative_path = output_file.relative_to(root).as_posix()
+        if output_file.is_file() and not relative_path.startswith(
+            f"{SITE_IMAGES_DIRECTORY}/"
+        ):
+            outputs[relative_path] = _hash_file(output_file)
+    return outputs
+
+
+def _page_references(
+    root: Path, outputs: Dict[str, str], known: Iterable[str]
+) -> Dict[str, List[str]]:
+    """List the known site files each built page below a directory references."""
+    known = set(known)
+    references = {}
+    for output in outputs:
+        if not output.endswith(".html"):
+            continue
+        try:
+            content = (root / output).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+        references[output] = sorted(
+            {path for path in SITE_REFERENCE_PATTERN.findall(content) if path in known}
+        )
+    return references
+
+
+def _hash_file(path: Path) -> str:
+    """Hash a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _digest(value: Any) -> str:
+    """Hash a JSON-serializable value."""
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _read_manifest(world_path: Path) -> Dict[str, Any]:
+    """Read the stored manifest, treating missing or outdated files as empty."""
+    manifest_path = world_path / METADATA_DIRECTORY / BUILD_MANIFEST_FILENAME
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get("version") != BUILD_MANIFEST_VERSION:
+        return {}
+    return data
@@ -0,0 +1,211 @@
+"""Chunked, incremental consistency review of a whole world.
+
+The world is partitioned into chunks that fit a token budget. Entries that
+link to each other (directly or through other entries) are kept together,
+in breadth-first order so neighbours stay in the same chunk, and entries
+without links are grouped by taxonomy. The review state in
+``metadata/consistency_sweep.json`` records the content hash each entry was
+reviewed at, so a sweep only hands out chunks with entries that are new or
+changed since their last review.
+
+A chunk counts as reviewed once the next chunk is requested. Its entries are
+recorded at their content at that point, so edits made while reviewing it
+do not send it back for review.
+"""
+
+import hashlib
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from ..config import (
+    CHARS_PER_TOKEN,
+    CONSISTENCY_SWEEP_FILENAME,
+    CONSISTENCY_SWEEP_VERSION,
+    METADATA_DIRECTORY,
+)
+from .link_manifest import update_link_manifest
+from .world_cache import get_cached_entries
+
+
+def plan_sweep(world_path: Path, token_budget: int) -> Dict[str, Any]:
+    """Confirm the last chunk handed out and pick the next one to review.
+
+    Args:
+        world_path: Path to the world directory
+        token_budget: Approximate token size limit of a chunk
+
+    Returns:
+        Dictionary with ``chunk`` (list of entry records, or None when the
+        sweep is complete), its 1-based ``number`` among ``total`` chunks, and
+        the number of ``pending`` chunks including this one
+    """
+    records = get_cached_entries(world_path)
+    records_by_file = {record["file"]: record for record in records}
+    state = _read_state(world_path)
+    reviewed = state["entries"]
+
+    # The chunk handed out last time has been reviewed by now
+    for file in state.get("in_review", []):
+        if file in records_by_file:
+            reviewed[file] = _review_record(world_path, records_by_file[file])
+
+    chunks = _partition(world_path, records, token_budget)
+    pending = [
+        index
+        for index, chunk in enumerate(chunks)
+        if any(not _is_reviewed(world_path, record, reviewed) for record in chunk)
+    ]
+
+    # Forget entries that no longer exist
+    state["entries"] = {
+        file: record for file, record in reviewed.items() if file in records_by_file
+    }
+    chunk = chunks[pending[0]] if pending else None
+    state["in_review"] = [record["file"] for record in chunk] if chunk else []
+    _write_state(world_path, state)
+
+    return {
+        "chunk": chunk,
+        "number": pending[0] + 1 if pending else 0,
+        "total": len(chunks),
+        "pending": len(pending),
+    }
+
+
+def get_sweep_state_path(world_path: Path) -> Path:
+    """Get the path of the consistency sweep state for a world.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        Path to ``metadata/consistency_sweep.json``
+    """
+    return world_path / METADATA_DIRECTORY / CONSISTENCY_SWEEP_FILENAME
+
+
+def _partition(
+    world_path: Path, records: List[Dict[str, Any]], token_budget: int
+) -> List[List[Dict[str, Any]]]:
+    """Split the entries into chunks of linked neighbourhoods within the budget."""
+    records_by_key = {
+        f"{record['taxonomy']}/{record['slug']}": record for record in records
+    }
+    neighbours: Dict[str, Set[str]] = {key: set() for key in records_by_key}
+    for key, entry in update_link_manifest(world_path).items():
+        for link in entry["links"]:
+            target = f"{link['taxonomy']}/{link['slug']}"
+            if key in neighbours and target in neighbours and target != key:
+                neighbours[key].add(target)
+                neighbours[target].add(key)
+
+    # Linked entries in breadth-first order, component by component
+    ordered: List[str] = []
+    unlinked: List[str] = []
+    visited: Set[str] = set()
+    for start in sorted(neighbours):
+        if start in visited:
+            continue
+        if not neighbours[start]:
+            unlinked.append(start)
+            continue
+        queue = deque([start])
+        visited.add(start)
+        while queue:
+            key = queue.popleft()
+            ordered.append(key)
+            for neighbour in sorted(neighbours[key] - visited):
+                visited.add(neighbour)
+                queue.append(neighbour)
+
+    chunks: List[List[Dict[str, Any]]] = []
+    chunk: List[Dict[str, Any]] = []
+    chunk_tokens = 0
+    previous_taxonomy = None
+    sequence = [(key, None) for key in ordered] + [
+        (key, records_by_key[key]["taxonomy"]) for key in unlinked
+    ]
+    for key, taxonomy in sequence:
+        record = records_by_key[key]
+        tokens = record["size"] // CHARS_PER_TOKEN + 1
+        starts_taxonomy = taxonomy is not None and taxonomy != previous_taxonomy
+        if chunk and (chunk_tokens + tokens > token_budget or starts_taxonomy):
+            chunks.append(chunk)
+            chunk, chunk_tokens = [], 0
+        chunk.append(record)
+        chunk_tokens += tokens
+        previous_taxonomy = taxonomy
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _is_reviewed(
+    world_path: Path, record: Dict[str, Any], reviewed: Dict[str, Dict[str, Any]]
+) -> bool:
+    """Check whether an entry was reviewed at its current content."""
+    previous = reviewed.get(record["file"])
+    if previous is None:
+        return False
+    stamp = (record["mtime"], record["size"])
+    if (previous.get("mtime"), previous.get("size")) == stamp:
+        return True
+    current = _review_record(world_path, record)
+    if current["hash"] != previous.get("hash"):
+        return False
+    # Touched but unchanged: remember the new stamp to skip hashing next time
+    reviewed[record["file"]] = current
+    return True
+
+
+def _review_record(world_path: Path, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Describe an entry's current content for the review state."""
+    return {
+        "hash": _content_hash(world_path / record["file"]),
+        "mtime": record["mtime"],
+        "size": record["size"],
+    }
+
+
+def _content_hash(file_path: Path) -> Optional[str]:
+    """Hash a file's content, or None if it cannot be read."""
+    try:
+        with open(file_path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _read_state(world_path: Path) -> Dict[str, Any]:
+    """Read the sweep state, treating missing or outdated files as empty."""
+    empty: Dict[str, Any] = {"entries": {}, "in_review": []}
+    try:
+        with open(get_sweep_state_path(world_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return empty
+
+    if not isinstance(data, dict) or data.get("version") != CONSISTENCY_SWEEP_VERSION:
+        return empty
+    if not isinstance(data.get("entries"), dict):
+        return empty
+    if not isinstance(data.get("in_review"), list):
+        data["in_review"] = []
+    return data
+
+
+def _write_state(world_path: Path, state: Dict[str, Any]) -> None:
+    """Write the sweep state through a temporary file."""
+    state_path = get_sweep_state_path(world_path)
+    try:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = state_path.with_name(f".{state_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({**state, "version": CONSISTENCY_SWEEP_VERSION}, f)
+        os.replace(temp_path, state_path)
+    except OSError:
+        # Without saved state the sweep hands out the same chunk again
+        pass
@@ -6,7 +6,9 @@ metadata, and analyzing text for worldbuilding purposes.
 
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import FRONTMATTER_MAX_CHARS
 
 
 def extract_markdown_title(content: str) -> Optional[str]:
@@ -73,15 +75,64 @@ def extract_frontmatter(content: str) -> Tuple[Dict[str, str], str]:
             if line.strip() == "---":
                 content_start = i + 1
                 break
-            elif ":" in line:
-                # Parse simple key: value pairs
-                key, value = line.split(":", 1)
-                frontmatter[key.strip()] = value.strip().strip("\"'")
+            _parse_frontmatter_line(line, frontmatter)
 
     remaining_content = "\n".join(lines[content_start:])
     return frontmatter, remaining_content
 
 
+def read_frontmatter(
+    file_path: Path, body_chars: int = 0
+) -> Tuple[Dict[str, str], str]:
+    """Read the YAML frontmatter of a markdown file without reading its body.
+
+    The file is read line by line up to the closing delimiter, giving up
+    after ``FRONTMATTER_MAX_CHARS``, so the cost does not grow with the
+    length of the entry. Parsing matches ``extract_frontmatter``.
+
+    Args:
+        file_path: Path to the markdown file
+        body_chars: Number of characters of the body to return as well
+
+    Returns:
+        Tuple of (frontmatter_dict, start of the content without frontmatter)
+
+    Raises:
+        OSError: If the file cannot be read
+        UnicodeDecodeError: If the file is not UTF-8
+    """
+    frontmatter: Dict[str, str] = {}
+    with open(file_path, "r", encoding="utf-8") as f:
+        first_line = f.readline(FRONTMATTER_MAX_CHARS)
+        if first_line.strip() != "---":
+            head = first_line + f.read(max(body_chars - len(first_line), 0))
+            return frontmatter, head[:body_chars]
+
+        consumed = len(first_line)
+        while consumed < FRONTMATTER_MAX_CHARS:
+            line = f.readline(FRONTMATTER_MAX_CHARS - consumed)
+            consumed += len(line)
+            if not line or (
+                not line.endswith("\n") and consumed >= FRONTMATTER_MAX_CHARS
+            ):
+                break
+            if line.strip() == "---":
+                return frontmatter, f.read(body_chars)
+            _parse_frontmatter_line(line, frontmatter)
+
+        # Without a closing delimiter the whole file is content, as in
+        # extract_frontmatter
+        f.seek(0)
+        return frontmatter, f.read(body_chars)
+
+
+def _parse_frontmatter_line(line: str, frontmatter: Dict[str, str]) -> None:
+    """Parse a simple ``key: value`` frontmatter line into a dictionary."""
+    if ":" in line:
+        key, value = line.split(":", 1)
+        frontmatter[key.strip()] = value.strip().strip("\"'")
+
+
 def extract_taxonomy_description(content: str) -> Optional[str]:
     """Extract the description section from a taxonomy overview.
 
@@ -107,149 +158,6 @@ def extract_taxonomy_description(content: str) -> Optional[str]:
     return " ".join(description_lines) if description_lines else None
 
 
-def find_potential_references(content: str) -> List[str]:
-    """Find potential entity references in content.
-
-    This is a simple heuristic that looks for capitalized words/phrases
-    that might be proper nouns or entity names.
-
-    Args:
-        content: Text content to analyze
-
-    Returns:
-        List of potential entity references
-    """
-    # Remove markdown formatting
-    text = re.sub(r"[#*_`]", "", content)
-
-    # Find capitalized words/phrases
-    # Look for sequences of capitalized words
-    potential_refs = re.findall(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b", text)
-
-    # Filter out common words and short single words
-    common_words = {
-        "The",
-        "This",
-        "That",
-        "These",
-        "Those",
-        "And",
-        "But",
-        "Or",
-        "For",
-        "In",
-        "On",
-        "At",
-        "To",
-        "From",
-        "With",
-        "By",
-        "As",
-        "Of",
-        "About",
-        "Through",
-        "During",
-        "Before",
-        "After",
-        "Above",
-        "Below",
-        "Up",
-        "Down",
-        "Out",
-        "Off",
-        "Over",
-        "Under",
-        "Again",
-        "Further",
-        "Then",
-        "Once",
-        "Here",
-        "There",
-        "When",
-        "Where",
-        "Why",
-        "How",
-        "All",
-        "Any",
-        "Both",
-        "Each",
-        "Few",
-        "More",
-        "Most",
-        "Other",
-        "Some",
-        "Such",
-        "No",
-        "Nor",
-        "Not",
-        "Only",
-        "Own",
-        "Same",
-        "So",
-        "Than",
-        "Too",
-        "Very",
-        "Can",
-        "Will",
-        "Just",
-        "Should",
-        "Now",
-        "Entry",
-        "Overview",
-        "Description",
-        "History",
-        "Context",
-        "Relationships",
-        "Impact",
-        "Required",
-        "Optional",
-    }
-
-    filtered_refs = []
-    for ref in potential_refs:
-        # Skip single short words and common words
-        if len(ref) > 3 and ref not in common_words:
-            # Skip if it's just a single common word
-            words = ref.split()
-            if len(words) == 1 and ref in common_words:
-                continue
-            filtered_refs.append(ref)
-
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_refs = []
-    for ref in filtered_refs:
-        if ref not in seen:
-            seen.add(ref)
-            unique_refs.append(ref)
-
-    return unique_refs
-
-
-def analyze_content_complexity(content: str) -> Dict[str, int]:
-    """Analyze the complexity and structure of content.
-
-    Args:
-        content: Text content to analyze
-
-    Returns:
-        Dictionary with complexity metrics
-    """
-    lines = content.split("\n")
-
-    metrics = {
-        "word_count": len(content.split()),
-        "line_count": len([line for line in lines if line.strip()]),
-        "paragraph_count": len(
-            [line for line in lines if line.strip() and not line.startswith("#")]
-        ),
-        "header_count": len([line for line in lines if line.startswith("#")]),
-        "potential_references": len(find_potential_references(content)),
-    }
-
-    return metrics
-
-
 def extract_section_content(content: str, section_title: str) -> Optional[str]:
     """Extract content from a specific markdown section.
 
@@ -327,59 +235,118 @@ def add_frontmatter_to_content(content: str, frontmatter: Dict[str, str]) -> str
     # Check if content already has frontmatter
     existing_frontmatter, main_content = extract_frontmatter(content)
 
-    # Filter out None values and empty strings to avoid null in YAML
-    filtered_frontmatter = {
-        k: v for k, v in frontmatter.items() if v is not None and v != ""
+    # Merge frontmatter, with new values taking precedence
+    merged_frontmatter = {
+        **existing_frontmatter,
+        **_filter_frontmatter_values(frontmatter),
     }
 
-    # Merge frontmatter, with new values taking precedence
-    merged_frontmatter = {**existing_frontmatter, **filtered_frontmatter}
+    # Combine frontmatter with content
+    return format_frontmatter(merged_frontmatter) + "\n\n" + main_content
+
+
+def patch_frontmatter(content: str, updates: Dict[str, str]) -> str:
+    """Set frontmatter keys of markdown content, leaving everything else as is.
+
+    Only the lines of keys whose value changes are rewritten and new keys are
+    added at the end of the block, so the other keys and the body keep their
+    exact text. Content without a frontmatter block gets one, as with
+    ``add_frontmatter_to_content``.
+
+    Args:
+        content: Existing markdown content
+        updates: Dictionary of frontmatter key-value pairs to set
+
+    Returns:
+        Content with the updated frontmatter, identical to ``content`` if no
+        value changed
+    """
+    updates = _filter_frontmatter_values(updates)
+    lines = content.split("\n")
+    if not lines or lines[0].strip() != "---":
+        return add_frontmatter_to_content(content, updates)
+
+    pending = dict(updates)
+    for i, line in enumerate(lines[1:], 1):
+        if line.strip() == "---":
+            new_lines = [
+                _format_frontmatter_line(key, value) for key, value in pending.items()
+            ]
+            lines[i:i] = new_lines
+            return "\n".join(lines)
+        if ":" not in line:
+            continue
+
+        key, value = line.split(":", 1)
+        key = key.strip()
+        if key in updates:
+            pending.pop(key, None)
+            formatted = _format_frontmatter_line(key, updates[key])
+            if value.strip().strip("\"'") != str(updates[key]) and line != formatted:
+                lines[i] = formatted
 
-    # Build frontmatter block
+    # Unterminated block: rebuild it like add_frontmatter_to_content
+    return add_frontmatter_to_content(content, updates)
+
+
+def format_frontmatter(frontmatter: Dict[str, str]) -> str:
+    """Format a YAML frontmatter block, without a trailing newline.
+
+    Args:
+        frontmatter: Dictionary of frontmatter key-value pairs
+
+    Returns:
+        Block from the opening to the closing ``---`` delimiter
+    """
     frontmatter_lines = ["---"]
-    for key, value in merged_frontmatter.items():
-        # Properly escape YAML values
-        if isinstance(value, str):
-            # Check if value needs quoting (contains special YAML characters)
-            needs_quoting = any(
-                char in value
-                for char in [
-                    '"',
-                    "'",
-                    ":",
-                    "\n",
-                    "\r",
-                    "\t",
-                    "#",
-                    "&",
-                    "*",
-                    "!",
-                    "|",
-                    ">",
-                    "%",
-                    "@",
-                    "`",
-                    "[",
-                    "]",
-                    "{",
-                    "}",
-                ]
-            )
-
-            if (
-                needs_quoting or value.strip() != value
-            ):  # Also quote if has leading/trailing whitespace
-                # Use double quotes and escape internal double quotes
-                escaped_value = value.replace("\\", "\\\\").replace('"', '\\"')
-                frontmatter_lines.append(f'{key}: "{escaped_value}"')
-            else:
-                frontmatter_lines.append(f"{key}: {value}")
-        else:
-            frontmatter_lines.append(f"{key}: {value}")
+    for key, value in frontmatter.items():
+        frontmatter_lines.append(_format_frontmatter_line(key, value))
     frontmatter_lines.append("---")
+    return "\n".join(frontmatter_lines)
+
+
+def _filter_frontmatter_values(frontmatter: Dict[str, str]) -> Dict[str, str]:
+    """Drop None values and empty strings to avoid null in YAML."""
+    return {k: v for k, v in frontmatter.items() if v is not None and v != ""}
+
+
+def _format_frontmatter_line(key: str, value: Any) -> str:
+    """Format one ``key: value`` frontmatter line, quoting values as needed."""
+    # Properly escape YAML values
+    if isinstance(value, str):
+        # Check if value needs quoting (contains special YAML characters)
+        needs_quoting = any(
+            char in value
+            for char in [
+                '"',
+                "'",
+                ":",
+                "\n",
+                "\r",
+                "\t",
+                "#",
+                "&",
+                "*",
+                "!",
+                "|",
+                ">",
+                "%",
+                "@",
+                "`",
+                "[",
+                "]",
+                "{",
+                "}",
+            ]
+        )
 
-    # Combine frontmatter with content
-    return "\n".join(frontmatter_lines) + "\n\n" + main_content
+        if (
+            needs_quoting or value.strip() != value
+        ):  # Also quote if has leading/trailing whitespace
+            # Use double quotes and escape internal double quotes
+            escaped_value = value.replace("\\", "\\\\").replace('"', '\\"')
+            return f'{key}: "{escaped_value}"'
+    return f"{key}: {value}"
 
 
 def extract_description_from_content(content: str, max_words: int = 100) -> str:
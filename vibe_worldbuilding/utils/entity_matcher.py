@@ -0,0 +1,305 @@
+"""Known-entity matching for world content.
+
+Builds an Aho-Corasick automaton from every entry title and alias in a world
+so that all mentions of existing entries can be found in a single linear pass
+over a text. The compiled automaton is persisted in
+``metadata/entity_matcher.json`` and reused until the set of entry names
+changes.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import (
+    ENTITY_MATCHER_FILENAME,
+    ENTITY_MATCHER_VERSION,
+    METADATA_DIRECTORY,
+    MIN_ENTITY_NAME_LENGTH,
+    WORLD_CACHE_MAX_WORLDS,
+)
+from .world_cache import get_cached_entries
+
+# Most recently used matchers, keyed by world path
+_matchers: "OrderedDict[str, EntityMatcher]" = OrderedDict()
+
+
+class EntityMatcher:
+    """Aho-Corasick automaton over the entry names of a world.
+
+    Matching ignores case except for the first letter of a mention, which
+    must be a capital, so entries named by common words ("Magic", "Fire") are
+    not found in lowercase prose. Only mentions that start and end on word
+    boundaries are reported. Overlapping mentions are resolved leftmost-longest,
+    so "Iron Guild Hall" wins over "Iron Guild" when both are entries.
+    """
+
+    def __init__(self, patterns: Dict[str, List[Dict[str, str]]], signature: str = ""):
+        """Compile an automaton from normalized names.
+
+        Args:
+            patterns: Mapping of lowercased entity names to the entries they name
+            signature: Hash of the entry names the patterns were built from
+        """
+        self.signature = signature
+        self.patterns: List[str] = sorted(patterns)
+        self.targets: List[List[Dict[str, str]]] = [
+            patterns[pattern] for pattern in self.patterns
+        ]
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[int]] = [[]]
+        self._compile()
+
+    def find_mentions(self, text: str) -> List[Dict[str, Any]]:
+        """Find every known-entity mention in a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List of mentions in text order, each with the matched text, its
+            start and end offsets, and the entries it refers to
+        """
+        candidates = []
+        state = 0
+        for position, char in enumerate(text):
+            char = _fold(char)
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for pattern_id in self.output[state]:
+                start = position + 1 - len(self.patterns[pattern_id])
+                if _is_capitalized(text, start) and _is_word_boundary(
+                    text, start, position + 1
+                ):
+                    candidates.append((start, position + 1, pattern_id))
+
+        # Keep leftmost-longest, non-overlapping mentions
+        candidates.sort(key=lambda match: (match[0], -match[1]))
+        mentions = []
+        last_end = 0
+        for start, end, pattern_id in candidates:
+            if start < last_end:
+                continue
+            mentions.append(
+                {
+                    "text": text[start:end],
+                    "start": start,
+                    "end": end,
+                    "entries": self.targets[pattern_id],
+                }
+            )
+            last_end = end
+        return mentions
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the compiled automaton for the on-disk cache."""
+        return {
+            "version": ENTITY_MATCHER_VERSION,
+            "signature": self.signature,
+            "patterns": self.patterns,
+            "targets": self.targets,
+            "goto": self.goto,
+            "fail": self.fail,
+            "output": self.output,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EntityMatcher":
+        """Restore a compiled automaton without rebuilding it."""
+        matcher = cls.__new__(cls)
+        matcher.signature = data["signature"]
+        matcher.patterns = data["patterns"]
+        matcher.targets = data["targets"]
+        matcher.goto = data["goto"]
+        matcher.fail = data["fail"]
+        matcher.output = data["output"]
+        return matcher
+
+    def _compile(self) -> None:
+        """Build the trie, failure links and merged outputs."""
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(pattern_id)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = (
+                    self.output[next_state] + self.output[self.fail[next_state]]
+                )
+
+
+def get_entity_matcher(world_path: Path) -> EntityMatcher:
+    """Get the entity matcher for a world, rebuilding it only when names change.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        Compiled matcher over every entry title and alias in the world
+    """
+    patterns = _collect_patterns(world_path)
+    signature = _patterns_signature(patterns)
+    key = str(world_path.resolve())
+
+    matcher = _matchers.get(key)
+    if matcher is None or matcher.signature != signature:
+        matcher = _load_matcher(world_path, signature)
+        if matcher is None:
+            matcher = EntityMatcher(patterns, signature)
+            _save_matcher(world_path, matcher)
+
+    _matchers[key] = matcher
+    _matchers.move_to_end(key)
+    while len(_matchers) > WORLD_CACHE_MAX_WORLDS:
+        _matchers.popitem(last=False)
+    return matcher
+
+
+def find_entity_mentions(
+    world_path: Path, text: str, exclude_file: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Find mentions of existing world entries in a text.
+
+    Args:
+        world_path: Path to the world directory
+        text: Text to scan
+        exclude_file: Relative path of an entry whose own name should be ignored
+
+    Returns:
+        List of mentions with offsets and the entries they refer to
+    """
+    mentions = get_entity_matcher(world_path).find_mentions(text)
+    if exclude_file:
+        mentions = [
+            mention
+            for mention in mentions
+            if all(entry["file"] != exclude_file for entry in mention["entries"])
+        ]
+    return mentions
+
+
+def get_entry_names(record: Dict[str, Any]) -> List[str]:
+    """Get the title, display name and aliases an entry can be mentioned by.
+
+    Aliases come from an ``aliases`` frontmatter field holding a comma-separated
+    list, optionally wrapped in brackets.
+
+    Args:
+        record: Entry record from the world index
+
+    Returns:
+        Distinct names, title first
+    """
+    names = [record["title"], record["name"]]
+    aliases = record["frontmatter"].get("aliases", "").strip().strip("[]")
+    names.extend(alias.strip().strip("\"'") for alias in aliases.split(","))
+
+    unique_names = []
+    for name in names:
+        if len(name) >= MIN_ENTITY_NAME_LENGTH and name not in unique_names:
+            unique_names.append(name)
+    return unique_names
+
+
+def _collect_patterns(world_path: Path) -> Dict[str, List[Dict[str, str]]]:
+    """Map every normalized entry name in a world to the entries it names."""
+    patterns: Dict[str, List[Dict[str, str]]] = {}
+    for record in get_cached_entries(world_path):
+        target = {
+            "title": record["title"],
+            "slug": record["slug"],
+            "taxonomy": record["taxonomy"],
+            "file": record["file"],
+        }
+        for name in get_entry_names(record):
+            targets = patterns.setdefault("".join(_fold(char) for char in name), [])
+            if target not in targets:
+                targets.append(target)
+    return patterns
+
+
+def _patterns_signature(patterns: Dict[str, List[Dict[str, str]]]) -> str:
+    """Hash the pattern set so the cached automaton can be validated."""
+    digest = hashlib.sha1()
+    for pattern in sorted(patterns):
+        digest.update(pattern.encode("utf-8"))
+        for target in patterns[pattern]:
+            digest.update(b"\0" + target["file"].encode("utf-8"))
+            digest.update(b"\0" + target["title"].encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _load_matcher(world_path: Path, signature: str) -> Optional[EntityMatcher]:
+    """Load the persisted automaton if it was built from the same names."""
+    try:
+        with open(_matcher_path(world_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != ENTITY_MATCHER_VERSION
+        or data.get("signature") != signature
+    ):
+        return None
+    return EntityMatcher.from_dict(data)
+
+
+def _save_matcher(world_path: Path, matcher: EntityMatcher) -> None:
+    """Persist the compiled automaton next to the world index."""
+    matcher_path = _matcher_path(world_path)
+    try:
+        matcher_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = matcher_path.with_name(f".{matcher_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(matcher.to_dict(), f)
+        os.replace(temp_path, matcher_path)
+    except OSError:
+        # The persisted automaton is only a cache
+        pass
+
+
+def _matcher_path(world_path: Path) -> Path:
+    """Get the path of the persisted automaton for a world."""
+    return world_path / METADATA_DIRECTORY / ENTITY_MATCHER_FILENAME
+
+
+def _fold(char: str) -> str:
+    """Lowercase a character without changing text offsets."""
+    folded = char.lower()
+    return folded if len(folded) == 1 else char
+
+
+def _is_capitalized(text: str, start: int) -> bool:
+    """Check that a match starts with a capital letter (or a non-letter)."""
+    return not text[start].isalpha() or text[start].isupper()
+
+
+def _is_word_boundary(text: str, start: int, end: int) -> bool:
+    """Check that a match is not part of a longer word."""
+    return (start == 0 or not text[start - 1].isalnum()) and (
+        end == len(text) or not text[end].isalnum()
+    )
@@ -0,0 +1,502 @@
+"""Shared HTTP client for the FAL image API.
+
+Every image request made by the tools goes through one pooled keep-alive
+session with explicit connect and read timeouts, and generated images are
+streamed to disk in fixed-size chunks and renamed into place only when
+complete. The blocking network I/O runs in worker threads, so the MCP
+server's event loop keeps serving other tool calls while an image generates
+or downloads. Identical generation requests are served from the shared image
+cache instead of the API.
+
+Failures are retried with jittered exponential backoff, honoring
+``Retry-After``. A generation request is not idempotent, so it is retried
+only when it never reached the API (a failed connection) or the API refused
+it (429 or 503); downloads are retried on any transient error. A failed
+download is retried on its own, so an image that was already generated (and
+paid for) is not thrown away. After repeated upstream failures a circuit
+breaker fails every request fast for a cooldown window instead of piling
+more load on the API.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set
+
+from ..config import (
+    FAL_API_KEY,
+    FAL_API_URL,
+    FAL_AVAILABLE,
+    FAL_CIRCUIT_BREAKER_COOLDOWN_SECONDS,
+    FAL_CIRCUIT_BREAKER_THRESHOLD,
+    FAL_CONNECT_TIMEOUT_SECONDS,
+    FAL_DOWNLOAD_TIMEOUT_SECONDS,
+    FAL_GENERATION_RETRY_STATUS_CODES,
+    FAL_GENERATION_TIMEOUT_SECONDS,
+    FAL_HTTP_POOL_SIZE,
+    FAL_MAX_IMAGE_BYTES,
+    FAL_MAX_RETRIES,
+    FAL_RETRY_BASE_DELAY_SECONDS,
+    FAL_RETRY_MAX_DELAY_SECONDS,
+    FAL_RETRY_STATUS_CODES,
+    IMAGE_DOWNLOAD_CHUNK_SIZE,
+)
+from .file_ops import remove_file_safely
+from .image_cache import ImageCache, get_image_cache
+
+if FAL_AVAILABLE:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.exceptions import NewConnectionError
+
+# Client shared by every tool call in this process
+_client: Optional["FalClient"] = None
+_client_lock = threading.Lock()
+
+
+class FalAPIError(Exception):
+    """Raised when a FAL generation request or image download fails."""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retryable: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        """Create an error for a failed request.
+
+        Args:
+            message: Description of the failure
+            status_code: HTTP status code, if a response was received
+            retryable: Whether the failure is transient and worth retrying
+            retry_after: Seconds the server asked us to wait, if it said
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fails requests fast for a cooldown window after repeated failures."""
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        """Create a closed breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker (0 disables it)
+            cooldown: Seconds the breaker stays open before letting a request through
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Whether requests are currently being refused."""
+        with self._lock:
+            return time.monotonic() < self._open_until
+
+    def check(self) -> None:
+        """Refuse a request while the breaker is open.
+
+        Raises:
+            FalAPIError: If the breaker is open
+        """
+        with self._lock:
+            remaining = self._open_until - time.monotonic()
+            failures = self._failures
+        if remaining > 0:
+            raise FalAPIError(
+                f"FAL API unavailable after {failures} consecutive failures; "
+                f"requests resume in {remaining:.0f}s"
+            )
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+
+    def record_failure(self) -> None:
+        """Count an upstream failure, opening the breaker at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self.failure_threshold and self._failures >= self.failure_threshold:
+                self._open_until = time.monotonic() + self.cooldown
+
+
+class FalClient:
+    """Async client for FAL image generation over a pooled HTTP session."""
+
+    def __init__(
+        self,
+        api_key: Optional[str] = FAL_API_KEY,
+        api_url: str = FAL_API_URL,
+        connect_timeout: float = FAL_CONNECT_TIMEOUT_SECONDS,
+        generation_timeout: float = FAL_GENERATION_TIMEOUT_SECONDS,
+        download_timeout: float = FAL_DOWNLOAD_TIMEOUT_SECONDS,
+        pool_size: int = FAL_HTTP_POOL_SIZE,
+        cache: Optional[ImageCache] = None,
+        max_retries: int = FAL_MAX_RETRIES,
+        retry_base_delay: float = FAL_RETRY_BASE_DELAY_SECONDS,
+        retry_max_delay: float = FAL_RETRY_MAX_DELAY_SECONDS,
+        breaker: Optional[CircuitBreaker] = None,
+        max_image_bytes: int = FAL_MAX_IMAGE_BYTES,
+    ):
+        """Create a client with its own connection pool.
+
+        Args:
+            api_key: FAL API key
+            api_url: FAL model endpoint
+            connect_timeout: Seconds to wait for a connection
+            generation_timeout: Seconds to wait between bytes of a generation response
+            download_timeout: Seconds to wait between bytes of an image download
+            pool_size: Number of keep-alive connections kept per host
+            cache: Image cache to serve repeated requests from, if any
+            max_retries: Retries of a transient failure after the first attempt
+            retry_base_delay: Backoff before the first retry, doubled per retry
+            retry_max_delay: Upper bound on a single backoff
+            breaker: Circuit breaker shared by generations and downloads
+            max_image_bytes: Largest image a download may write
+        """
+        self.api_key = api_key
+        self.api_url = api_url
+        self.cache = cache
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.max_image_bytes = max_image_bytes
+        self.breaker = breaker or CircuitBreaker(
+            FAL_CIRCUIT_BREAKER_THRESHOLD, FAL_CIRCUIT_BREAKER_COOLDOWN_SECONDS
+        )
+        self.generation_timeout = (connect_timeout, generation_timeout)
+        self.download_timeout = (connect_timeout, download_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    async def generate(
+        self, payload: Dict[str, Any], max_retries: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Request an image generation, retrying transient failures.
+
+        Args:
+            payload: Request body for the FAL model
+            max_retries: Retries for this request (default: the client's)
+
+        Returns:
+            API response data including image URLs and metadata
+
+        Raises:
+            FalAPIError: If the request fails or returns no images
+        """
+        return await self._with_retries(self._post_generation, max_retries, payload)
+
+    async def download(
+        self, url: str, destination: Path, max_retries: Optional[int] = None
+    ) -> int:
+        """Stream an image to a file without holding it in memory.
+
+        A failed download is retried from the start, overwriting the file.
+
+        Args:
+            url: Image URL from a generation response
+            destination: File to write
+            max_retries: Retries for this download (default: the client's)
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            FalAPIError: If the download fails
+        """
+        return await self._with_retries(
+            self._download_to_file, max_retries, url, destination
+        )
+
+    async def generate_image(
+        self,
+        payload: Dict[str, Any],
+        destination: Path,
+        reuse_cached: bool = True,
+        max_retries: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Generate an image and stream the first result to a file.
+
+        With a cache, an identical earlier request is published to the
+        destination without calling the API, and new images are stored in
+        the cache before being published.
+
+        Args:
+            payload: Request body for the FAL model
+            destination: File to write the image to
+            reuse_cached: Whether a cached image may be used for this request
+            max_retries: Retries for each step (default: the client's)
+
+        Returns:
+            API response data including the image URL and metadata such as the
+            seed, with "cached" set to True when served from the cache
+
+        Raises:
+            FalAPIError: If generation or download fails
+        """
+        if self.cache is None:
+            result = await self.generate(payload, max_retries)
+            await self.download(result["images"][0]["url"], destination, max_retries)
+            return result
+
+        key = self.cache.key_for(self.api_url, payload)
+        if reuse_cached:
+            cached = await asyncio.to_thread(self.cache.get, key, destination)
+            if cached is not None:
+                return {**cached, "cached": True}
+
+        result = await self.generate(payload, max_retries)
+        temp_path = self.cache.temp_path(key)
+        try:
+            await self.download(result["images"][0]["url"], temp_path, max_retries)
+            await asyncio.to_thread(self.cache.put, key, temp_path, result, destination)
+        finally:
+            remove_file_safely(temp_path)
+        return result
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+
+    async def _with_retries(
+        self, request: Callable[..., Any], max_retries: Optional[int], *args: Any
+    ) -> Any:
+        """Run a blocking request in a worker thread, retrying transient failures.
+
+        Args:
+            request: Blocking request method
+            max_retries: Retries after the first attempt (default: the client's)
+            *args: Arguments for the request
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            FalAPIError: If the breaker is open, the failure is permanent, or
+                the retries run out
+        """
+        retries = self.max_retries if max_retries is None else max_retries
+
+        attempt = 0
+        while True:
+            self.breaker.check()
+            try:
+                result = await asyncio.to_thread(request, *args)
+            except FalAPIError as e:
+                # Server errors count against the API even when not retried
+                if e.retryable or (e.status_code or 0) >= 500:
+                    self.breaker.record_failure()
+                if not e.retryable or attempt >= retries or self.breaker.is_open:
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt, e.retry_after))
+                attempt += 1
+            else:
+                self.breaker.record_success()
+                return result
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Pick the wait before a retry: full-jitter backoff, or the server's ask."""
+        backoff = min(self.retry_max_delay, self.retry_base_delay * 2**attempt)
+        delay = random.uniform(0, backoff)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.retry_max_delay))
+        return delay
+
+    def _post_generation(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a generation request (runs in a worker thread)."""
+        # The API key only goes to the FAL endpoint, never to image hosts
+        headers = {
+            "Authorization": f"Key {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        try:
+            response = self.session.post(
+                self.api_url,
+                headers=headers,
+                json=payload,
+                timeout=self.generation_timeout,
+            )
+        except requests.RequestException as e:
+            raise FalAPIError(
+                f"FAL API request failed: {e}", retryable=_failed_before_send(e)
+            ) from e
+
+        if response.status_code != 200:
+            raise _response_error(
+                f"FAL API request failed with status {response.status_code}: {response.text}",
+                response,
+                FAL_GENERATION_RETRY_STATUS_CODES,
+            )
+
+        result = response.json()
+        if not result.get("images"):
+            raise FalAPIError("No images returned from FAL API")
+        return result
+
+    def _download_to_file(self, url: str, destination: Path) -> int:
+        """Stream a download to a file in chunks (runs in a worker thread).
+
+        The image is written to a temporary file next to the destination and
+        renamed into place once complete, so the destination is either the
+        previous file or the whole new image, never a truncated one.
+        """
+        temp_path = destination.with_name(
+            f".{destination.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            with self.session.get(
+                url, stream=True, timeout=self.download_timeout
+            ) as response:
+                if response.status_code != 200:
+                    raise _response_error(
+                        f"Failed to download image from {url}", response
+                    )
+
+                expected = _expected_length(response)
+                if expected is not None and expected > self.max_image_bytes:
+                    raise FalAPIError(
+                        f"Image from {url} is {expected} bytes, over the "
+                        f"{self.max_image_bytes} byte limit"
+                    )
+
+                written = 0
+                with open(temp_path, "wb") as f:
+                    for chunk in response.iter_content(
+                        chunk_size=IMAGE_DOWNLOAD_CHUNK_SIZE
+                    ):
+                        written += len(chunk)
+                        if written > self.max_image_bytes:
+                            raise FalAPIError(
+                                f"Image from {url} exceeds the "
+                                f"{self.max_image_bytes} byte limit"
+                            )
+                        f.write(chunk)
+
+                if expected is not None and written != expected:
+                    raise FalAPIError(
+                        f"Image download from {url} was truncated "
+                        f"({written} of {expected} bytes)",
+                        retryable=True,
+                    )
+            os.replace(temp_path, destination)
+        except requests.RequestException as e:
+            raise FalAPIError(
+                f"Failed to download image from {url}: {e}", retryable=True
+            ) from e
+        finally:
+            remove_file_safely(temp_path)
+        return written
+
+
+def _expected_length(response: "requests.Response") -> Optional[int]:
+    """Get the decoded body size promised by Content-Length, if known."""
+    # With a Content-Encoding the header counts compressed bytes, not ours
+    if response.headers.get("Content-Encoding", "identity") != "identity":
+        return None
+    try:
+        return int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _response_error(
+    message: str,
+    response: "requests.Response",
+    retry_status_codes: Set[int] = FAL_RETRY_STATUS_CODES,
+) -> FalAPIError:
+    """Build the error for a failed response, noting whether to retry it."""
+    return FalAPIError(
+        message,
+        response.status_code,
+        retryable=response.status_code in retry_status_codes,
+        retry_after=_parse_retry_after(response.headers.get("Retry-After")),
+    )
+
+
+def _failed_before_send(error: "requests.RequestException") -> bool:
+    """Check whether a request failed while connecting, before it was sent."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or not error.args:
+        return False
+    # requests wraps urllib3's MaxRetryError, whose reason is the root cause
+    reason = getattr(error.args[0], "reason", error.args[0])
+    return isinstance(reason, NewConnectionError)
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Spaces out request starts to stay under a per-minute limit."""
+
+    def __init__(self, requests_per_minute: float):
+        """Create a limiter.
+
+        Args:
+            requests_per_minute: Maximum request starts per minute (0 disables the limit)
+        """
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Wait until the next request may start."""
+        if not self.interval:
+            return
+
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def get_fal_client() -> FalClient:
+    """Get the FAL client shared by all tool calls, creating it on first use.
+
+    Returns:
+        Shared client with a pooled keep-alive session
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = FalClient(cache=get_image_cache())
+        return _client
+
+
+def close_fal_client() -> None:
+    """Close the shared FAL client, if one was created."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
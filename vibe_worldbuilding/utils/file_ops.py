@@ -4,8 +4,29 @@ This module provides common file system operations used across
 the worldbuilding tools, with consistent error handling and validation.
 """
 
+import os
+import shutil
+import stat
+import tempfile
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+from .content_parsing import patch_frontmatter
+
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# Linux ioctl that clones a file's extents (copy-on-write) on btrfs, XFS, etc.
+FICLONE = 0x40049409
+
+# Mode of newly created files; read once, as reading it means setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+NEW_FILE_MODE = 0o666 & ~_UMASK
 
 
 def ensure_directory_exists(directory_path: Path) -> None:
@@ -57,6 +78,120 @@ def safe_write_file(file_path: Path, content: str, encoding: str = "utf-8") -> N
         f.write(content)
 
 
+def write_file_atomically(
+    file_path: Path, content: str, encoding: str = "utf-8"
+) -> None:
+    """Write a file through a temporary file and a rename.
+
+    Readers see either the old or the new content, never a partial write.
+
+    Args:
+        file_path: Path to the file to write
+        content: Content to write
+        encoding: Text encoding to use
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(file_path).st_mode)
+    except OSError:
+        mode = NEW_FILE_MODE
+    temp_path = _write_temp_file(file_path, content, encoding, mode)
+    try:
+        os.replace(temp_path, file_path)
+    except OSError:
+        remove_file_safely(temp_path)
+        raise
+
+
+def create_file_atomically(
+    file_path: Path, content: str, encoding: str = "utf-8"
+) -> bool:
+    """Create a file with its full content, unless the file already exists.
+
+    The content is written to a temporary file that is then hard-linked into
+    place, so the file never exists half-written and an existing file is
+    never replaced. Filesystems without hard links fall back to an
+    exclusive create.
+
+    Args:
+        file_path: Path to the file to create
+        content: Content to write
+        encoding: Text encoding to use
+
+    Returns:
+        True if the file was created, False if it already existed
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    temp_path = _write_temp_file(file_path, content, encoding, NEW_FILE_MODE)
+    try:
+        os.link(temp_path, file_path)
+    except FileExistsError:
+        return False
+    except OSError:
+        try:
+            with open(file_path, "x", encoding=encoding) as f:
+                f.write(content)
+        except FileExistsError:
+            return False
+    finally:
+        remove_file_safely(temp_path)
+    return True
+
+
+def _write_temp_file(file_path: Path, content: str, encoding: str, mode: int) -> Path:
+    """Write content to a new, uniquely named temporary file next to a file.
+
+    Each call gets its own file, so threads and processes writing the same
+    path never share a temporary file.
+    """
+    ensure_directory_exists(file_path.parent)
+    fd, temp_name = tempfile.mkstemp(
+        prefix=f".{file_path.name}.", suffix=".tmp", dir=file_path.parent
+    )
+    temp_path = Path(temp_name)
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(content)
+        os.chmod(temp_path, mode)
+    except BaseException:
+        remove_file_safely(temp_path)
+        raise
+    return temp_path
+
+
+def update_file_frontmatter(
+    file_path: Path, updates: Dict[str, str], encoding: str = "utf-8"
+) -> bool:
+    """Set frontmatter keys of a markdown file in place.
+
+    Only the changed keys are rewritten (see ``patch_frontmatter``), the file
+    is replaced atomically, and it is not written at all when no value
+    changes, so its mtime stays put.
+
+    Args:
+        file_path: Path to the markdown file
+        updates: Dictionary of frontmatter key-value pairs to set
+        encoding: Text encoding to use
+
+    Returns:
+        True if the file was rewritten, False if it was already up to date
+
+    Raises:
+        OSError: If the file cannot be read or written
+        UnicodeDecodeError: If the file cannot be decoded
+    """
+    content = safe_read_file(file_path, encoding)
+    updated_content = patch_frontmatter(content, updates)
+    if updated_content == content:
+        return False
+    write_file_atomically(file_path, updated_content, encoding)
+    return True
+
+
 def find_files_by_pattern(directory: Path, pattern: str) -> List[Path]:
     """Find files matching a glob pattern in a directory.
 
@@ -127,6 +262,84 @@ def copy_file_contents(source: Path, destination: Path) -> None:
     safe_write_file(destination, content)
 
 
+def link_or_copy_file(source: Path, destination: Path) -> str:
+    """Place a copy of a file at a new path as cheaply as the filesystem allows.
+
+    Tries a hard link first, then a copy-on-write clone (reflink), then an
+    in-kernel ``copy_file_range`` copy, and finally a plain copy. Copies keep
+    the source's mtime. The destination is replaced atomically.
+
+    Args:
+        source: Source file path
+        destination: Destination file path
+
+    Returns:
+        The method used: "hardlink", "reflink", "copy_file_range" or "copy"
+
+    Raises:
+        OSError: If the file cannot be published by any method
+    """
+    ensure_directory_exists(destination.parent)
+    fd, temp_name = tempfile.mkstemp(
+        prefix=f".{destination.name}.", suffix=".tmp", dir=destination.parent
+    )
+    os.close(fd)
+    temp_path = Path(temp_name)
+
+    try:
+        try:
+            # A hard link needs a free name; the random one stays unique
+            os.unlink(temp_path)
+            os.link(source, temp_path)
+            method = "hardlink"
+        except OSError:
+            method = _clone_or_copy_file(source, temp_path)
+            shutil.copystat(source, temp_path)
+        os.replace(temp_path, destination)
+    except BaseException:
+        remove_file_safely(temp_path)
+        raise
+    if method == "hardlink":
+        # Renaming onto another link of the same file succeeds without doing
+        # anything, which leaves the temporary link in place
+        remove_file_safely(temp_path)
+    return method
+
+
+def _clone_or_copy_file(source: Path, destination: Path) -> str:
+    """Copy a file's data, preferring a reflink, then copy_file_range."""
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        if FCNTL_AVAILABLE:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return "reflink"
+            except OSError:
+                pass
+
+        if hasattr(os, "copy_file_range"):
+            remaining = os.fstat(src.fileno()).st_size
+            offset = 0
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(
+                        src.fileno(), dst.fileno(), remaining, offset, offset
+                    )
+                    if copied == 0:
+                        break
+                    offset += copied
+                    remaining -= copied
+                if remaining == 0:
+                    return "copy_file_range"
+            except OSError:
+                pass
+            dst.seek(0)
+            dst.truncate()
+
+        src.seek(0)
+        shutil.copyfileobj(src, dst)
+        return "copy"
+
+
 def get_file_size(file_path: Path) -> Optional[int]:
     """Get the size of a file in bytes.
 
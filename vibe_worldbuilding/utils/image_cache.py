@@ -0,0 +1,190 @@
+"""Content-addressed cache of generated images.
+
+Images are stored under a hash of the FAL endpoint and the full generation
+request (prompt, aspect ratio or image size, and model parameters), next to
+the API response metadata such as the seed. Repeating an identical request,
+for example when a world is re-created or a file is regenerated, publishes
+the cached image into the world by hard link instead of paying for a new
+generation. The cache is shared by all worlds and evicts the least recently
+used images once it grows past its size limit.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES, IMAGE_EXTENSION
+from .file_ops import link_or_copy_file, remove_file_safely
+
+METADATA_EXTENSION = ".json"
+
+
+class ImageCache:
+    """Store of generated images keyed by their generation request."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        """Create a cache in a directory.
+
+        Args:
+            cache_dir: Directory holding cached images and metadata
+            max_bytes: Size above which least recently used images are evicted
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+        # Size of the cached files, counted on the first put and kept up to
+        # date by later ones, so the directory is only scanned to evict
+        self._total_bytes: Optional[int] = None
+
+    def key_for(self, api_url: str, payload: Dict[str, Any]) -> str:
+        """Hash a generation request into a cache key.
+
+        Args:
+            api_url: FAL model endpoint
+            payload: Request body sent to the endpoint
+
+        Returns:
+            Hex digest identifying the request
+        """
+        request = json.dumps({"url": api_url, "payload": payload}, sort_keys=True)
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, destination: Path) -> Optional[Dict[str, Any]]:
+        """Publish a cached image to a destination, if the request is cached.
+
+        Args:
+            key: Cache key from ``key_for``
+            destination: File to publish the image to
+
+        Returns:
+            Stored API response metadata, or None on a cache miss
+        """
+        image_path, metadata_path = self._paths(key)
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+            link_or_copy_file(image_path, destination)
+        except (OSError, ValueError):
+            return None
+
+        # Recency is tracked on the metadata file, so the shared image keeps its mtime
+        try:
+            os.utime(metadata_path)
+        except OSError:
+            pass
+        return metadata
+
+    def put(
+        self,
+        key: str,
+        image_file: Path,
+        metadata: Dict[str, Any],
+        destination: Path,
+    ) -> None:
+        """Move a downloaded image into the cache and publish it.
+
+        Args:
+            key: Cache key from ``key_for``
+            image_file: Downloaded image, from ``temp_path``
+            metadata: API response metadata to store with it
+            destination: File to publish the image to
+        """
+        image_path, metadata_path = self._paths(key)
+        replaced_bytes = _file_size(image_path) + _file_size(metadata_path)
+        os.replace(image_file, image_path)
+
+        temp_metadata = self.temp_path(key)
+        with open(temp_metadata, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        os.replace(temp_metadata, metadata_path)
+
+        link_or_copy_file(image_path, destination)
+
+        added_bytes = _file_size(image_path) + _file_size(metadata_path)
+        with self._evict_lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _, _ in self._scan())
+            else:
+                self._total_bytes += added_bytes - replaced_bytes
+            over_limit = self._total_bytes > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def temp_path(self, key: str) -> Path:
+        """Get a temporary path inside the cache to download an image to.
+
+        Args:
+            key: Cache key from ``key_for``
+
+        Returns:
+            Unique temporary path on the cache's filesystem
+        """
+        image_path, _ = self._paths(key)
+        image_path.parent.mkdir(parents=True, exist_ok=True)
+        return image_path.with_name(f".{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    def evict(self) -> None:
+        """Remove least recently used images until the cache fits its limit.
+
+        The whole cache is scanned, which also picks up images that other
+        processes sharing the directory added since the size was counted.
+        """
+        with self._evict_lock:
+            entries = self._scan()
+            total = sum(size for _, size, _, _ in entries)
+            for _, size, metadata_path, image_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                remove_file_safely(metadata_path)
+                remove_file_safely(image_path)
+                total -= size
+            self._total_bytes = total
+
+    def _scan(self) -> List[Tuple[float, int, Path, Path]]:
+        """List cached images as (last used, size, metadata path, image path)."""
+        entries = []
+        for metadata_path in self.cache_dir.glob(f"*/*{METADATA_EXTENSION}"):
+            image_path = metadata_path.with_suffix(IMAGE_EXTENSION)
+            try:
+                metadata_stat = metadata_path.stat()
+                size = metadata_stat.st_size + image_path.stat().st_size
+            except OSError:
+                continue
+            entries.append((metadata_stat.st_mtime, size, metadata_path, image_path))
+        return entries
+
+    def _paths(self, key: str) -> "tuple[Path, Path]":
+        """Get the image and metadata paths for a key."""
+        base = self.cache_dir / key[:2] / key
+        return (
+            base.with_suffix(IMAGE_EXTENSION),
+            base.with_suffix(METADATA_EXTENSION),
+        )
+
+
+def _file_size(path: Path) -> int:
+    """Get a file's size, or 0 if it does not exist."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def get_image_cache() -> Optional[ImageCache]:
+    """Get the configured image cache.
+
+    Returns:
+        Cache in IMAGE_CACHE_DIR, or None when caching is disabled
+        (VIBE_IMAGE_CACHE_MAX_MB=0) or the directory cannot be created
+    """
+    if IMAGE_CACHE_MAX_BYTES <= 0:
+        return None
+    try:
+        IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return ImageCache(IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES)
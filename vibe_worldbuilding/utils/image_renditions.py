@@ -0,0 +1,309 @@
+"""Resized WebP renditions of world images.
+
+Generated images are full-resolution PNGs of a couple of megabytes, far more
+than a gallery thumbnail or an entry illustration needs. Every image gets a
+small thumbnail and a mid-size rendition under ``images/_renditions/``, listed
+in ``metadata/images.json`` so the site pages can reference them instead of
+the originals. Resizing is CPU-bound, so it runs in a process pool off the
+server's event loop. Without Pillow no renditions are made and the pages keep
+using the original images.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import (
+    IMAGE_MANIFEST_FILENAME,
+    IMAGE_MANIFEST_VERSION,
+    IMAGE_RENDITION_EXTENSION,
+    IMAGE_RENDITION_QUALITY,
+    IMAGE_RENDITION_WORKERS,
+    IMAGE_RENDITIONS,
+    IMAGE_RENDITIONS_DIRECTORY,
+    IMAGE_SOURCE_EXTENSIONS,
+    METADATA_DIRECTORY,
+    PIL_AVAILABLE,
+)
+from .file_ops import remove_file_safely
+
+if PIL_AVAILABLE:
+    from PIL import Image
+
+# Process pool shared by all rendition jobs in this process
+_pool: Optional[Executor] = None
+_pool_lock = threading.Lock()
+
+
+async def update_image_renditions(
+    world_path: Path, image_files: Optional[List[Path]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Bring the renditions of a world's images up to date.
+
+    With ``image_files`` only those images are checked, which is what the
+    tools do right after generating them. Without it every image in the
+    world is checked, and renditions of images that no longer exist are
+    removed.
+
+    Args:
+        world_path: Path to the world directory
+        image_files: Images that were just written, or None for a full refresh
+
+    Returns:
+        Image manifest entries keyed by image path relative to ``images/``
+    """
+    images_path = world_path / "images"
+    full_refresh = image_files is None
+    if full_refresh:
+        image_files = _list_source_images(images_path)
+
+    manifest = read_image_manifest(world_path)
+    pending = []
+    for image_file in image_files:
+        key = image_file.relative_to(images_path).as_posix()
+        try:
+            stat = image_file.stat()
+        except OSError:
+            continue
+        if not _is_current(images_path, manifest.get(key), stat):
+            pending.append((key, image_file, stat))
+
+    results: List[Any] = []
+    if pending and PIL_AVAILABLE:
+        loop = asyncio.get_running_loop()
+        pool = _get_pool()
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    pool,
+                    _render_image,
+                    str(image_file),
+                    _rendition_targets(images_path, key),
+                    IMAGE_RENDITION_QUALITY,
+                )
+                for key, image_file, _ in pending
+            ),
+            return_exceptions=True,
+        )
+
+    # Re-read so concurrent updates for other images are kept
+    manifest = read_image_manifest(world_path)
+    changed = False
+    for (key, _, stat), result in zip(pending, results):
+        if isinstance(result, BaseException):
+            # Pages fall back to the original image
+            changed = manifest.pop(key, None) is not None or changed
+            continue
+        renditions = {
+            name: {
+                **rendition,
+                "path": _rendition_path(key, name),
+            }
+            for name, rendition in result["renditions"].items()
+        }
+        manifest[key] = {
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "width": result["width"],
+            "height": result["height"],
+            "renditions": renditions,
+        }
+        changed = True
+
+    if full_refresh:
+        current = {
+            image_file.relative_to(images_path).as_posix() for image_file in image_files
+        }
+        for key in [key for key in manifest if key not in current]:
+            for rendition in manifest.pop(key)["renditions"].values():
+                remove_file_safely(images_path / rendition["path"])
+            changed = True
+
+    if changed:
+        _write_manifest(world_path, manifest)
+    return manifest
+
+
+def read_image_manifest(world_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Read the stored image manifest, treating missing or outdated files as empty.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        Image manifest entries keyed by image path relative to ``images/``
+    """
+    try:
+        with open(get_image_manifest_path(world_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get("version") != IMAGE_MANIFEST_VERSION:
+        return {}
+
+    images = data.get("images")
+    return images if isinstance(images, dict) else {}
+
+
+def get_image_manifest_path(world_path: Path) -> Path:
+    """Get the location of a world's image manifest.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        Path to ``metadata/images.json``
+    """
+    return world_path / METADATA_DIRECTORY / IMAGE_MANIFEST_FILENAME
+
+
+def shutdown_rendition_pool() -> None:
+    """Stop the rendition worker processes, if any were started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _get_pool() -> Optional[Executor]:
+    """Get the shared process pool, or None to use the event loop's threads."""
+    global _pool
+    if IMAGE_RENDITION_WORKERS < 2:
+        # One worker process adds start-up cost without any parallelism
+        # that the event loop's threads do not already give
+        return None
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        # No fork server here (e.g. Windows), and spawning workers would
+        # re-import the package for every one of them
+        return None
+    with _pool_lock:
+        if _pool is None:
+            try:
+                # Forking the threaded server could copy a lock held by
+                # another thread into the child, so workers are forked from a
+                # single-threaded fork server that has already imported this
+                # module, which also keeps worker start-up cheap
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload([__name__])
+                _pool = ProcessPoolExecutor(
+                    max_workers=IMAGE_RENDITION_WORKERS, mp_context=context
+                )
+            except (OSError, NotImplementedError, ValueError):
+                # No process support here (e.g. no semaphores); threads still work
+                return None
+        return _pool
+
+
+def _list_source_images(images_path: Path) -> List[Path]:
+    """List the original images of a world, skipping renditions and temp files."""
+    if not images_path.exists():
+        return []
+    return [
+        image_file
+        for image_file in sorted(images_path.rglob("*"))
+        if image_file.suffix.lower() in IMAGE_SOURCE_EXTENSIONS
+        and not image_file.name.startswith(".")
+        and image_file.relative_to(images_path).parts[0] != IMAGE_RENDITIONS_DIRECTORY
+        and image_file.is_file()
+    ]
+
+
+def _is_current(
+    images_path: Path, record: Optional[Dict[str, Any]], stat: os.stat_result
+) -> bool:
+    """Check whether an image's renditions were made from its current version."""
+    return bool(
+        record
+        and record.get("mtime") == stat.st_mtime_ns
+        and record.get("size") == stat.st_size
+        and set(record.get("renditions", {})) == set(IMAGE_RENDITIONS)
+        and all(
+            (images_path / rendition["path"]).exists()
+            for rendition in record["renditions"].values()
+        )
+    )
+
+
+def _rendition_path(key: str, name: str) -> str:
+    """Get where a rendition of an image goes, relative to ``images/``."""
+    stem = key.rsplit(".", 1)[0]
+    return f"{IMAGE_RENDITIONS_DIRECTORY}/{stem}.{name}{IMAGE_RENDITION_EXTENSION}"
+
+
+def _rendition_targets(images_path: Path, key: str) -> List[Tuple[str, str, int]]:
+    """List the renditions to make for an image as (name, file, longest side)."""
+    return [
+        (name, str(images_path / _rendition_path(key, name)), max_side)
+        for name, max_side in IMAGE_RENDITIONS.items()
+    ]
+
+
+def _render_image(
+    source: str, targets: List[Tuple[str, str, int]], quality: int
+) -> Dict[str, Any]:
+    """Resize an image into its renditions (runs in a worker process).
+
+    Args:
+        source: Original image file
+        targets: Renditions to write as (name, file, longest side)
+        quality: WebP quality from 0 to 100
+
+    Returns:
+        Original width and height, and the size of every rendition written
+    """
+    renditions = {}
+    with Image.open(source) as original:
+        original.load()
+        width, height = original.size
+        image = (
+            original if original.mode in ("RGB", "RGBA") else original.convert("RGBA")
+        )
+
+        for name, destination, max_side in targets:
+            rendition = image.copy()
+            rendition.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+            destination_path = Path(destination)
+            destination_path.parent.mkdir(parents=True, exist_ok=True)
+            # Unique per call, as renders may run on threads of one process
+            fd, temp_name = tempfile.mkstemp(
+                prefix=f".{destination_path.name}.",
+                suffix=".tmp",
+                dir=destination_path.parent,
+            )
+            os.close(fd)
+            try:
+                rendition.save(temp_name, format="WEBP", quality=quality, method=4)
+                os.replace(temp_name, destination_path)
+            except BaseException:
+                remove_file_safely(Path(temp_name))
+                raise
+
+            renditions[name] = {
+                "width": rendition.width,
+                "height": rendition.height,
+                "bytes": destination_path.stat().st_size,
+            }
+    return {"width": width, "height": height, "renditions": renditions}
+
+
+def _write_manifest(world_path: Path, manifest: Dict[str, Dict[str, Any]]) -> None:
+    """Write the manifest through a temporary file so builds never see a partial file."""
+    manifest_path = get_image_manifest_path(world_path)
+    try:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = manifest_path.with_name(f".{manifest_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": IMAGE_MANIFEST_VERSION, "images": manifest}, f)
+        os.replace(temp_path, manifest_path)
+    except OSError:
+        # The manifest is rebuilt before every site build
+        pass
@@ -0,0 +1,265 @@
+"""Cross-link manifest for the static site.
+
+For every entry, the manifest lists the mentions of other entries in its
+body, with character offsets, and the entries that link back to it. It is
+stored in ``metadata/links.json``, updated when entries are written through
+the tools, and brought up to date before every site build, when it is copied
+into the world manifest the pages read. The Astro entry page then inserts
+all of its links with one splice, so linking a world costs one pass per
+entry instead of one regular expression per entry pair.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import LINK_MANIFEST_FILENAME, LINK_MANIFEST_VERSION, METADATA_DIRECTORY
+from .entity_matcher import EntityMatcher, get_entity_matcher
+from .world_cache import get_cached_entries
+
+# Spans of an entry body that must never receive auto-links
+PROTECTED_SPAN_PATTERN = re.compile(r"\[[^\]]*\]\([^)]*\)|`[^`\n]*`")
+
+# Frontmatter block as the Astro entry page strips it before inserting links
+PAGE_FRONTMATTER_PATTERN = re.compile(r"^---\r?\n.*?\r?\n---\r?\n(.*)\Z", re.DOTALL)
+
+
+def update_link_manifest(
+    world_path: Path, entry_files: Optional[List[Path]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Bring the link manifest up to date and write it to ``metadata/``.
+
+    Entries scanned before the set of entry names last changed are always
+    re-scanned, so older entries pick up links to a newly created entry.
+    With ``entry_files`` the other entries re-scanned are only those just
+    written, which is what the tools pass right after writing them; without
+    it every entry that changed on disk is re-scanned too.
+
+    Args:
+        world_path: Path to the world directory
+        entry_files: Entry files that were just written, or None for a full refresh
+
+    Returns:
+        Manifest entries keyed by ``taxonomy/slug``
+    """
+    stored = _read_manifest(world_path)
+    matcher = get_entity_matcher(world_path)
+    written = (
+        None
+        if entry_files is None
+        else {str(entry_file.relative_to(world_path)) for entry_file in entry_files}
+    )
+
+    manifest: Dict[str, Dict[str, Any]] = {}
+    for record in get_cached_entries(world_path):
+        key = f"{record['taxonomy']}/{record['slug']}"
+        existing = stored.get(key)
+        if written is None or existing is None:
+            stale = not _is_current(existing, record, matcher.signature)
+        else:
+            stale = (
+                record["file"] in written
+                or existing.get("signature") != matcher.signature
+            )
+        if stale:
+            existing = _scan_entry(world_path, record, matcher)
+        if existing is not None:
+            manifest[key] = existing
+
+    _attach_backlinks(manifest)
+    _write_manifest(world_path, manifest, matcher.signature)
+    return manifest
+
+
+def get_link_manifest_path(world_path: Path) -> Path:
+    """Get the path of the link manifest for a world.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        Path to ``metadata/links.json``
+    """
+    return world_path / METADATA_DIRECTORY / LINK_MANIFEST_FILENAME
+
+
+def get_link_manifest(world_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Get the stored link manifest, re-scanning only if it is out of date.
+
+    The stored manifest is used as is when it covers every entry at its
+    current size and modification time, scanned with the current set of
+    entry names, which is the case after the tools write entries. Otherwise
+    it is brought up to date first.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        Manifest entries keyed by ``taxonomy/slug``
+    """
+    stored = _read_manifest(world_path)
+    records = get_cached_entries(world_path)
+    signature = get_entity_matcher(world_path).signature
+    for record in records:
+        existing = stored.get(f"{record['taxonomy']}/{record['slug']}")
+        if not _is_current(existing, record, signature):
+            return update_link_manifest(world_path)
+    if len(stored) != len(records):
+        return update_link_manifest(world_path)
+    return stored
+
+
+def extract_page_body(content: str) -> str:
+    """Get the body of an entry the way the Astro entry page strips it.
+
+    Args:
+        content: Raw content of the entry file, line endings untranslated
+
+    Returns:
+        Content after the frontmatter block, or all of it if there is none
+    """
+    match = PAGE_FRONTMATTER_PATTERN.match(content)
+    return match.group(1) if match else content
+
+
+def read_link_manifest(world_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Read the stored link manifest without re-scanning any entry.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        Manifest entries keyed by ``taxonomy/slug`` as last written, or an
+        empty dictionary if there is no current manifest
+    """
+    return _read_manifest(world_path)
+
+
+def _is_current(
+    existing: Optional[Dict[str, Any]], record: Dict[str, Any], signature: str
+) -> bool:
+    """Check whether a manifest entry was scanned from the current file and names."""
+    return (
+        existing is not None
+        and existing.get("mtime") == record["mtime"]
+        and existing.get("size") == record["size"]
+        and existing.get("signature") == signature
+    )
+
+
+def _scan_entry(
+    world_path: Path, record: Dict[str, Any], matcher: EntityMatcher
+) -> Optional[Dict[str, Any]]:
+    """Find the outbound links of one entry.
+
+    Offsets are code-point offsets into the entry body exactly as the Astro
+    page reads it, line endings included.
+    """
+    try:
+        with open(world_path / record["file"], "r", encoding="utf-8", newline="") as f:
+            content = f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    body = extract_page_body(content)
+    protected = [match.span() for match in PROTECTED_SPAN_PATTERN.finditer(body)]
+
+    links = []
+    for mention in matcher.find_mentions(body):
+        if any(entry["file"] == record["file"] for entry in mention["entries"]):
+            continue
+        if any(
+            mention["start"] < end and start < mention["end"]
+            for start, end in protected
+        ):
+            continue
+
+        target = _choose_target(mention["entries"], record["taxonomy"])
+        links.append(
+            {
+                "start": mention["start"],
+                "end": mention["end"],
+                "text": mention["text"],
+                "taxonomy": target["taxonomy"],
+                "slug": target["slug"],
+            }
+        )
+
+    return {
+        "title": record["title"],
+        "mtime": record["mtime"],
+        "size": record["size"],
+        "signature": matcher.signature,
+        "links": links,
+        "backlinks": [],
+    }
+
+
+def _choose_target(entries: List[Dict[str, str]], taxonomy: str) -> Dict[str, str]:
+    """Resolve an ambiguous name, preferring an entry in the same taxonomy."""
+    for entry in entries:
+        if entry["taxonomy"] == taxonomy:
+            return entry
+    return entries[0]
+
+
+def _attach_backlinks(manifest: Dict[str, Dict[str, Any]]) -> None:
+    """Derive each entry's backlinks from every other entry's outbound links."""
+    backlinks: Dict[str, List[Dict[str, str]]] = {key: [] for key in manifest}
+    for key in sorted(manifest):
+        source_taxonomy, source_slug = key.split("/", 1)
+        targets = {
+            f"{link['taxonomy']}/{link['slug']}" for link in manifest[key]["links"]
+        }
+        for target in sorted(targets):
+            if target in backlinks:
+                backlinks[target].append(
+                    {
+                        "taxonomy": source_taxonomy,
+                        "slug": source_slug,
+                        "title": manifest[key]["title"],
+                    }
+                )
+
+    for key, entry in manifest.items():
+        entry["backlinks"] = backlinks[key]
+
+
+def _read_manifest(world_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Read the stored manifest, treating missing or outdated files as empty."""
+    try:
+        with open(get_link_manifest_path(world_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get("version") != LINK_MANIFEST_VERSION:
+        return {}
+
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def _write_manifest(
+    world_path: Path, manifest: Dict[str, Dict[str, Any]], signature: str
+) -> None:
+    """Write the manifest through a temporary file so builds never see a partial file."""
+    manifest_path = get_link_manifest_path(world_path)
+    try:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = manifest_path.with_name(f".{manifest_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": LINK_MANIFEST_VERSION,
+                    "signature": signature,
+                    "entries": manifest,
+                },
+                f,
+            )
+        os.replace(temp_path, manifest_path)
+    except OSError:
+        # The manifest is rebuilt before every site build
+        pass
@@ -0,0 +1,194 @@
+"""Fuzzy lookup of existing entity names.
+
+Every entry title, display name and alias in a world is reduced to a
+normalized key: lowercase terms without articles or possessive endings, in
+sorted order, so "The Iron Guild", "Iron Guild's" and "Guild, Iron" share a
+key. Numbers and lone letters are designators ("Sailor 1", "Tower A") that
+must match exactly. Keys are also indexed by character trigram, so
+near misses like "Iron Guilde" are found by comparing a name against only
+the keys it shares trigrams with. Indexes are kept per world in memory and
+rebuilt only when the set of names changes.
+"""
+
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Set
+
+from ..config import NAME_MATCH_THRESHOLD, WORLD_CACHE_MAX_WORLDS
+from .entity_matcher import get_entry_names
+from .relevance import STOPWORDS, TOKEN_PATTERN
+from .world_cache import get_cached_entries
+
+# Apostrophe of a possessive ("Guild's", "Guilds'"), with the "s" it adds
+POSSESSIVE_PATTERN = re.compile(r"(?<=[a-z0-9])['\u2019](?:s\b)?")
+
+# Name indexes of recently used worlds
+_indexes: "OrderedDict[str, NameIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def normalize_name(name: str) -> str:
+    """Reduce a name to the key used for duplicate detection.
+
+    Args:
+        name: Entity name
+
+    Returns:
+        Sorted distinct terms of the name, or an empty string if none remain
+    """
+    terms = set()
+    name = POSSESSIVE_PATTERN.sub("", name.lower())
+    for position, term in enumerate(TOKEN_PATTERN.findall(name)):
+        # Lone letters are designators like numbers, unless a leading article
+        if term in STOPWORDS and (len(term) > 1 or position == 0):
+            continue
+        terms.add(term)
+    return " ".join(sorted(terms))
+
+
+class NameIndex:
+    """Normalized-name and trigram index over the entries of a world."""
+
+    def __init__(self, signature: str = ""):
+        """Create an empty index.
+
+        Args:
+            signature: Hash of the names the index is built from
+        """
+        self.signature = signature
+        self.keys: List[str] = []
+        self.trigrams: List[Set[str]] = []
+        self.targets: Dict[str, List[Dict[str, str]]] = {}
+        self.postings: Dict[str, List[int]] = {}
+
+    def add(self, name: str, target: Dict[str, str]) -> None:
+        """Index a name of an entry.
+
+        Args:
+            name: Title, display name or alias
+            target: Entry the name refers to (title, taxonomy, file)
+        """
+        key = normalize_name(name)
+        if not key:
+            return
+        if key not in self.targets:
+            self.targets[key] = []
+            trigrams = _trigrams(key)
+            for trigram in trigrams:
+                self.postings.setdefault(trigram, []).append(len(self.keys))
+            self.keys.append(key)
+            self.trigrams.append(trigrams)
+        if target not in self.targets[key]:
+            self.targets[key].append(target)
+
+    def find_matches(
+        self, name: str, threshold: float = NAME_MATCH_THRESHOLD
+    ) -> List[Dict[str, Any]]:
+        """Find the entries whose names resemble a name.
+
+        Args:
+            name: Name to look up
+            threshold: Minimum trigram similarity (Dice coefficient) of a match
+
+        Returns:
+            Matching entries with their ``score``, best first; an exact match
+            of normalized names scores 1.0
+        """
+        key = normalize_name(name)
+        if not key:
+            return []
+
+        scores: Dict[str, float] = {}
+        if key in self.targets:
+            scores[key] = 1.0
+        trigrams = _trigrams(key)
+        shared = Counter(
+            index for trigram in trigrams for index in self.postings.get(trigram, [])
+        )
+        designators = _designators(key)
+        for index, count in shared.items():
+            candidate = self.keys[index]
+            score = 2 * count / (len(trigrams) + len(self.trigrams[index]))
+            if (
+                score >= threshold
+                and candidate not in scores
+                and _designators(candidate) == designators
+            ):
+                scores[candidate] = score
+
+        matches = []
+        seen = set()
+        for candidate in sorted(scores, key=lambda candidate: -scores[candidate]):
+            for target in self.targets[candidate]:
+                if target["file"] not in seen:
+                    seen.add(target["file"])
+                    matches.append({**target, "score": scores[candidate]})
+        return matches
+
+
+def get_name_index(world_path: Path) -> NameIndex:
+    """Get the name index of a world, rebuilding it only when names change.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        Index over every entry title, display name and alias in the world
+    """
+    names = _collect_names(world_path)
+    signature = _names_signature(names)
+    key = str(world_path.resolve())
+    with _indexes_lock:
+        index = _indexes.pop(key, None)
+        if index is None or index.signature != signature:
+            index = _build_name_index(names, signature)
+        _indexes[key] = index
+        while len(_indexes) > WORLD_CACHE_MAX_WORLDS:
+            _indexes.popitem(last=False)
+        return index
+
+
+def _build_name_index(names: List[Dict[str, Any]], signature: str) -> NameIndex:
+    """Build a name index from a world's names."""
+    index = NameIndex(signature)
+    for item in names:
+        index.add(item["name"], item["target"])
+    return index
+
+
+def _collect_names(world_path: Path) -> List[Dict[str, Any]]:
+    """List every name of every entry in a world."""
+    names = []
+    for record in get_cached_entries(world_path):
+        target = {
+            "title": record["title"],
+            "taxonomy": record["taxonomy"],
+            "file": record["file"],
+        }
+        for name in get_entry_names(record):
+            names.append({"name": name, "target": target})
+    return names
+
+
+def _names_signature(names: List[Dict[str, Any]]) -> str:
+    """Hash a world's names so a cached index can be validated."""
+    digest = hashlib.sha1()
+    for item in names:
+        digest.update(item["name"].encode("utf-8"))
+        digest.update(b"\0" + item["target"]["file"].encode("utf-8"))
+        digest.update(b"\0" + item["target"]["title"].encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+def _trigrams(key: str) -> Set[str]:
+    """Split a normalized name into padded character trigrams."""
+    padded = f"  {key} "
+    return {padded[start : start + 3] for start in range(len(padded) - 2)}
+
+
+def _designators(key: str) -> Set[str]:
+    """Get the numbers and lone letters of a normalized name, which must match exactly."""
+    return {term for term in key.split() if term.isdigit() or len(term) == 1}
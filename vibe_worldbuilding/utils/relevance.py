@@ -0,0 +1,201 @@
+"""Relevance ranking of world entries.
+
+Entries are scored against a query with BM25 over their titles, taxonomies
+and frontmatter descriptions. The term statistics for a world are kept in a
+small in-process cache and updated entry by entry as files change, so
+ranking a world of thousands of entries costs one pass over the query terms
+rather than re-tokenizing every description on each call.
+"""
+
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+from ..config import BM25_B, BM25_K1, WORLD_CACHE_MAX_WORLDS
+from .world_cache import get_cached_entries
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Words too common to say anything about relevance
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in into is it its of on or "
+    "that the their there these this those to was were which with".split()
+)
+
+# Ranking indexes of recently used worlds
+_indexes: "OrderedDict[str, BM25Index]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search terms.
+
+    Stopwords and single characters are dropped, and a trailing plural "s"
+    is stripped so "harbors" matches "harbor".
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        Terms in order of appearance
+    """
+    terms = []
+    for term in TOKEN_PATTERN.findall(text.lower()):
+        if len(term) < 2 or term in STOPWORDS:
+            continue
+        if len(term) > 3 and term.endswith("s") and not term.endswith("ss"):
+            term = term[:-1]
+        terms.append(term)
+    return terms
+
+
+class BM25Index:
+    """In-memory BM25 inverted index over a changing set of documents."""
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        """Create an empty index.
+
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.document_terms: Dict[str, List[str]] = {}
+        self.lengths: Dict[str, int] = {}
+        self.stamps: Dict[str, Any] = {}
+        self.total_length = 0
+
+    def __contains__(self, doc_id: str) -> bool:
+        """Check whether a document is indexed."""
+        return doc_id in self.lengths
+
+    def add(self, doc_id: str, terms: Iterable[str], stamp: Any = None) -> None:
+        """Add or replace a document.
+
+        Args:
+            doc_id: Document identifier
+            terms: Document terms from ``tokenize``
+            stamp: Version marker used to detect changed documents
+        """
+        self.remove(doc_id)
+        counts = Counter(terms)
+        for term, count in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+        self.document_terms[doc_id] = list(counts)
+        self.lengths[doc_id] = sum(counts.values())
+        self.stamps[doc_id] = stamp
+        self.total_length += self.lengths[doc_id]
+
+    def remove(self, doc_id: str) -> None:
+        """Remove a document, if present.
+
+        Args:
+            doc_id: Document identifier
+        """
+        if doc_id not in self.lengths:
+            return
+        self.total_length -= self.lengths.pop(doc_id)
+        self.stamps.pop(doc_id, None)
+        for term in self.document_terms.pop(doc_id):
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+
+    def score(self, query_terms: Iterable[str]) -> Dict[str, float]:
+        """Score every document containing at least one query term.
+
+        Args:
+            query_terms: Query terms from ``tokenize``
+
+        Returns:
+            BM25 score per matching document
+        """
+        scores: Dict[str, float] = {}
+        document_count = len(self.lengths)
+        if not document_count:
+            return scores
+
+        average_length = self.total_length / document_count or 1.0
+        for term in set(query_terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            frequency = len(postings)
+            idf = math.log(1 + (document_count - frequency + 0.5) / (frequency + 0.5))
+            for doc_id, term_count in postings.items():
+                norm = self.k1 * (
+                    1 - self.b + self.b * self.lengths[doc_id] / average_length
+                )
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * (
+                    term_count * (self.k1 + 1) / (term_count + norm)
+                )
+        return scores
+
+
+def rank_world_entries(
+    world_path: Path, query: str, taxonomy: str = ""
+) -> List[Tuple[Dict[str, Any], float]]:
+    """Order every entry of a world by relevance to a query.
+
+    Entries that match no query term keep a score of zero and follow the
+    matching ones. Ties go to entries of the given taxonomy, then by title.
+
+    Args:
+        world_path: Path to the world directory
+        query: Free text, e.g. a new entry's name and taxonomy
+        taxonomy: Taxonomy slug whose entries win ties
+
+    Returns:
+        (entry record, score) pairs, most relevant first
+    """
+    records = get_cached_entries(world_path)
+    index = _get_entry_index(world_path, records)
+    scores = index.score(tokenize(query))
+
+    ranked = [(record, scores.get(record["file"], 0.0)) for record in records]
+    ranked.sort(
+        key=lambda item: (
+            -item[1],
+            item[0]["taxonomy"] != taxonomy,
+            item[0]["title"].lower(),
+        )
+    )
+    return ranked
+
+
+def _get_entry_index(world_path: Path, records: List[Dict[str, Any]]) -> BM25Index:
+    """Get a world's ranking index, re-indexing only entries that changed."""
+    key = str(world_path.resolve())
+    with _indexes_lock:
+        index = _indexes.pop(key, None) or BM25Index()
+        _indexes[key] = index
+        while len(_indexes) > WORLD_CACHE_MAX_WORLDS:
+            _indexes.popitem(last=False)
+
+        current = set()
+        for record in records:
+            doc_id = record["file"]
+            current.add(doc_id)
+            stamp = (record.get("mtime"), record.get("size"))
+            if doc_id not in index or index.stamps.get(doc_id) != stamp:
+                index.add(doc_id, _entry_terms(record), stamp)
+        for doc_id in [doc_id for doc_id in index.lengths if doc_id not in current]:
+            index.remove(doc_id)
+        return index
+
+
+def _entry_terms(record: Dict[str, Any]) -> List[str]:
+    """Collect the terms an entry is ranked on; the title counts twice."""
+    title_terms = tokenize(f"{record['title']} {record['name']}")
+    return (
+        title_terms
+        + title_terms
+        + tokenize(record["taxonomy"].replace("-", " "))
+        + tokenize(str(record["frontmatter"].get("description", "")))
+    )
@@ -0,0 +1,319 @@
+"""Full-text search index over world content.
+
+Entry bodies, frontmatter descriptions and taxonomy overviews are indexed
+for BM25 ranking. The index is stored under ``metadata/search/`` with one
+shard per taxonomy, so writing an entry only rewrites its own taxonomy's
+shard, and the loaded index is kept in memory so a query only walks the
+posting lists of its own terms. Files are re-read only when their size or
+modification time changes.
+"""
+
+import heapq
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..config import (
+    MARKDOWN_EXTENSION,
+    METADATA_DIRECTORY,
+    SEARCH_DEFAULT_LIMIT,
+    SEARCH_INDEX_DIRECTORY,
+    SEARCH_INDEX_VERSION,
+    SEARCH_SNIPPET_CHARS,
+    SEARCH_TITLE_WEIGHT,
+    TAXONOMY_OVERVIEW_SUFFIX,
+    WORLD_CACHE_MAX_WORLDS,
+)
+from .content_parsing import extract_frontmatter, extract_markdown_title
+from .relevance import BM25Index, tokenize
+from .world_cache import get_cached_entries
+
+# Shard holding the taxonomy overviews
+TAXONOMY_SHARD = "_taxonomies"
+
+# Search indexes of recently used worlds
+_indexes: "OrderedDict[str, _WorldSearchIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+class _WorldSearchIndex:
+    """Loaded search index of one world."""
+
+    def __init__(self, world_path: Path):
+        self.world_path = world_path
+        self.bm25 = BM25Index()
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.dirty_shards: Set[str] = set()
+        self._load()
+
+    def refresh(self) -> None:
+        """Re-index every changed file and drop files that no longer exist."""
+        current = set()
+        for doc_id, taxonomy, kind, stamp in _list_sources(self.world_path):
+            current.add(doc_id)
+            document = self.documents.get(doc_id)
+            if not document or (document["mtime"], document["size"]) != stamp:
+                self.index_file(doc_id, taxonomy, kind)
+        for doc_id in [doc_id for doc_id in self.documents if doc_id not in current]:
+            self.remove(doc_id)
+
+    def index_file(self, doc_id: str, taxonomy: str, kind: str) -> None:
+        """Read, tokenize and index one file, replacing any earlier version."""
+        file_path = self.world_path / doc_id
+        try:
+            stat = file_path.stat()
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            self.remove(doc_id)
+            return
+
+        frontmatter, body = extract_frontmatter(content)
+        title = extract_markdown_title(body) or file_path.stem.replace("-", " ").title()
+        terms = (
+            tokenize(title) * SEARCH_TITLE_WEIGHT
+            + tokenize(taxonomy.replace("-", " "))
+            + tokenize(str(frontmatter.get("description", "")))
+            + tokenize(body)
+        )
+        self.bm25.add(doc_id, terms)
+        self.documents[doc_id] = {
+            "title": title,
+            "taxonomy": taxonomy,
+            "kind": kind,
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+        }
+        self.dirty_shards.add(_shard_name(taxonomy, kind))
+
+    def remove(self, doc_id: str) -> None:
+        """Drop a file from the index."""
+        document = self.documents.pop(doc_id, None)
+        if document is not None:
+            self.bm25.remove(doc_id)
+            self.dirty_shards.add(_shard_name(document["taxonomy"], document["kind"]))
+
+    def save(self) -> None:
+        """Write every shard changed since the last save."""
+        search_path = get_search_index_path(self.world_path)
+        for shard in self.dirty_shards:
+            documents = {
+                doc_id: {
+                    **document,
+                    "terms": {
+                        term: self.bm25.postings[term][doc_id]
+                        for term in self.bm25.document_terms[doc_id]
+                    },
+                }
+                for doc_id, document in self.documents.items()
+                if _shard_name(document["taxonomy"], document["kind"]) == shard
+            }
+            _write_shard(search_path / f"{shard}.json", documents)
+        self.dirty_shards.clear()
+
+    def _load(self) -> None:
+        """Load every stored shard."""
+        search_path = get_search_index_path(self.world_path)
+        if not search_path.exists():
+            return
+        for shard_path in sorted(search_path.glob("*.json")):
+            for doc_id, document in _read_shard(shard_path).items():
+                terms = document.pop("terms", {})
+                self.bm25.add(doc_id, terms)
+                self.documents[doc_id] = document
+
+
+def search_world_index(
+    world_path: Path,
+    query: str,
+    taxonomy: str = "",
+    limit: int = SEARCH_DEFAULT_LIMIT,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Run a ranked full-text query over a world.
+
+    Args:
+        world_path: Path to the world directory
+        query: Free-text query
+        taxonomy: Only return entries of this taxonomy (slug), if given
+        limit: Maximum number of results
+
+    Returns:
+        Tuple of the top results (file, title, taxonomy, kind, score and
+        snippet, best first) and the total number of matching files
+    """
+    query_terms = tokenize(query)
+    with _indexes_lock:
+        index = _get_index(world_path)
+        index.refresh()
+        index.save()
+
+        scores = index.bm25.score(query_terms)
+        if taxonomy:
+            scores = {
+                doc_id: score
+                for doc_id, score in scores.items()
+                if index.documents[doc_id]["taxonomy"] == taxonomy
+            }
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        documents = {doc_id: dict(index.documents[doc_id]) for doc_id, _ in top}
+
+    results = []
+    for doc_id, score in top:
+        document = documents[doc_id]
+        results.append(
+            {
+                "file": doc_id,
+                "title": document["title"],
+                "taxonomy": document["taxonomy"],
+                "kind": document["kind"],
+                "score": score,
+                "snippet": _make_snippet(world_path / doc_id, query_terms),
+            }
+        )
+    return results, len(scores)
+
+
+def update_search_index(
+    world_path: Path, entry_files: Optional[List[Path]] = None
+) -> None:
+    """Bring the search index up to date and write the changed shards.
+
+    With ``entry_files`` only those entries are re-indexed, which is what the
+    tools do right after writing them. Without it every changed file is.
+
+    Args:
+        world_path: Path to the world directory
+        entry_files: Entry files that were just written, or None for a full refresh
+    """
+    with _indexes_lock:
+        index = _get_index(world_path)
+        if entry_files is None:
+            index.refresh()
+        else:
+            for entry_file in entry_files:
+                index.index_file(
+                    entry_file.relative_to(world_path).as_posix(),
+                    entry_file.parent.name,
+                    "entry",
+                )
+        index.save()
+
+
+def get_search_index_path(world_path: Path) -> Path:
+    """Get the directory holding a world's search index shards.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        Path to ``metadata/search/``
+    """
+    return world_path / METADATA_DIRECTORY / SEARCH_INDEX_DIRECTORY
+
+
+def _get_index(world_path: Path) -> _WorldSearchIndex:
+    """Get a world's loaded index, loading it on first use (caller holds the lock)."""
+    key = str(world_path.resolve())
+    index = _indexes.pop(key, None) or _WorldSearchIndex(world_path)
+    _indexes[key] = index
+    while len(_indexes) > WORLD_CACHE_MAX_WORLDS:
+        _indexes.popitem(last=False)
+    return index
+
+
+def _list_sources(world_path: Path) -> List[Tuple[str, str, str, Tuple[int, int]]]:
+    """List the searchable files as (path, taxonomy, kind, (mtime, size))."""
+    sources = [
+        (
+            Path(record["file"]).as_posix(),
+            record["taxonomy"],
+            "entry",
+            (record["mtime"], record["size"]),
+        )
+        for record in get_cached_entries(world_path)
+    ]
+
+    overview_suffix = f"{TAXONOMY_OVERVIEW_SUFFIX}{MARKDOWN_EXTENSION}"
+    taxonomies_path = world_path / "taxonomies"
+    if taxonomies_path.exists():
+        for overview_file in taxonomies_path.glob(f"*{overview_suffix}"):
+            try:
+                stat = overview_file.stat()
+            except OSError:
+                continue
+            sources.append(
+                (
+                    overview_file.relative_to(world_path).as_posix(),
+                    overview_file.name[: -len(overview_suffix)],
+                    "taxonomy",
+                    (stat.st_mtime_ns, stat.st_size),
+                )
+            )
+    return sources
+
+
+def _shard_name(taxonomy: str, kind: str) -> str:
+    """Get the shard a document is stored in."""
+    return TAXONOMY_SHARD if kind == "taxonomy" else taxonomy
+
+
+def _make_snippet(file_path: Path, query_terms: List[str]) -> str:
+    """Cut the passage around the first query term out of a file's body."""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            _, body = extract_frontmatter(f.read())
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+    # Headings and rules make poor snippets
+    lines = [
+        line for line in body.split("\n") if not line.lstrip().startswith(("#", "---"))
+    ]
+    text = " ".join(" ".join(lines).split())
+    if not query_terms:
+        return text[:SEARCH_SNIPPET_CHARS]
+
+    pattern = re.compile(
+        r"\b(" + "|".join(re.escape(term) for term in set(query_terms)) + r")\w*",
+        re.IGNORECASE,
+    )
+    match = pattern.search(text)
+    start = max(0, match.start() - SEARCH_SNIPPET_CHARS // 3) if match else 0
+    end = min(len(text), start + SEARCH_SNIPPET_CHARS)
+    snippet = pattern.sub(lambda m: f"**{m.group(0)}**", text[start:end])
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
+
+
+def _read_shard(shard_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Read a stored shard, treating missing or outdated files as empty."""
+    try:
+        with open(shard_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get("version") != SEARCH_INDEX_VERSION:
+        return {}
+
+    documents = data.get("documents")
+    return documents if isinstance(documents, dict) else {}
+
+
+def _write_shard(shard_path: Path, documents: Dict[str, Dict[str, Any]]) -> None:
+    """Write a shard through a temporary file so readers never see a partial file."""
+    try:
+        shard_path.parent.mkdir(parents=True, exist_ok=True)
+        if not documents:
+            shard_path.unlink(missing_ok=True)
+            return
+        temp_path = shard_path.with_name(f".{shard_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": SEARCH_INDEX_VERSION, "documents": documents}, f)
+        os.replace(temp_path, shard_path)
+    except OSError:
+        # The index is rebuilt from the world files on the next search
+        pass
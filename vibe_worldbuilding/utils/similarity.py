@@ -0,0 +1,203 @@
+"""Entry similarity for consistency analysis.
+
+Every entry is turned into a hashed TF-IDF vector over its title,
+description and body, and the cosine similarity of all entry pairs is
+computed with matrix products a block of rows at a time, keeping only the
+most similar pairs of each block. Pairs that are
+nearly identical are likely duplicates; pairs that are clearly related but
+do not link to each other are missing cross-references. Together with the
+entries the link manifest shows as orphaned, they tell the consistency
+analysis which entries are worth the LLM's attention.
+
+Term counts are cached per world and recomputed only for entries whose size
+or modification time changed. Without NumPy no analysis is done.
+"""
+
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..config import (
+    DUPLICATE_SIMILARITY_THRESHOLD,
+    NUMPY_AVAILABLE,
+    RELATED_SIMILARITY_THRESHOLD,
+    SIMILARITY_BLOCK_ROWS,
+    SIMILARITY_FEATURES,
+    SIMILARITY_MAX_PAIRS,
+    WORLD_CACHE_MAX_WORLDS,
+)
+from .content_parsing import extract_frontmatter
+from .link_manifest import get_link_manifest
+from .relevance import tokenize
+from .world_cache import get_cached_entries
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# Hashed term counts of recently analyzed worlds: file -> (stamp, indices, counts)
+_features: "OrderedDict[str, Dict[str, Tuple[Any, Any, Any]]]" = OrderedDict()
+_features_lock = threading.Lock()
+
+
+def find_consistency_candidates(
+    world_path: Path, max_pairs: int = SIMILARITY_MAX_PAIRS
+) -> Optional[Dict[str, List[Any]]]:
+    """Find the entries of a world most likely to have consistency issues.
+
+    Args:
+        world_path: Path to the world directory
+        max_pairs: Maximum number of pairs reported per kind
+
+    Returns:
+        Dictionary with ``duplicates`` and ``unlinked`` lists of
+        (file, file, similarity) tuples, most similar first, and an
+        ``orphans`` list of files; None if NumPy is not installed
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+
+    records = get_cached_entries(world_path)
+    candidates: Dict[str, List[Any]] = {
+        "duplicates": [],
+        "unlinked": [],
+        "orphans": [],
+    }
+    if not records:
+        return candidates
+
+    manifest = get_link_manifest(world_path)
+    rows = {
+        f"{record['taxonomy']}/{record['slug']}": row
+        for row, record in enumerate(records)
+    }
+    linked = set()
+    for key, entry in manifest.items():
+        if key not in rows:
+            continue
+        for link in entry["links"]:
+            target = rows.get(f"{link['taxonomy']}/{link['slug']}")
+            if target is not None and target != rows[key]:
+                linked.add((min(rows[key], target), max(rows[key], target)))
+        if not entry["links"] and not entry["backlinks"]:
+            candidates["orphans"].append(records[rows[key]]["file"])
+
+    duplicates, unlinked = _similar_pairs(world_path, records, linked, max_pairs)
+    for kind, pairs in (("duplicates", duplicates), ("unlinked", unlinked)):
+        candidates[kind] = [
+            (records[first]["file"], records[second]["file"], similarity)
+            for first, second, similarity in pairs
+        ]
+    candidates["orphans"].sort()
+    return candidates
+
+
+def _similar_pairs(
+    world_path: Path,
+    records: List[Dict[str, Any]],
+    linked: Set[Tuple[int, int]],
+    max_pairs: int,
+) -> Tuple[List[Tuple[int, int, float]], List[Tuple[int, int, float]]]:
+    """Find the most similar duplicate and unlinked related record pairs.
+
+    Returns:
+        Up to ``max_pairs`` duplicate pairs and up to ``max_pairs`` related
+        pairs that are not linked, as (row, row, similarity), most similar first
+    """
+    matrix = np.zeros((len(records), SIMILARITY_FEATURES), dtype=np.float32)
+    for row, (indices, counts) in enumerate(_get_entry_features(world_path, records)):
+        matrix[row, indices] = counts
+
+    # Sublinear term frequency weighted by smoothed inverse document frequency
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    idf = np.log((1 + len(records)) / (1 + document_frequency)) + 1
+    matrix = np.log1p(matrix) * idf.astype(np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    matrix /= norms
+
+    linked_pairs = np.array(sorted(linked), dtype=np.int64).reshape(-1, 2)
+    duplicates: List[Tuple[int, int, float]] = []
+    unlinked: List[Tuple[int, int, float]] = []
+    for start in range(0, len(records), SIMILARITY_BLOCK_ROWS):
+        # Each pair once: only columns after the row's own record
+        block = np.triu(
+            matrix[start : start + SIMILARITY_BLOCK_ROWS] @ matrix.T, k=start + 1
+        )
+        duplicates.extend(
+            _top_pairs(block, start, block >= DUPLICATE_SIMILARITY_THRESHOLD, max_pairs)
+        )
+
+        related = (block >= RELATED_SIMILARITY_THRESHOLD) & (
+            block < DUPLICATE_SIMILARITY_THRESHOLD
+        )
+        in_block = (linked_pairs[:, 0] >= start) & (
+            linked_pairs[:, 0] < start + len(block)
+        )
+        related[linked_pairs[in_block, 0] - start, linked_pairs[in_block, 1]] = False
+        unlinked.extend(_top_pairs(block, start, related, max_pairs))
+
+    duplicates.sort(key=lambda pair: -pair[2])
+    unlinked.sort(key=lambda pair: -pair[2])
+    return duplicates[:max_pairs], unlinked[:max_pairs]
+
+
+def _top_pairs(
+    block: Any, start: int, mask: Any, limit: int
+) -> List[Tuple[int, int, float]]:
+    """Pick the most similar pairs of a block among those selected by a mask."""
+    rows, columns = np.nonzero(mask)
+    values = block[rows, columns]
+    if len(values) > limit:
+        keep = np.argpartition(-values, limit)[:limit] if limit > 0 else []
+        rows, columns, values = rows[keep], columns[keep], values[keep]
+    return list(zip((rows + start).tolist(), columns.tolist(), values.tolist()))
+
+
+def _get_entry_features(
+    world_path: Path, records: List[Dict[str, Any]]
+) -> List[Tuple[Any, Any]]:
+    """Get the hashed term counts of each record, re-reading only changed entries."""
+    key = str(world_path.resolve())
+    with _features_lock:
+        cached = _features.pop(key, None) or {}
+        _features[key] = cached
+        while len(_features) > WORLD_CACHE_MAX_WORLDS:
+            _features.popitem(last=False)
+
+        features = []
+        current = set()
+        for record in records:
+            current.add(record["file"])
+            stamp = (record["mtime"], record["size"])
+            entry = cached.get(record["file"])
+            if entry is None or entry[0] != stamp:
+                entry = (stamp, *_hash_terms(_entry_terms(world_path, record)))
+                cached[record["file"]] = entry
+            features.append(entry[1:])
+        for doc_id in [doc_id for doc_id in cached if doc_id not in current]:
+            del cached[doc_id]
+        return features
+
+
+def _entry_terms(world_path: Path, record: Dict[str, Any]) -> List[str]:
+    """Collect the terms an entry is compared on."""
+    try:
+        with open(world_path / record["file"], "r", encoding="utf-8") as f:
+            _, body = extract_frontmatter(f.read())
+    except (OSError, UnicodeDecodeError):
+        body = ""
+    description = str(record["frontmatter"].get("description", ""))
+    return tokenize(f"{record['title']} {description} {body}")
+
+
+def _hash_terms(terms: List[str]) -> Tuple[Any, Any]:
+    """Count terms into hashed feature columns."""
+    counts: Counter = Counter()
+    for term, count in Counter(terms).items():
+        counts[zlib.crc32(term.encode("utf-8")) % SIMILARITY_FEATURES] += count
+    return (
+        np.fromiter(counts.keys(), dtype=np.int64, count=len(counts)),
+        np.fromiter(counts.values(), dtype=np.float32, count=len(counts)),
+    )
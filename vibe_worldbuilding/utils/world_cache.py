@@ -0,0 +1,494 @@
+"""In-process world cache for the long-lived MCP server.
+
+The stdio server runs for a whole authoring session, so parsed world state
+(the entry index, the world overview and taxonomy contexts) is kept in an
+LRU cache keyed by world path. Writes made through the tools update the
+cache directly. Changes made outside the tools are reported by a filesystem
+watcher (watchdog, i.e. inotify on Linux, when installed; stat polling
+otherwise) and only the changed files are re-read on the next access.
+
+The cache is disabled by default so scripts and tests always read from disk;
+the server enables it at startup with ``enable_world_cache``.
+"""
+
+import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from ..config import (
+    MARKDOWN_EXTENSION,
+    WORLD_CACHE_MAX_WORLDS,
+    WORLD_CACHE_POLL_INTERVAL_SECONDS,
+)
+from .world_index import (
+    get_indexed_entries,
+    load_world_index,
+    refresh_index_records,
+    save_world_index,
+    update_index_entries,
+)
+
+# Check for optional filesystem notification support
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+# World folders whose files feed the cache
+WATCHED_DIRECTORIES = ("overview", "taxonomies", "entries")
+
+# Watchdog event types that mean a file's content or presence changed
+CHANGE_EVENT_TYPES = {"created", "modified", "deleted", "moved"}
+
+# Functions told about changed entry files, see ``add_entry_listener``
+_entry_listeners: List[Callable[[Path, Optional[List[str]], Dict], None]] = []
+
+
+class _CachedWorld:
+    """Parsed state of a single world plus changes reported since last access."""
+
+    def __init__(self, world_path: Path):
+        self.world_path = world_path
+        self.entries: Optional[Dict[str, Dict[str, Any]]] = None
+        # Sorted keys of ``entries``, rebuilt after entries change
+        self.sorted_files: Optional[List[str]] = None
+        self.parsed_files: Dict[str, Dict[Callable, Any]] = {}
+        self.pending_changes: Set[str] = set()
+        self.snapshot: Dict[str, Tuple[int, int]] = {}
+        self.watch: Any = None
+        self.lock = threading.Lock()
+
+    def mark_changed(self, relative_path: str) -> None:
+        """Record a changed path reported by a watcher thread."""
+        with self.lock:
+            self.pending_changes.add(relative_path)
+
+    def apply_pending_changes(self) -> None:
+        """Drop or refresh cached state for every path changed since last access."""
+        with self.lock:
+            changes, self.pending_changes = self.pending_changes, set()
+
+        changed_entries = []
+        reload_entries = False
+        for relative_path in changes:
+            self.parsed_files.pop(relative_path, None)
+            if _is_entry_path(relative_path):
+                changed_entries.append(relative_path)
+            elif relative_path.startswith("entries"):
+                # A taxonomy directory was created, moved or removed
+                reload_entries = True
+
+        records: Dict[str, Dict[str, Any]] = {}
+        if self.entries is not None and reload_entries:
+            self.entries = None
+            self.sorted_files = None
+        elif self.entries is not None:
+            stale = [path for path in changed_entries if not self._record_matches(path)]
+            if stale:
+                records = refresh_index_records(
+                    self.world_path,
+                    self.entries,
+                    [self.world_path / path for path in stale],
+                )
+                save_world_index(self.world_path, self.entries)
+                self.sorted_files = None
+
+        if changed_entries or reload_entries:
+            _notify_entry_listeners(
+                self.world_path, None if reload_entries else changed_entries, records
+            )
+
+    def poll(self) -> None:
+        """Compare a fresh stat snapshot with the previous one and record changes."""
+        snapshot = _take_snapshot(self.world_path)
+        with self.lock:
+            previous, self.snapshot = self.snapshot, snapshot
+            for relative_path in previous.keys() | snapshot.keys():
+                if previous.get(relative_path) != snapshot.get(relative_path):
+                    self.pending_changes.add(relative_path)
+
+    def record_writes(
+        self, records: Dict[str, Dict[str, Any]], paths: List[str]
+    ) -> None:
+        """Fold entries written by the tools into the cached state.
+
+        The polling snapshot is updated too, so a later external change to a
+        file we just wrote is still seen as a change.
+        """
+        with self.lock:
+            for relative_path in paths:
+                record = records.get(relative_path)
+                if record is None:
+                    self.snapshot.pop(relative_path, None)
+                else:
+                    self.snapshot[relative_path] = (record["mtime"], record["size"])
+
+    def _record_matches(self, relative_path: str) -> bool:
+        """Check whether the cached record already reflects the file on disk.
+
+        Our own writes are recorded directly, so the watcher event they cause
+        costs a ``stat`` rather than a second read of the file.
+        """
+        record = self.entries.get(relative_path) if self.entries else None
+        try:
+            stat = (self.world_path / relative_path).stat()
+        except OSError:
+            return record is None
+        return (
+            record is not None
+            and record.get("mtime") == stat.st_mtime_ns
+            and record.get("size") == stat.st_size
+        )
+
+
+class WorldCache:
+    """LRU cache of parsed worlds with filesystem-change invalidation."""
+
+    def __init__(
+        self,
+        max_worlds: int = WORLD_CACHE_MAX_WORLDS,
+        poll_interval: float = WORLD_CACHE_POLL_INTERVAL_SECONDS,
+        use_watchdog: bool = WATCHDOG_AVAILABLE,
+    ):
+        self.max_worlds = max_worlds
+        self.poll_interval = poll_interval
+        self._worlds: "OrderedDict[str, _CachedWorld]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._observer = None
+        self._poll_thread: Optional[threading.Thread] = None
+
+        if use_watchdog and WATCHDOG_AVAILABLE:
+            self._observer = Observer()
+            self._observer.daemon = True
+            self._observer.start()
+        else:
+            self._poll_thread = threading.Thread(
+                target=self._poll_loop, name="world-cache-poller", daemon=True
+            )
+            self._poll_thread.start()
+
+    def get_world(self, world_path: Path) -> _CachedWorld:
+        """Get the cached state for a world, applying any pending changes.
+
+        Args:
+            world_path: Path to the world directory
+
+        Returns:
+            Cached world state, most recently used
+        """
+        key = str(world_path.resolve())
+        with self._lock:
+            world = self._worlds.get(key)
+            if world is None:
+                world = _CachedWorld(Path(key))
+                self._start_watching(world)
+                self._worlds[key] = world
+                while len(self._worlds) > self.max_worlds:
+                    _, evicted = self._worlds.popitem(last=False)
+                    self._stop_watching(evicted)
+            else:
+                self._worlds.move_to_end(key)
+
+        world.apply_pending_changes()
+        return world
+
+    def close(self) -> None:
+        """Stop all watchers and forget every cached world."""
+        self._stop.set()
+        with self._lock:
+            for world in self._worlds.values():
+                self._stop_watching(world)
+            self._worlds.clear()
+        if self._observer is not None:
+            self._observer.stop()
+
+    def _start_watching(self, world: _CachedWorld) -> None:
+        """Begin reporting changes for a newly cached world."""
+        if self._observer is not None:
+            world.watch = self._observer.schedule(
+                _WorldEventHandler(world), str(world.world_path), recursive=True
+            )
+        else:
+            world.snapshot = _take_snapshot(world.world_path)
+
+    def _stop_watching(self, world: _CachedWorld) -> None:
+        """Stop reporting changes for an evicted world."""
+        if self._observer is not None and world.watch is not None:
+            try:
+                self._observer.unschedule(world.watch)
+            except (KeyError, OSError):
+                pass
+        world.watch = None
+
+    def _poll_loop(self) -> None:
+        """Poll cached worlds for changes until the cache is closed."""
+        while not self._stop.wait(self.poll_interval):
+            with self._lock:
+                worlds = list(self._worlds.values())
+            for world in worlds:
+                try:
+                    world.poll()
+                except OSError:
+                    continue
+
+
+if WATCHDOG_AVAILABLE:
+
+    class _WorldEventHandler(FileSystemEventHandler):
+        """Forward watchdog events for one world to its cached state."""
+
+        def __init__(self, world: _CachedWorld):
+            super().__init__()
+            self.world = world
+
+        def on_any_event(self, event) -> None:
+            if event.event_type not in CHANGE_EVENT_TYPES:
+                return
+            for path in (event.src_path, getattr(event, "dest_path", "")):
+                relative_path = _relative_watched_path(self.world.world_path, path)
+                if relative_path:
+                    self.world.mark_changed(relative_path)
+
+
+_world_cache: Optional[WorldCache] = None
+
+
+def enable_world_cache(
+    max_worlds: int = WORLD_CACHE_MAX_WORLDS,
+    poll_interval: float = WORLD_CACHE_POLL_INTERVAL_SECONDS,
+    use_watchdog: bool = WATCHDOG_AVAILABLE,
+) -> WorldCache:
+    """Enable the process-wide world cache.
+
+    Args:
+        max_worlds: Maximum number of worlds kept in memory
+        poll_interval: Seconds between stat polls when watchdog is unavailable
+        use_watchdog: Whether to use filesystem notifications when available
+
+    Returns:
+        The active world cache
+    """
+    global _world_cache
+    disable_world_cache()
+    _world_cache = WorldCache(max_worlds, poll_interval, use_watchdog)
+    return _world_cache
+
+
+def disable_world_cache() -> None:
+    """Disable the process-wide world cache and stop its watchers."""
+    global _world_cache
+    if _world_cache is not None:
+        _world_cache.close()
+        _world_cache = None
+
+
+def get_cached_entries(world_path: Path) -> List[Dict[str, Any]]:
+    """Get all entry records for a world, ordered by taxonomy and slug.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        List of entry records; callers must treat them as read-only
+    """
+    if _world_cache is None:
+        return get_indexed_entries(world_path)
+
+    world = _get_world_entries(world_path)
+    return [world.entries[relative_path] for relative_path in world.sorted_files]
+
+
+def iter_cached_entries(world_path: Path, after: str = "") -> Iterator[Dict[str, Any]]:
+    """Iterate over a world's entry records in file path order.
+
+    With the cache enabled the records come from the in-memory index, and
+    ``after`` is found by bisecting its sorted paths, so reading one page
+    of a large world costs that page rather than a pass over every entry.
+
+    Args:
+        world_path: Path to the world directory
+        after: Only entries whose file path sorts after this one, if given
+
+    Returns:
+        Iterator over entry records; callers must treat them as read-only
+    """
+    if _world_cache is None:
+        # Nothing reports outside edits, so the index is refreshed from disk
+        records = get_indexed_entries(world_path)
+        return (record for record in records if record["file"] > after)
+
+    world = _get_world_entries(world_path)
+    entries, files = world.entries, world.sorted_files
+    start = bisect_right(files, after) if after else 0
+    return (entries[files[index]] for index in range(start, len(files)))
+
+
+def record_entry_writes(
+    world_path: Path, entry_files: List[Path]
+) -> Dict[str, Dict[str, Any]]:
+    """Record entries that a tool has just written in the index and the cache.
+
+    Args:
+        world_path: Path to the world directory
+        entry_files: Paths to the entry files that were written
+
+    Returns:
+        Dictionary mapping relative entry paths to their new records
+    """
+    relative_paths = [
+        str(entry_file.relative_to(world_path)) for entry_file in entry_files
+    ]
+    world = _world_cache.get_world(world_path) if _world_cache is not None else None
+    if world is not None and world.entries is not None:
+        records = refresh_index_records(world_path, world.entries, entry_files)
+        save_world_index(world_path, world.entries)
+        world.record_writes(records, relative_paths)
+        world.sorted_files = None
+    else:
+        records = update_index_entries(world_path, entry_files)
+
+    _notify_entry_listeners(world_path, relative_paths, records)
+    return records
+
+
+def refresh_world(world_path: Path) -> bool:
+    """Apply the changes reported for a world since it was last accessed.
+
+    Listeners are told about the changed entry files. The world starts being
+    watched if it was not cached yet.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        True if the world is watched, False if the cache is disabled and
+        changes made outside the tools go unreported
+    """
+    if _world_cache is None:
+        return False
+    _world_cache.get_world(world_path)
+    return True
+
+
+def add_entry_listener(
+    listener: Callable[[Path, Optional[List[str]], Dict[str, Dict[str, Any]]], None],
+) -> None:
+    """Register a function told about entry files that changed.
+
+    The listener is called with the world path, the relative paths of the
+    entry files written by the tools or reported by the watcher (None when a
+    taxonomy directory changed and any entry may have), and the fresh
+    records of those files that are already known.
+
+    Args:
+        listener: Function to call after entry files change
+    """
+    if listener not in _entry_listeners:
+        _entry_listeners.append(listener)
+
+
+def read_world_file(
+    world_path: Path, relative_path: str, parser: Callable[[str], Any]
+) -> Any:
+    """Read and parse a world file, reusing the cached result when unchanged.
+
+    Args:
+        world_path: Path to the world directory
+        relative_path: File path relative to the world directory
+        parser: Function turning the file content into the cached value
+
+    Returns:
+        Parsed value, or None if the file does not exist or cannot be read
+    """
+    world = _world_cache.get_world(world_path) if _world_cache is not None else None
+    if world is not None:
+        cached = world.parsed_files.get(relative_path, {})
+        if parser in cached:
+            return cached[parser]
+
+    try:
+        with open(world_path / relative_path, "r", encoding="utf-8") as f:
+            value = parser(f.read())
+    except (OSError, UnicodeDecodeError):
+        value = None
+
+    if world is not None:
+        world.parsed_files.setdefault(relative_path, {})[parser] = value
+    return value
+
+
+def _get_world_entries(world_path: Path) -> _CachedWorld:
+    """Get a cached world with its entry index and sorted paths loaded."""
+    world = _world_cache.get_world(world_path)
+    if world.entries is None:
+        world.entries = load_world_index(world_path)
+    if world.sorted_files is None:
+        world.sorted_files = sorted(world.entries)
+    return world
+
+
+def _notify_entry_listeners(
+    world_path: Path,
+    relative_paths: Optional[List[str]],
+    records: Dict[str, Dict[str, Any]],
+) -> None:
+    """Tell every registered listener about changed entry files."""
+    for listener in _entry_listeners:
+        listener(world_path, relative_paths, records)
+
+
+def _is_entry_path(relative_path: str) -> bool:
+    """Check whether a relative path names an entry file."""
+    parts = relative_path.split("/")
+    return (
+        len(parts) == 3
+        and parts[0] == "entries"
+        and parts[2].endswith(MARKDOWN_EXTENSION)
+    )
+
+
+def _relative_watched_path(world_path: Path, path: str) -> Optional[str]:
+    """Convert a watcher path to a world-relative path if the cache cares about it."""
+    if not path:
+        return None
+    try:
+        relative_path = Path(path).relative_to(world_path).as_posix()
+    except ValueError:
+        return None
+    return relative_path if relative_path.startswith(WATCHED_DIRECTORIES) else None
+
+
+def _take_snapshot(world_path: Path) -> Dict[str, Tuple[int, int]]:
+    """Stat every watched file in a world for polling-based change detection."""
+    snapshot: Dict[str, Tuple[int, int]] = {}
+    for directory in WATCHED_DIRECTORIES:
+        base = world_path / directory
+        if not base.exists():
+            continue
+        scan_dirs = [base]
+        if directory == "entries":
+            scan_dirs = [item for item in base.iterdir() if item.is_dir()]
+            # Taxonomy directories themselves are tracked so renames reload entries
+            for item in scan_dirs:
+                snapshot[f"entries/{item.name}"] = (0, 0)
+        for scan_dir in scan_dirs:
+            try:
+                with os.scandir(scan_dir) as it:
+                    for dir_entry in it:
+                        if dir_entry.name.endswith(MARKDOWN_EXTENSION):
+                            stat = dir_entry.stat()
+                            relative_path = Path(dir_entry.path).relative_to(world_path)
+                            snapshot[relative_path.as_posix()] = (
+                                stat.st_mtime_ns,
+                                stat.st_size,
+                            )
+            except OSError:
+                continue
+    return snapshot
@@ -0,0 +1,557 @@
+"""Optional SQLite store of world metadata.
+
+When enabled (``VIBE_WORLD_DB=1``), entries, their frontmatter fields,
+cross-links, images and taxonomies are kept in ``metadata/world.db`` so the
+tools can answer lookups such as "entries of a taxonomy", "entries without a
+description" or "the files of these entry names" with indexed queries. The
+database runs in WAL mode, so a site build or an external reader never
+blocks the tools.
+
+The markdown files stay the source of truth. Entry and frontmatter rows are
+reconciled with the entry index when a world is first queried in a process;
+after that only the rows of entries written by the tools or reported by the
+server's world cache watcher are rewritten, so a query does not touch the
+entry files. Without the world cache (scripts and tests) nothing reports
+outside edits, and every query reconciles the entry rows first. Link,
+taxonomy and image rows are refreshed before a query from the link
+manifest, the taxonomy overviews and the image directories whose stamps
+changed. The file can be deleted at any time and is rebuilt on the next
+query.
+
+Without the store, the same queries are answered from the entry index.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..config import (
+    IMAGE_RENDITIONS_DIRECTORY,
+    IMAGE_SOURCE_EXTENSIONS,
+    MARKDOWN_EXTENSION,
+    METADATA_DIRECTORY,
+    TAXONOMY_OVERVIEW_SUFFIX,
+    WORLD_CACHE_MAX_WORLDS,
+    WORLD_DB_ENABLED,
+    WORLD_DB_FILENAME,
+    WORLD_DB_VERSION,
+)
+from .link_manifest import get_link_manifest_path, read_link_manifest
+from .world_cache import (
+    add_entry_listener,
+    get_cached_entries,
+    iter_cached_entries,
+    refresh_world,
+)
+from .world_index import refresh_index_records
+
+SCHEMA = """
+CREATE TABLE entries (
+    file TEXT PRIMARY KEY,
+    taxonomy TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    name TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX entries_taxonomy ON entries (taxonomy, slug);
+CREATE INDEX entries_name ON entries (name);
+CREATE INDEX entries_missing_description ON entries (file) WHERE description IS NULL;
+
+CREATE TABLE frontmatter (
+    file TEXT NOT NULL REFERENCES entries (file) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (file, key)
+);
+CREATE INDEX frontmatter_key ON frontmatter (key, value);
+
+CREATE TABLE links (
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    text TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL
+);
+CREATE INDEX links_source ON links (source);
+CREATE INDEX links_target ON links (target);
+
+CREATE TABLE images (
+    file TEXT PRIMARY KEY,
+    taxonomy TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX images_entry ON images (taxonomy, slug);
+
+CREATE TABLE taxonomies (
+    slug TEXT PRIMARY KEY,
+    file TEXT NOT NULL,
+    mtime INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+
+# Columns returned for entries by every query
+ENTRY_COLUMNS = ("file", "taxonomy", "slug", "name", "title", "description")
+
+# Open databases of recently used worlds
+_databases: "OrderedDict[str, _WorldDatabase]" = OrderedDict()
+_databases_lock = threading.Lock()
+
+
+# Stat stamp of a file or directory: modification time and size
+Stamp = Tuple[int, int]
+
+
+class _WorldDatabase:
+    """Connection to one world's database plus the file stamps it holds."""
+
+    def __init__(self, world_path: Path):
+        self.world_path = world_path
+        self.lock = threading.Lock()
+        db_path = get_world_db_path(world_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(
+            str(db_path), check_same_thread=False, isolation_level=None
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self._migrate()
+        # Set when the rows may be out of date and need a full reconcile
+        self.stale = True
+        self.stamps = {
+            file: (mtime, size)
+            for file, mtime, size in self.connection.execute(
+                "SELECT file, mtime, size FROM entries"
+            )
+        }
+        self.taxonomy_stamps = {
+            slug: (mtime, size)
+            for slug, mtime, size in self.connection.execute(
+                "SELECT slug, mtime, size FROM taxonomies"
+            )
+        }
+        self.link_rows: Dict[str, List[Tuple[Any, ...]]] = {}
+        for row in self.connection.execute("SELECT * FROM links ORDER BY rowid"):
+            self.link_rows.setdefault(row[0], []).append(tuple(row))
+        # Stamps of the link manifest and image directories the rows were
+        # filled from in this process; unknown until the first query
+        self.links_stamp: Optional[Stamp] = None
+        self.image_dir_stamps: Dict[str, Stamp] = {}
+
+    def sync_entries(self, records: List[Dict[str, Any]]) -> None:
+        """Bring every entry row in line with the index records (caller holds the lock)."""
+        current = {record["file"]: record for record in records}
+        changed = [
+            record
+            for file, record in current.items()
+            if self.stamps.get(file) != (record["mtime"], record["size"])
+        ]
+        removed = [file for file in self.stamps if file not in current]
+        self._write_entries(changed, removed)
+
+    def update_entries(
+        self, files: List[str], records: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Bring the rows of specific entry files in line with disk (caller holds the lock).
+
+        Args:
+            files: Relative paths of the entry files that changed
+            records: Fresh index records already known for some of the files
+        """
+        changed, removed = [], []
+        for file in files:
+            record = records.get(file)
+            if record is None:
+                try:
+                    stat = (self.world_path / file).stat()
+                except OSError:
+                    if file in self.stamps:
+                        removed.append(file)
+                    continue
+                if self.stamps.get(file) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                record = refresh_index_records(
+                    self.world_path, {}, [self.world_path / file]
+                ).get(file)
+            if record is not None:
+                changed.append(record)
+        self._write_entries(changed, removed)
+
+    def sync_files(self) -> None:
+        """Refresh the link, taxonomy and image rows (caller holds the lock).
+
+        Each source is re-read only when its stamp changed: the link manifest
+        as a whole, each taxonomy overview, and each taxonomy's image
+        directory, whose modification time changes when an image is written
+        or removed.
+        """
+        self._sync_links()
+        self._sync_taxonomies()
+        self._sync_images()
+
+    def close(self) -> None:
+        """Close the connection."""
+        self.connection.close()
+
+    def _sync_links(self) -> None:
+        """Rewrite the link rows of entries whose links changed in the manifest."""
+        stamp = _stamp(get_link_manifest_path(self.world_path))
+        if stamp is not None and stamp == self.links_stamp:
+            return
+
+        rows: Dict[str, List[Tuple[Any, ...]]] = {}
+        for key, entry in read_link_manifest(self.world_path).items():
+            source = f"entries/{key}{MARKDOWN_EXTENSION}"
+            rows[source] = [
+                (
+                    source,
+                    f"entries/{link['taxonomy']}/{link['slug']}{MARKDOWN_EXTENSION}",
+                    link["text"],
+                    link["start"],
+                    link["end"],
+                )
+                for link in entry.get("links", [])
+            ]
+            if not rows[source]:
+                del rows[source]
+
+        changed = [
+            source
+            for source in rows.keys() | self.link_rows.keys()
+            if rows.get(source) != self.link_rows.get(source)
+        ]
+        if changed:
+            with _transaction(self.connection):
+                self.connection.executemany(
+                    "DELETE FROM links WHERE source = ?",
+                    [(source,) for source in changed],
+                )
+                self.connection.executemany(
+                    "INSERT INTO links VALUES (?, ?, ?, ?, ?)",
+                    [row for source in changed for row in rows.get(source, [])],
+                )
+        self.link_rows = rows
+        self.links_stamp = stamp
+
+    def _sync_taxonomies(self) -> None:
+        """Rewrite the rows of taxonomy overviews that changed on disk."""
+        overview_suffix = f"{TAXONOMY_OVERVIEW_SUFFIX}{MARKDOWN_EXTENSION}"
+        current: Dict[str, Stamp] = {}
+        try:
+            with os.scandir(self.world_path / "taxonomies") as scanner:
+                for item in scanner:
+                    if item.name.endswith(overview_suffix) and item.is_file():
+                        stat = item.stat()
+                        current[item.name[: -len(overview_suffix)]] = (
+                            stat.st_mtime_ns,
+                            stat.st_size,
+                        )
+        except OSError:
+            pass
+
+        changed = [
+            slug
+            for slug, stamp in current.items()
+            if self.taxonomy_stamps.get(slug) != stamp
+        ]
+        removed = [slug for slug in self.taxonomy_stamps if slug not in current]
+        if not changed and not removed:
+            return
+
+        with _transaction(self.connection):
+            self.connection.executemany(
+                "DELETE FROM taxonomies WHERE slug = ?",
+                [(slug,) for slug in removed + changed],
+            )
+            self.connection.executemany(
+                "INSERT INTO taxonomies VALUES (?, ?, ?, ?)",
+                [
+                    (slug, f"taxonomies/{slug}{overview_suffix}", *current[slug])
+                    for slug in changed
+                ],
+            )
+        self.taxonomy_stamps = current
+
+    def _sync_images(self) -> None:
+        """Rewrite the image rows of taxonomy image directories that changed."""
+        images_path = self.world_path / "images"
+        current: Dict[str, Stamp] = {}
+        try:
+            with os.scandir(images_path) as scanner:
+                for item in scanner:
+                    if item.is_dir() and item.name != IMAGE_RENDITIONS_DIRECTORY:
+                        stat = item.stat()
+                        current[item.name] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+
+        changed = [
+            taxonomy
+            for taxonomy, stamp in current.items()
+            if self.image_dir_stamps.get(taxonomy) != stamp
+        ]
+        if self.image_dir_stamps.keys() == current.keys() and not changed:
+            return
+
+        rows = []
+        for taxonomy in changed:
+            try:
+                with os.scandir(images_path / taxonomy) as scanner:
+                    for item in scanner:
+                        suffix = os.path.splitext(item.name)[1].lower()
+                        if (
+                            suffix not in IMAGE_SOURCE_EXTENSIONS
+                            or item.name.startswith(".")
+                            or not item.is_file()
+                        ):
+                            continue
+                        stat = item.stat()
+                        rows.append(
+                            (
+                                f"images/{taxonomy}/{item.name}",
+                                taxonomy,
+                                item.name[: -len(suffix)],
+                                stat.st_mtime_ns,
+                                stat.st_size,
+                            )
+                        )
+            except OSError:
+                continue
+
+        with _transaction(self.connection):
+            # Rows of directories never seen in this process are replaced too,
+            # which drops those of directories removed since the last process
+            self.connection.execute(
+                "DELETE FROM images WHERE taxonomy NOT IN "
+                "(SELECT value FROM json_each(?))",
+                (json.dumps(sorted(set(current) - set(changed))),),
+            )
+            self.connection.executemany(
+                "INSERT INTO images VALUES (?, ?, ?, ?, ?)", rows
+            )
+        self.image_dir_stamps = current
+
+    def _write_entries(self, changed: List[Dict[str, Any]], removed: List[str]) -> None:
+        """Rewrite the rows of changed entries and delete those of removed ones."""
+        if not changed and not removed:
+            return
+
+        with _transaction(self.connection):
+            self.connection.executemany(
+                "DELETE FROM entries WHERE file = ?",
+                [(file,) for file in removed + [record["file"] for record in changed]],
+            )
+            self.connection.executemany(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        record["file"],
+                        record["taxonomy"],
+                        record["slug"],
+                        record["name"],
+                        record["title"],
+                        record["frontmatter"].get("description") or None,
+                        record["mtime"],
+                        record["size"],
+                    )
+                    for record in changed
+                ],
+            )
+            self.connection.executemany(
+                "INSERT INTO frontmatter VALUES (?, ?, ?)",
+                [
+                    (record["file"], key, str(value))
+                    for record in changed
+                    for key, value in record["frontmatter"].items()
+                ],
+            )
+
+        for file in removed:
+            del self.stamps[file]
+        for record in changed:
+            self.stamps[record["file"]] = (record["mtime"], record["size"])
+
+    def _migrate(self) -> None:
+        """Create the schema, or recreate it if it is from another version."""
+        (version,) = self.connection.execute("PRAGMA user_version").fetchone()
+        if version == WORLD_DB_VERSION:
+            return
+        with _transaction(self.connection):
+            for table in ("frontmatter", "links", "images", "taxonomies", "entries"):
+                self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+            for statement in SCHEMA.split(";"):
+                if statement.strip():
+                    self.connection.execute(statement)
+            self.connection.execute(f"PRAGMA user_version = {WORLD_DB_VERSION}")
+
+
+@contextmanager
+def _transaction(connection: sqlite3.Connection) -> Iterator[None]:
+    """Run statements in one transaction, rolling back on error."""
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def find_entries(
+    world_path: Path,
+    taxonomy: str = "",
+    names: Optional[Iterable[str]] = None,
+    missing_description: bool = False,
+    after: str = "",
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Look up entries of a world, from the store when it is enabled.
+
+    Args:
+        world_path: Path to the world directory
+        taxonomy: Only entries of this taxonomy (slug), if given
+        names: Only entries with one of these display names, if given
+        missing_description: Only entries without a description
+        after: Only entries whose file path sorts after this one, if given
+        limit: Maximum number of entries to return, if given
+
+    Returns:
+        Entries with file, taxonomy, slug, name, title and description,
+        ordered by file path
+    """
+    names = None if names is None else list(names)
+    if not WORLD_DB_ENABLED:
+        name_set = None if names is None else set(names)
+        entries = []
+        for record in iter_cached_entries(world_path, after):
+            description = record["frontmatter"].get("description") or None
+            if (
+                (taxonomy and record["taxonomy"] != taxonomy)
+                or (name_set is not None and record["name"] not in name_set)
+                or (missing_description and description is not None)
+            ):
+                continue
+            if limit is not None and len(entries) >= limit:
+                break
+            entries.append(
+                {
+                    "file": record["file"],
+                    "taxonomy": record["taxonomy"],
+                    "slug": record["slug"],
+                    "name": record["name"],
+                    "title": record["title"],
+                    "description": description,
+                }
+            )
+        return entries
+
+    conditions, parameters = [], []
+    if taxonomy:
+        conditions.append("taxonomy = ?")
+        parameters.append(taxonomy)
+    if names is not None:
+        conditions.append("name IN (SELECT value FROM json_each(?))")
+        parameters.append(json.dumps(names))
+    if missing_description:
+        conditions.append("description IS NULL")
+    if after:
+        conditions.append("file > ?")
+        parameters.append(after)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    order = "ORDER BY file"
+    if limit is not None:
+        order += " LIMIT ?"
+        parameters.append(limit)
+
+    # Applying the watcher's pending changes updates the rows through
+    # _on_entries_changed; without a watcher the store is reconciled in full
+    watched = refresh_world(world_path)
+    database = _open(world_path)
+    if database.stale or not watched:
+        database.stale = False
+        records = get_cached_entries(world_path)
+        with database.lock:
+            database.sync_entries(records)
+
+    with database.lock:
+        database.sync_files()
+        rows = database.connection.execute(
+            f"SELECT {', '.join(ENTRY_COLUMNS)} FROM entries {where} {order}",
+            parameters,
+        ).fetchall()
+    return [dict(zip(ENTRY_COLUMNS, row)) for row in rows]
+
+
+def get_world_db_path(world_path: Path) -> Path:
+    """Get the path of the metadata store for a world.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        Path to ``metadata/world.db``
+    """
+    return world_path / METADATA_DIRECTORY / WORLD_DB_FILENAME
+
+
+def close_world_dbs() -> None:
+    """Close every open world database."""
+    with _databases_lock:
+        while _databases:
+            _, database = _databases.popitem()
+            database.close()
+
+
+def _open(world_path: Path) -> _WorldDatabase:
+    """Get a world's open database, opening it if needed."""
+    key = str(world_path.resolve())
+    with _databases_lock:
+        database = _databases.pop(key, None)
+        if database is None:
+            database = _WorldDatabase(Path(key))
+        _databases[key] = database
+        while len(_databases) > WORLD_CACHE_MAX_WORLDS:
+            _, evicted = _databases.popitem(last=False)
+            evicted.close()
+    return database
+
+
+def _stamp(path: Path) -> Optional[Stamp]:
+    """Get the stat stamp of a file, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _on_entries_changed(
+    world_path: Path,
+    files: Optional[List[str]],
+    records: Dict[str, Dict[str, Any]],
+) -> None:
+    """Update the rows of an open database after entry files changed."""
+    with _databases_lock:
+        database = _databases.get(str(world_path.resolve()))
+    if database is None:
+        # A database opened later is reconciled on its first query
+        return
+    if files is None:
+        database.stale = True
+        return
+    with database.lock:
+        database.update_entries(files, records)
+
+
+add_entry_listener(_on_entries_changed)
@@ -0,0 +1,213 @@
+"""Persistent per-world entry index.
+
+The index lives in ``metadata/index.json`` and records the slug, taxonomy,
+title, parsed frontmatter, mtime and size of every entry file. Tools read
+entry metadata from the index and only re-parse the files whose mtime or size
+changed since the last refresh, so a listing costs one ``stat`` per entry
+plus a read of the header of each changed file instead of a read of the
+whole world.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import (
+    ENTRY_TITLE_SEARCH_CHARS,
+    MARKDOWN_EXTENSION,
+    METADATA_DIRECTORY,
+    WORLD_INDEX_FILENAME,
+    WORLD_INDEX_VERSION,
+)
+from .content_parsing import extract_markdown_title, read_frontmatter
+
+
+def get_index_path(world_path: Path) -> Path:
+    """Get the path of the entry index file for a world.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        Path to ``metadata/index.json``
+    """
+    return world_path / METADATA_DIRECTORY / WORLD_INDEX_FILENAME
+
+
+def load_world_index(world_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load the entry index for a world, refreshing any stale records.
+
+    Every entry file is stat'ed; only files that are new or whose mtime or
+    size differ from the stored record are read and parsed again. Records
+    for deleted files are dropped. The index file is rewritten only when
+    something changed.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        Dictionary mapping relative entry paths to entry records
+    """
+    stored = _read_index_file(get_index_path(world_path))
+    refreshed: Dict[str, Dict[str, Any]] = {}
+    changed = False
+
+    entries_path = world_path / "entries"
+    if entries_path.exists():
+        for taxonomy_dir in sorted(entries_path.iterdir()):
+            if not taxonomy_dir.is_dir():
+                continue
+            for entry_file in sorted(taxonomy_dir.glob(f"*{MARKDOWN_EXTENSION}")):
+                try:
+                    stat = entry_file.stat()
+                except OSError:
+                    continue
+
+                relative_path = str(entry_file.relative_to(world_path))
+                record = stored.get(relative_path)
+                if not _record_is_current(record, stat):
+                    record = _build_entry_record(world_path, entry_file, stat)
+                    if record is None:
+                        continue
+                    changed = True
+                refreshed[relative_path] = record
+
+    if changed or refreshed.keys() != stored.keys():
+        _write_index_file(get_index_path(world_path), refreshed)
+
+    return refreshed
+
+
+def get_indexed_entries(world_path: Path) -> List[Dict[str, Any]]:
+    """Get all entry records for a world, ordered by taxonomy and slug.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        List of entry records from the refreshed index
+    """
+    index = load_world_index(world_path)
+    return [index[relative_path] for relative_path in sorted(index)]
+
+
+def update_index_entries(
+    world_path: Path, entry_files: List[Path]
+) -> Dict[str, Dict[str, Any]]:
+    """Record several entries that a tool has just written in one index write.
+
+    Args:
+        world_path: Path to the world directory
+        entry_files: Paths to the entry files that were written
+
+    Returns:
+        Dictionary mapping relative entry paths to their new records
+    """
+    stored = _read_index_file(get_index_path(world_path))
+    updated = refresh_index_records(world_path, stored, entry_files)
+    save_world_index(world_path, stored)
+    return updated
+
+
+def refresh_index_records(
+    world_path: Path, index: Dict[str, Dict[str, Any]], entry_files: List[Path]
+) -> Dict[str, Dict[str, Any]]:
+    """Re-parse specific entry files into an in-memory index.
+
+    Records for files that no longer exist are removed from ``index``.
+
+    Args:
+        world_path: Path to the world directory
+        index: Index dictionary to update in place
+        entry_files: Paths to the entry files to refresh
+
+    Returns:
+        Dictionary mapping relative entry paths to their new records
+    """
+    updated: Dict[str, Dict[str, Any]] = {}
+
+    for entry_file in entry_files:
+        relative_path = str(entry_file.relative_to(world_path))
+        try:
+            stat = entry_file.stat()
+        except OSError:
+            index.pop(relative_path, None)
+            continue
+
+        record = _build_entry_record(world_path, entry_file, stat)
+        if record is not None:
+            index[relative_path] = record
+            updated[relative_path] = record
+
+    return updated
+
+
+def save_world_index(world_path: Path, index: Dict[str, Dict[str, Any]]) -> None:
+    """Persist an in-memory index to ``metadata/index.json``.
+
+    Args:
+        world_path: Path to the world directory
+        index: Index dictionary to write
+    """
+    _write_index_file(get_index_path(world_path), index)
+
+
+def _record_is_current(record: Optional[Dict[str, Any]], stat: os.stat_result) -> bool:
+    """Check whether a stored record still matches the file on disk."""
+    return (
+        record is not None
+        and record.get("mtime") == stat.st_mtime_ns
+        and record.get("size") == stat.st_size
+    )
+
+
+def _build_entry_record(
+    world_path: Path, entry_file: Path, stat: os.stat_result
+) -> Optional[Dict[str, Any]]:
+    """Read the header of an entry file into an index record."""
+    try:
+        frontmatter, head = read_frontmatter(entry_file, ENTRY_TITLE_SEARCH_CHARS)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    name = entry_file.stem.replace("-", " ").title()
+
+    return {
+        "slug": entry_file.stem,
+        "taxonomy": entry_file.parent.name,
+        "name": name,
+        "title": extract_markdown_title(head) or name,
+        "frontmatter": frontmatter,
+        "file": str(entry_file.relative_to(world_path)),
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+
+
+def _read_index_file(index_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Read the stored index, treating missing or outdated files as empty."""
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get("version") != WORLD_INDEX_VERSION:
+        return {}
+
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def _write_index_file(index_path: Path, entries: Dict[str, Dict[str, Any]]) -> None:
+    """Write the index through a temporary file so readers never see a partial file."""
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": WORLD_INDEX_VERSION, "entries": entries}, f)
+        os.replace(temp_path, index_path)
+    except OSError:
+        # The index is a cache; failing to persist it must not fail the tool
+        pass
@@ -0,0 +1,174 @@
+"""World manifest for the static site.
+
+Before every build (and dev server start) the tools write
+``metadata/world.json``: the world title, the taxonomies, and for every
+entry its title, description, stub flag, topic context, image and
+cross-links. Once it exists, it is rewritten whenever the tools write
+entries or images, so a running dev server shows them without a restart. The
+Astro pages load this one file instead of listing the content directories
+and re-reading every entry's frontmatter, so a build reads each entry once
+for its own page rather than once per page.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from ..config import (
+    IMAGE_EXTENSION,
+    MARKDOWN_EXTENSION,
+    METADATA_DIRECTORY,
+    TAXONOMY_OVERVIEW_SUFFIX,
+    WORLD_MANIFEST_FILENAME,
+    WORLD_MANIFEST_VERSION,
+)
+from .content_parsing import extract_markdown_title, extract_taxonomy_description
+from .link_manifest import read_link_manifest
+from .world_cache import get_cached_entries, read_world_file
+
+
+def write_world_manifest(
+    world_path: Path, link_manifest: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Build the world manifest and write it to ``metadata/``.
+
+    The file is only rewritten when its content changes.
+
+    Args:
+        world_path: Path to the world directory
+        link_manifest: Current cross-link manifest entries keyed by ``taxonomy/slug``
+
+    Returns:
+        The manifest as written
+    """
+    images = _list_entry_images(world_path)
+    entries = []
+    for record in get_cached_entries(world_path):
+        key = f"{record['taxonomy']}/{record['slug']}"
+        image = f"{key}{IMAGE_EXTENSION}"
+        links = link_manifest.get(key, {})
+        entries.append(
+            {
+                "taxonomy": record["taxonomy"],
+                "slug": record["slug"],
+                "title": record["title"],
+                "description": record["frontmatter"].get("description", ""),
+                "stub": record["frontmatter"].get("article_type") == "stub",
+                "taxonomyContext": record["frontmatter"].get("taxonomyContext", ""),
+                "image": image if image in images else None,
+                "links": links.get("links", []),
+                "backlinks": links.get("backlinks", []),
+            }
+        )
+
+    manifest = {
+        "version": WORLD_MANIFEST_VERSION,
+        "title": read_world_file(
+            world_path, "overview/world-overview.md", extract_markdown_title
+        )
+        or "World",
+        "taxonomies": _list_taxonomies(world_path),
+        "entries": entries,
+    }
+    _write_manifest(world_path, manifest)
+    return manifest
+
+
+def update_world_manifest(
+    world_path: Path, link_manifest: Optional[Dict[str, Dict[str, Any]]] = None
+) -> None:
+    """Rewrite the manifest after the tools change a world, if a site reads it.
+
+    Worlds that were never built or served have no manifest and are skipped.
+
+    Args:
+        world_path: Path to the world directory
+        link_manifest: Current cross-link manifest, or None to use the stored one
+    """
+    if not get_world_manifest_path(world_path).exists():
+        return
+    write_world_manifest(
+        world_path,
+        link_manifest if link_manifest is not None else read_link_manifest(world_path),
+    )
+
+
+def get_world_manifest_path(world_path: Path) -> Path:
+    """Get the location of a world's manifest.
+
+    Args:
+        world_path: Path to the world directory
+
+    Returns:
+        Path to ``metadata/world.json``
+    """
+    return world_path / METADATA_DIRECTORY / WORLD_MANIFEST_FILENAME
+
+
+def _list_taxonomies(world_path: Path) -> List[Dict[str, str]]:
+    """List the taxonomies with an overview file, with their title and description."""
+    overview_suffix = f"{TAXONOMY_OVERVIEW_SUFFIX}{MARKDOWN_EXTENSION}"
+    taxonomies_path = world_path / "taxonomies"
+    if not taxonomies_path.exists():
+        return []
+
+    taxonomies = []
+    for overview_file in sorted(taxonomies_path.glob(f"*{overview_suffix}")):
+        slug = overview_file.name[: -len(overview_suffix)]
+        title, description = read_world_file(
+            world_path, f"taxonomies/{overview_file.name}", _parse_taxonomy_overview
+        ) or (None, None)
+        taxonomies.append(
+            {
+                "slug": slug,
+                "title": title or slug.replace("-", " ").title(),
+                "description": description or "",
+            }
+        )
+    return taxonomies
+
+
+def _parse_taxonomy_overview(content: str) -> Tuple[Optional[str], Optional[str]]:
+    """Extract the title and description of a taxonomy overview."""
+    return extract_markdown_title(content), extract_taxonomy_description(content)
+
+
+def _list_entry_images(world_path: Path) -> Set[str]:
+    """List the images under ``images/<taxonomy>/``, relative to ``images/``."""
+    images = set()
+    try:
+        with os.scandir(world_path / "images") as taxonomy_dirs:
+            for taxonomy_dir in taxonomy_dirs:
+                if not taxonomy_dir.is_dir() or taxonomy_dir.name.startswith("_"):
+                    continue
+                with os.scandir(taxonomy_dir.path) as image_files:
+                    images.update(
+                        f"{taxonomy_dir.name}/{image_file.name}"
+                        for image_file in image_files
+                    )
+    except OSError:
+        pass
+    return images
+
+
+def _write_manifest(world_path: Path, manifest: Dict[str, Any]) -> None:
+    """Write the manifest through a temporary file, skipping unchanged content."""
+    manifest_path = get_world_manifest_path(world_path)
+    content = json.dumps(manifest, separators=(",", ":"))
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            if f.read() == content:
+                return
+    except OSError:
+        pass
+
+    try:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = manifest_path.with_name(f".{manifest_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, manifest_path)
+    except OSError:
+        # The manifest is rewritten before every site build
+        pass